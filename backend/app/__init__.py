@@ -1,14 +1,25 @@
-from flask import Flask, after_this_request
+from flask import Flask, after_this_request, g, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from config import Config
+from app.utils.password_hasher import PasswordHasher
+from app.utils.identity_cache import IdentityCache
+from app.utils.extraction_cache import ExtractionCache
+from app.utils.admission import AdmissionLimiter
+from app.utils.db_engine import configure_engine, init_engine_events
+from app.utils.json_provider import FastJSONProvider, init_compression
 import os
+import time
 from flask_cors import CORS
 
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 jwt = JWTManager()
+password_hasher = PasswordHasher()
+identity_cache = IdentityCache()
+extraction_cache = ExtractionCache()
+upload_limiter = AdmissionLimiter('upload')
 
 def add_cors_headers(response):
     """Deprecated: CORS handled by Flask-CORS. Keep for backward-compat."""
@@ -17,10 +28,19 @@ def add_cors_headers(response):
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions
+    configure_engine(app)
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            init_engine_events(engine)
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
+    identity_cache.init_app(app)
+    extraction_cache.init_app(app)
+    upload_limiter.init_app(app)
     jwt.init_app(app)
     # Enable CORS for API routes
     CORS(
@@ -33,15 +53,29 @@ def create_app(config_class=Config):
         max_age=3600
     )
     
+    # Request counters and latency histograms per route (exposed at /metrics)
+    from app.utils.metrics import HTTP_REQUESTS, HTTP_LATENCY
+    
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+    
     # Let Flask-CORS manage response headers; avoid overriding allowed origins
     @app.after_request
     def after_request(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=request.method, route=route)
+            HTTP_REQUESTS.inc(method=request.method, route=route, status=response.status_code)
         return response
     
+    # Gzip large responses (registered after the metrics hook so it runs first)
+    init_compression(app)
+    
     # Handle OPTIONS requests explicitly
     @app.before_request
     def handle_preflight():
-        from flask import request
         if request.method == 'OPTIONS':
             # Rely on Flask-CORS to generate proper preflight response
             return app.make_default_options_response(), 200
@@ -64,13 +98,15 @@ def create_app(config_class=Config):
     from app.routes.jobs import jobs_bp
     from app.routes.cv import cv_bp
     from app.routes.health import health_bp
+    from app.routes.metrics import metrics_bp
     
+    app.register_blueprint(metrics_bp)
     app.register_blueprint(health_bp, url_prefix='/api')
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
     app.register_blueprint(cv_bp, url_prefix='/api/cv')
     
-    # Create tables
+    # Create missing tables; columns and indexes added to existing ones need `python migrate_db.py`
     with app.app_context():
         db.create_all()
     
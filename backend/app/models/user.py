@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy.dialects import mysql
 from app import db
 
 class User(db.Model):
@@ -11,7 +12,9 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    cv_uploads = db.relationship('CVUpload', backref='user', lazy=True, cascade='all, delete-orphan')
+    # Children are deleted by the database (ON DELETE CASCADE), not loaded and deleted row by row
+    cv_uploads = db.relationship('CVUpload', backref='user', lazy=True, cascade='all, delete-orphan',
+                                 passive_deletes=True)
     
     def to_dict(self):
         return {
@@ -25,21 +28,29 @@ class CVUpload(db.Model):
     __tablename__ = 'cv_uploads'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     filename = db.Column(db.String(255), nullable=False)
     file_path = db.Column(db.String(500), nullable=False)
     extracted_text = db.Column(db.Text)
     skills = db.Column(db.Text)
-    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # float32 topic distribution (engine.topic_store) and the model fingerprint it came from
+    topic_vector = db.Column(db.LargeBinary)
+    model_version = db.Column(db.String(40))
+    # Full extracted text (extracted_text keeps a 1000-character preview): re-inference after a
+    # model change and the terms of lexical paging / explanations come from it
+    full_text = db.Column(db.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'))
     
     # Relationships
-    matches = db.relationship('JobMatch', backref='cv_upload', lazy=True, cascade='all, delete-orphan')
+    matches = db.relationship('JobMatch', backref='cv_upload', lazy=True, cascade='all, delete-orphan',
+                              passive_deletes=True)
     
     def to_dict(self):
         return {
             'id': self.id,
             'filename': self.filename,
             'skills': self.skills,
+            'model_version': self.model_version,
             'uploaded_at': self.uploaded_at.isoformat()
         }
 
@@ -47,7 +58,8 @@ class JobMatch(db.Model):
     __tablename__ = 'job_matches'
     
     id = db.Column(db.Integer, primary_key=True)
-    cv_upload_id = db.Column(db.Integer, db.ForeignKey('cv_uploads.id'), nullable=False)
+    cv_upload_id = db.Column(db.Integer, db.ForeignKey('cv_uploads.id', ondelete='CASCADE'), nullable=False,
+                             index=True)
     job_title = db.Column(db.String(200))
     company = db.Column(db.String(200))
     location = db.Column(db.String(200))
@@ -57,6 +69,20 @@ class JobMatch(db.Model):
     rank = db.Column(db.Integer)
     matched_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    @classmethod
+    def from_match(cls, match, **fields):
+        """Row for one result of CVMatchingService.match_cv / match_records"""
+        return cls(
+            job_title=match['job_title'],
+            company=match['company'],
+            location=match['location'],
+            salary=match['salary'],
+            required_skills=match['required_skills'],
+            similarity_score=match['similarity_score'],
+            rank=match['rank'],
+            **fields
+        )
+    
     def to_dict(self):
         return {
             'id': self.id,
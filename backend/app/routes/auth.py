@@ -1,25 +1,16 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from app import db, bcrypt
+from app import db, password_hasher, identity_cache
 from app.models.user import User
-import os
+from app.services.retention import purge_user
+from app.utils.password_hasher import HasherBusy
+from app.utils.metrics import IDENTITY_DB_LOOKUPS
 
 auth_bp = Blueprint('auth', __name__)
 
-# Check if DATABASE_URL is explicitly set
-if os.environ.get('DATABASE_URL'):
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
-elif os.environ.get('MYSQL_USER') or os.environ.get('MYSQL_PASSWORD'):
-    # MySQL configured via individual vars
-    SQLALCHEMY_DATABASE_URI = \
-        f"mysql+pymysql://{os.environ.get('MYSQL_USER', 'root')}:" \
-        f"{os.environ.get('MYSQL_PASSWORD', '')}@" \
-        f"{os.environ.get('MYSQL_HOST', 'localhost')}:" \
-        f"{os.environ.get('MYSQL_PORT', '3306')}/" \
-        f"{os.environ.get('MYSQL_DATABASE', 'job_matching')}"
-else:
-    # Fallback to SQLite
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///job_matching.db'
+def busy_response(error):
+    """503 returned when the password hashing pool is saturated"""
+    return jsonify({'error': 'Server busy, please retry shortly'}), 503, {'Retry-After': str(error.retry_after)}
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
@@ -36,7 +27,7 @@ def register():
             return jsonify({'error': 'Email already registered'}), 400
         
         # Create new user
-        hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+        hashed_password = password_hasher.generate_password_hash(data['password'])
         new_user = User(
             email=data['email'],
             password_hash=hashed_password,
@@ -55,6 +46,9 @@ def register():
             'user': new_user.to_dict()
         }), 201
         
+    except HasherBusy as e:
+        db.session.rollback()
+        return busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -72,9 +66,17 @@ def login():
         # Find user
         user = User.query.filter_by(email=data['email']).first()
         
-        if not user or not bcrypt.check_password_hash(user.password_hash, data['password']):
+        if not user or not password_hasher.check_password_hash(user.password_hash, data['password']):
             return jsonify({'error': 'Invalid email or password'}), 401
         
+        # Upgrade hashes made with an older work factor while we know the password
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = password_hasher.generate_password_hash(data['password'])
+                db.session.commit()
+            except HasherBusy:
+                db.session.rollback()  # Retry on a later login
+        
         # Create access token (use string identity)
         access_token = create_access_token(identity=str(user.id))
         
@@ -84,6 +86,8 @@ def login():
             'user': user.to_dict()
         }), 200
         
+    except HasherBusy as e:
+        return busy_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -93,12 +97,19 @@ def get_current_user():
     """Get current user information"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        profile = identity_cache.get(user_id)
         
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
+        if profile is None:
+            IDENTITY_DB_LOOKUPS.inc()
+            user = User.query.get(user_id)
+            
+            if not user:
+                return jsonify({'error': 'User not found'}), 404
+            
+            profile = user.to_dict()
+            identity_cache.set(user_id, profile)
         
-        return jsonify({'user': user.to_dict()}), 200
+        return jsonify({'user': profile}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -120,15 +131,47 @@ def update_user():
             user.full_name = data['full_name']
         
         if 'password' in data:
-            user.password_hash = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+            user.password_hash = password_hasher.generate_password_hash(data['password'])
         
         db.session.commit()
+        identity_cache.invalidate(user.id)
         
         return jsonify({
             'message': 'User updated successfully',
             'user': user.to_dict()
         }), 200
         
+    except HasherBusy as e:
+        db.session.rollback()
+        return busy_response(e)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@auth_bp.route('/me', methods=['DELETE'])
+@jwt_required()
+def delete_account():
+    """Delete the account with all its CV uploads, matches and files (password required)"""
+    try:
+        user_id = int(get_jwt_identity())
+        user = db.session.get(User, user_id)
+        
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        data = request.get_json(silent=True) or {}
+        if not data.get('password') or not password_hasher.check_password_hash(user.password_hash, data['password']):
+            return jsonify({'error': 'Invalid password'}), 401
+        
+        counts = purge_user(user_id)
+        
+        return jsonify({
+            'message': 'Account deleted successfully',
+            'deleted_uploads': counts['uploads']
+        }), 200
+        
+    except HasherBusy as e:
+        return busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
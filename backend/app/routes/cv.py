@@ -1,14 +1,31 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from app import db, upload_limiter
 from app.models.user import CVUpload, JobMatch
 from app.utils.file_handler import save_uploaded_file, extract_text_from_file
-from app.services.cv_matching_service import get_cv_matching_service
+from app.services.cv_matching_service import get_cv_matching_service, MATCHING_ENGINES
+from app.services.matching_service import get_matching_service
+from app.services.rematch import rematch_upload
+from app.services.retention import delete_uploads
+from app.utils.metrics import timed_stage
+from app.utils.http_cache import conditional
+from app.utils.cursor import encode_cursor, decode_cursor
+from engine.filters import parse_filters
+from engine.topic_store import encode_topics
 
 cv_bp = Blueprint('cv', __name__)
 
+def _matching_engine(value):
+    """Validated ?engine= value, or None for the configured default"""
+    if not value:
+        return None
+    if value not in MATCHING_ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(MATCHING_ENGINES)}")
+    return value
+
 @cv_bp.route('/upload', methods=['POST'])
 @jwt_required()
+@upload_limiter.limit
 def upload_cv():
     """Upload CV and find top 5 job matches using LDA"""
     try:
@@ -23,14 +40,24 @@ def upload_cv():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
+        # Optional constraints (location, min_salary, min_remote, experience_level, ...) applied before top-k,
+        # and ?engine=lda|bm25|tfidf to override MATCHING_ENGINE; checked before the file is written
+        try:
+            filters = parse_filters(request.values)
+            engine = _matching_engine(request.values.get('engine'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Save file
-        file_path, filename = save_uploaded_file(file, user_id)
+        with timed_stage('save_file'):
+            file_path, filename = save_uploaded_file(file, user_id)
         
         if not file_path:
             return jsonify({'error': 'Invalid file type. Allowed: PDF, DOCX, TXT'}), 400
         
         # Extract text from file
-        extracted_text = extract_text_from_file(file_path)
+        with timed_stage('extraction'):
+            extracted_text = extract_text_from_file(file_path)
         
         if not extracted_text or extracted_text.strip() == '':
             return jsonify({'error': 'Could not extract text from file or file is empty'}), 400
@@ -38,8 +65,11 @@ def upload_cv():
         # Get CV matching service (LDA based)
         cv_matching_service = get_cv_matching_service()
         
-        # Find top 5 job matches
-        result = cv_matching_service.match_cv(extracted_text, top_n=5)
+        # Find top 5 job matches (?explain=true adds contributing topics and shared terms)
+        explain = request.values.get('explain', 'false').lower() in ('1', 'true', 'yes')
+        with timed_stage('matching'):
+            result = cv_matching_service.match_cv(extracted_text, top_n=5, explain=explain, filters=filters,
+                                                  engine=engine)
         
         if not result['success']:
             return jsonify({'error': result.get('error', 'Matching failed')}), 500
@@ -50,32 +80,35 @@ def upload_cv():
             filename=filename,
             file_path=file_path,
             extracted_text=extracted_text[:1000],  
-            skills='TF-IDF Matched'  
+            full_text=extracted_text,
+            skills='TF-IDF Matched',
+            # Topic vector kept for re-matching without re-extraction or inference
+            topic_vector=encode_topics(result['cv_topics']),
+            model_version=cv_matching_service.model_version
         )
         db.session.add(cv_upload)
         db.session.flush()  # Get the cv_upload.id
         
         # Save job matches
         for match in result['matches']:
-            job_match = JobMatch(
-                cv_upload_id=cv_upload.id,
-                job_title=match['job_title'],
-                company=match['company'],
-                location=match['location'],
-                salary=match['salary'],
-                required_skills=match['required_skills'],
-                similarity_score=match['similarity_score'],
-                rank=match['rank']
-            )
-            db.session.add(job_match)
-        
-        db.session.commit()
+            db.session.add(JobMatch.from_match(match, cv_upload_id=cv_upload.id))
+        
+        with timed_stage('db_commit'):
+            db.session.commit()
+        
+        # Topics and terms stay cached for "more matches" paging
+        cv_matching_service.register_upload(cv_upload.id, result['cv_topics'], result['cv_terms'])
+        returned = len(result['matches'])
         
         return jsonify({
             'message': 'CV uploaded successfully',
             'cv_id': cv_upload.id,
             'top_5_matches': result['matches'],
             'total_jobs_searched': result['total_jobs_searched'],
+            'next_cursor': encode_cursor(returned, filters, result['engine'])
+                           if returned == 5 and returned < result['total_jobs_searched'] else None,
+            'engine': result['engine'],
+            'filters': filters,
             'cv_text_length': result['cv_length']
         }), 201
         
@@ -135,20 +168,95 @@ def get_cv_details(cv_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@cv_bp.route('/<int:cv_id>/matches', methods=['GET'])
+@jwt_required()
+def get_more_matches(cv_id):
+    """Next page of job matches for an uploaded CV (?cursor= from the upload or previous page)"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        cv_upload = CVUpload.query.filter_by(id=cv_id, user_id=user_id).first()
+        
+        if not cv_upload:
+            return jsonify({'error': 'CV not found'}), 404
+        
+        limit = min(max(request.args.get('limit', 5, type=int), 1), current_app.config['MATCH_PAGE_MAX_SIZE'])
+        explain = request.args.get('explain', 'false').lower() in ('1', 'true', 'yes')
+        cursor = request.args.get('cursor')
+        try:
+            # The cursor carries the offset, filters and engine of the first page
+            if cursor:
+                offset, filters, engine = decode_cursor(cursor)
+            else:
+                offset, filters, engine = 0, parse_filters(request.args), request.args.get('engine')
+            cv_matching_service = get_cv_matching_service()
+            engine = _matching_engine(engine) or cv_matching_service.default_engine
+            with timed_stage('matching'):
+                matches, total = cv_matching_service.more_matches(
+                    cv_upload, offset, limit, filters=filters, explain=explain, engine=engine)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        next_offset = offset + len(matches)
+        return jsonify({
+            'cv_id': cv_upload.id,
+            'matches': matches,
+            'total_jobs_searched': total,
+            'next_cursor': encode_cursor(next_offset, filters, engine)
+                           if len(matches) == limit and next_offset < total else None,
+            'engine': engine
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@cv_bp.route('/<int:cv_id>/rematch', methods=['POST'])
+@jwt_required()
+def rematch_cv(cv_id):
+    """Re-match a stored CV against the current job catalog from its saved topic vector"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        cv_upload = CVUpload.query.filter_by(id=cv_id, user_id=user_id).first()
+        
+        if not cv_upload:
+            return jsonify({'error': 'CV not found'}), 404
+        
+        try:
+            filters = parse_filters(request.values)
+            with timed_stage('matching'):
+                matches, total, source = rematch_upload(cv_upload, get_cv_matching_service(), filters=filters)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        with timed_stage('db_commit'):
+            db.session.commit()
+        
+        return jsonify({
+            'cv_id': cv_upload.id,
+            'top_5_matches': matches,
+            'total_jobs_searched': total,
+            'topic_source': source,
+            'next_cursor': encode_cursor(len(matches), filters) if len(matches) == 5 and len(matches) < total else None
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @cv_bp.route('/<int:cv_id>', methods=['DELETE'])
 @jwt_required()
 def delete_cv(cv_id):
-    """Delete a CV upload"""
+    """Delete a CV upload with its matches and file"""
     try:
         user_id = int(get_jwt_identity())  
         
-        cv_upload = CVUpload.query.filter_by(id=cv_id, user_id=user_id).first()
+        owned = db.session.query(CVUpload.id).filter_by(id=cv_id, user_id=user_id).first()
         
-        if not cv_upload:
+        if not owned:
             return jsonify({'error': 'CV not found'}), 404
         
-        db.session.delete(cv_upload)
-        db.session.commit()
+        delete_uploads([cv_id])
         
         return jsonify({'message': 'CV deleted successfully'}), 200
         
@@ -157,6 +265,7 @@ def delete_cv(cv_id):
         return jsonify({'error': str(e)}), 500
 
 @cv_bp.route('/dataset/statistics', methods=['GET'])
+@conditional()
 def get_cv_dataset_statistics():
     """Get statistics from the CV dataset"""
     try:
@@ -212,6 +321,7 @@ def get_cv_dataset_sample():
         return jsonify({'error': str(e)}), 500
 
 @cv_bp.route('/matching-stats', methods=['GET'])
+@conditional()
 def get_matching_stats():
     """Get statistics about the matching system"""
     try:
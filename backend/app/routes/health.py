@@ -1,5 +1,7 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 import os
+from app.services.matching_service import get_matching_service
+from engine.filters import parse_filters
 
 health_bp = Blueprint('health', __name__)
 
@@ -22,8 +24,13 @@ def test_match():
         if not data or 'cv_text' not in data:
             return jsonify({'error': 'cv_text required in body'}), 400
         
+        try:
+            filters = parse_filters(data.get('filters') or {})
+        except ValueError as e:
+            return jsonify({'error': str(e), 'success': False}), 400
+        
         matching_service = get_matching_service()
-        result = matching_service.find_top_matches(data['cv_text'], top_n=5)
+        result = matching_service.find_top_matches(data['cv_text'], top_n=5, filters=filters)
         
         return jsonify(result), 200 if result['success'] else 500
         
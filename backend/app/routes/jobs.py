@@ -1,11 +1,16 @@
+import pandas as pd
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.matching_service import get_matching_service
+from app.services.cv_matching_service import get_cv_matching_service
+from app.models.user import CVUpload
+from app.utils.http_cache import conditional
 
 jobs_bp = Blueprint('jobs', __name__)
 
 @jobs_bp.route('/search', methods=['GET'])
 @jwt_required()
+@conditional(private=True)
 def search_jobs():
     """Search jobs (optional endpoint for browsing)"""
     try:
@@ -24,15 +29,14 @@ def search_jobs():
         
         jobs_page = jobs_df.iloc[start:end]
         
-        jobs_list = []
-        for _, job in jobs_page.iterrows():
-            jobs_list.append({
-                'job_title': job.get('job_title', 'N/A'),
-                'company': job.get('company_name', job.get('company_location', 'N/A')),
-                'location': job.get('company_location', 'N/A'),
-                'salary': float(job.get('salary_usd', 0)),
-                'required_skills': job.get('required_skills', 'N/A')
-            })
+        # Column-wise conversion instead of iterrows(); numpy scalars are handled by the JSON provider
+        jobs_list = pd.DataFrame({
+            'job_title': jobs_page['job_title'],
+            'company': jobs_page['company_name'],
+            'location': jobs_page['company_location'],
+            'salary': jobs_page['salary_usd'],
+            'required_skills': jobs_page['required_skills']
+        }).to_dict('records')
         
         return jsonify({
             'jobs': jobs_list,
@@ -47,6 +51,7 @@ def search_jobs():
 
 @jobs_bp.route('/stats', methods=['GET'])
 @jwt_required()
+@conditional(private=True)
 def get_job_stats():
     """Get job statistics"""
     try:
@@ -64,3 +69,125 @@ def get_job_stats():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@jobs_bp.route('/<job_id>/similar', methods=['GET'])
+@jwt_required()
+@conditional(private=True)
+def get_similar_jobs(job_id):
+    """Get jobs similar to a posting (precomputed topic-space neighbours)"""
+    try:
+        matching_service = get_matching_service()
+        
+        if matching_service.job_neighbors is None:
+            return jsonify({'error': 'Similar jobs are not available for this model'}), 503
+        
+        limit = request.args.get('limit', 10, type=int)
+        limit = max(1, min(limit, matching_service.job_neighbors.shape[1]))
+        similar = matching_service.similar_jobs(job_id, top_n=limit)
+        
+        if similar is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify({
+            'job_id': job_id,
+            'similar_jobs': similar,
+            'total': len(similar)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@jobs_bp.route('/topics', methods=['GET'])
+@jwt_required()
+@conditional(private=True)
+def list_topics():
+    """List LDA topics with their top words"""
+    try:
+        matching_service = get_matching_service()
+        
+        if matching_service.topic_index is None:
+            return jsonify({'error': 'Topic browsing is not available for this model'}), 503
+        
+        words = request.args.get('words', 10, type=int)
+        return jsonify({
+            'topics': matching_service.topic_summaries(n_words=max(1, words)),
+            'total_jobs': matching_service.topic_index.n_jobs
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@jobs_bp.route('/topics/<int:topic>', methods=['GET'])
+@jwt_required()
+@conditional(private=True)
+def get_topic_jobs(topic):
+    """Browse the jobs of one topic, ranked by topic weight"""
+    try:
+        matching_service = get_matching_service()
+        index = matching_service.topic_index
+        
+        if index is None:
+            return jsonify({'error': 'Topic browsing is not available for this model'}), 503
+        if topic >= index.n_topics:
+            return jsonify({'error': 'Topic not found'}), 404
+        
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = max(1, min(request.args.get('per_page', 10, type=int), 100))
+        total = index.n_jobs
+        
+        return jsonify({
+            'topic': topic,
+            'top_words': [{'term': term, 'weight': weight} for term, weight in index.words(topic)],
+            'jobs': matching_service.topic_jobs(topic, page, per_page),
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'total_pages': (total + per_page - 1) // per_page
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@jobs_bp.route('/<job_id>/candidates', methods=['GET'])
+@jwt_required()
+def get_job_candidates(job_id):
+    """
+    Rank candidate CVs for a job posting: the reference dataset and the caller's own uploads
+
+    Other accounts' uploads are never searched or returned.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        cv_matching_service = get_cv_matching_service()
+        
+        limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+        source = request.args.get('source', 'all')
+        if source not in ('all', 'dataset', 'uploads'):
+            return jsonify({'error': "source must be one of: all, dataset, uploads"}), 400
+        
+        candidates = cv_matching_service.match_job(job_id, top_n=limit,
+                                                   include_dataset=source != 'uploads',
+                                                   user_id=user_id if source != 'dataset' else None)
+        if candidates is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        # Attach upload details; CVs deleted since they were indexed are dropped
+        upload_ids = [c['cv_id'] for c in candidates if c['source'] == 'upload']
+        if upload_ids:
+            uploads = {cv.id: cv for cv in CVUpload.query.filter(CVUpload.id.in_(upload_ids),
+                                                                 CVUpload.user_id == user_id)}
+            candidates = [c for c in candidates if c['source'] != 'upload' or c['cv_id'] in uploads]
+            for rank, candidate in enumerate(candidates, 1):
+                candidate['rank'] = rank
+                if candidate['source'] == 'upload':
+                    candidate.update(uploads[candidate['cv_id']].to_dict())
+                    candidate['cv_id'] = candidate.pop('id')
+        
+        return jsonify({
+            'job_id': job_id,
+            'candidates': candidates,
+            'total': len(candidates)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,9 @@
+from flask import Blueprint, Response
+from app.utils.metrics import registry, CONTENT_TYPE
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text-format metrics for this process"""
+    return Response(registry.render(), mimetype=None, content_type=CONTENT_TYPE)
@@ -1,133 +1,232 @@
-import pandas as pd
+import logging
+import time
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+import pandas as pd
 import os
-import joblib
-from flask import current_app
+from flask import current_app, has_app_context
+from app.utils.metrics import timed_stage, MODEL_LOAD_SECONDS
+from app.utils.cache import TTLCache
+from engine.matcher import Matcher, MATCHING_ENGINES, DEFAULT_MODEL_DIR
+from engine.cv_index import CVTopicIndex, CV_TOPICS_ARTIFACT
+from engine.quantize import cosine_scores
+from engine.topic_store import decode_topics
+from engine.topk import top_k_window
+
+logger = logging.getLogger(__name__)
+
+def matcher_options(model_dir=None, sharded=False):
+    """
+    Arguments de engine.matcher.Matcher tirés de la configuration Flask (si disponible)
+    
+    Seul le service qui classe les uploads (`sharded=True`) reçoit MATCH_SHARDS:
+    un seul pool de workers et une seule matrice partagée par processus web.
+    """
+    config = current_app.config if has_app_context() else {}
+    return {
+        'model_dir': model_dir or config.get('MODEL_DIR', DEFAULT_MODEL_DIR),
+        'topic_dtype': config.get('TOPIC_MATRIX_DTYPE', 'float64'),
+        'default_engine': config.get('MATCHING_ENGINE', 'lda'),
+        'timer': timed_stage,
+        'shards': config.get('MATCH_SHARDS', 0) if sharded else 0
+    }
 
-class CVMatchingService:
-    """Service pour matcher les CVs avec les offres d'emploi en utilisant LDA topic modeling"""
+class CVMatchingService(Matcher):
+    """
+    Service pour matcher les CVs avec les offres d'emploi en utilisant LDA topic modeling
     
-    def __init__(self):
-        self.df_jobs = None
-        self.lda_model = None
-        self.count_vectorizer = None
-        self.job_topic_distributions = None
-        self.load_and_prepare()
+    Le matching lui-même est dans engine.matcher (sans Flask); le service ajoute
+    la configuration, les métriques, le cache de topics et le matching inverse.
+    """
     
-    def load_and_prepare(self):
-        """Charger le modèle LDA et les données pré-calculées"""
+    def __init__(self, model_dir=None):
+        self.cv_index = None
+        self._df_cvs = None
+        # Topics et termes des CVs uploadés récemment, pour la pagination des matches
+        config = current_app.config if has_app_context() else {}
+        self.cv_cache = TTLCache('cv_topics', maxsize=config.get('MATCH_CACHE_MAX_SIZE', 10000),
+                                 ttl=config.get('MATCH_CACHE_TTL', 900))
+        super().__init__(**matcher_options(model_dir, sharded=True))
+    
+    def load(self):
+        """Charger le modèle LDA, les données pré-calculées et l'index inverse des CVs"""
+        started = time.perf_counter()
         try:
-            # Chemins des fichiers du modèle LDA
-            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            model_dir = os.path.join(backend_dir, 'final_model')
-            
-            # Charger le modèle LDA
-            lda_path = os.path.join(model_dir, 'lda_model.joblib')
-            self.lda_model = joblib.load(lda_path)
-            print(f"[OK] Modele LDA charge avec {self.lda_model.n_components} topics")
-            
-            # Charger le CountVectorizer (CRITIQUE - nécessaire pour transformer les nouveaux CVs)
-            vectorizer_path = os.path.join(model_dir, 'count_vectorizer.joblib')
-            self.count_vectorizer = joblib.load(vectorizer_path)
-            print(f"[OK] CountVectorizer charge: {len(self.count_vectorizer.vocabulary_)} mots")
-            
-            # Charger les distributions de topics pré-calculées pour les jobs
-            job_topics_path = os.path.join(model_dir, 'job_topic_distributions.joblib')
-            self.job_topic_distributions = joblib.load(job_topics_path)
-            print(f"[OK] Distributions de topics chargees: {self.job_topic_distributions.shape[0]} jobs")
-            
-            # Charger le DataFrame des jobs
-            jobs_pkl = os.path.join(model_dir, 'jobs_dataframe.pkl')
-            self.df_jobs = pd.read_pickle(jobs_pkl)
-            print(f"[OK] Jobs charges: {len(self.df_jobs)} offres")
-            
-        except Exception as e:
-            print(f"[ERROR] Erreur lors du chargement du modele: {e}")
+            super().load()
+            # Matrice de topics des CVs de référence (memory-mapped) pour le matching inverse
+            cv_topics_path = self.artifact(CV_TOPICS_ARTIFACT)
+            if os.path.exists(cv_topics_path):
+                self.cv_index = CVTopicIndex.load(cv_topics_path)
+                logger.info("Topics des CVs de reference: %d CVs", self.cv_index.n_base)
+            else:
+                self.cv_index = CVTopicIndex(None, n_topics=self.lda_model.n_components)
+        except Exception:
+            logger.exception("Erreur lors du chargement du modele")
             raise
+        MODEL_LOAD_SECONDS.set(time.perf_counter() - started, service='cv_matching')
+    
+    def cv_topics(self, cv_upload):
+        """
+        Topics et termes d'un CV uploadé, sans ré-extraction
+        
+        Cherche dans le cache, puis le vecteur stocké (s'il vient du modèle
+        courant), et ne ré-infère depuis le texte complet stocké qu'en dernier
+        recours. Les uploads antérieurs au texte complet n'ont que l'aperçu de
+        1000 caractères: leurs topics sont alors approximatifs ('approximate')
+        et aucun terme n'en est tiré.
+        
+        Returns:
+            (topics, termes ou None, source: 'cache' | 'stored' | 'inferred' | 'approximate')
+        """
+        cached = self.cv_cache.get(int(cv_upload.id))
+        if cached is not None:
+            return cached[0], cached[1], 'cache'
+        if cv_upload.topic_vector is not None and cv_upload.model_version == self.model_version:
+            cv_topics, cv_terms, source = decode_topics(cv_upload.topic_vector), None, 'stored'
+        elif cv_upload.full_text is not None:
+            cv_terms = self.vectorize(cv_upload.full_text)
+            cv_topics, source = self.infer_topics(cv_upload.full_text, terms=cv_terms)[0], 'inferred'
+        else:
+            cv_terms = None
+            cv_topics, source = self.infer_topics(cv_upload.extracted_text or '')[0], 'approximate'
+        self.cv_cache.set(int(cv_upload.id), (cv_topics, cv_terms))
+        return cv_topics, cv_terms, source
     
-    def match_cv(self, cv_text, top_n=5):
+    def upload_terms(self, cv_upload):
         """
-        Matcher un CV avec les meilleures offres en utilisant LDA topic modeling
+        Termes d'un CV uploadé, depuis son texte complet stocké
+        
+        Raises:
+            ValueError: upload antérieur au texte complet (seul l'aperçu de
+                1000 caractères existe, ses termes seraient faux)
+        """
+        if cv_upload.full_text is None:
+            raise ValueError('This CV was uploaded before its full text was kept: '
+                             'upload it again for explanations or BM25/TF-IDF matches')
+        return self.vectorize(cv_upload.full_text)
+    
+    def more_matches(self, cv_upload, offset, limit=5, filters=None, explain=False, engine='lda'):
+        """
+        Page suivante des matches d'un CV uploadé
         
         Args:
-            cv_text: Texte extrait du CV
-            top_n: Nombre de top résultats (défaut: 5)
+            cv_upload: CVUpload (id, texte et vecteur de topics stockés)
+            offset: Nombre de matches déjà renvoyés
+            limit: Taille de la page
+            filters: Filtres de la première page
+            explain: Ajouter les explications
+            engine: Moteur de la première page
         
         Returns:
-            Liste des top N offres avec scores de similarité
+            (matches, nombre d'offres candidates)
+        
+        Raises:
+            ValueError: termes requis (explications, moteur lexical) pour un
+                upload sans texte complet
         """
-        try:
-            if not cv_text or cv_text.strip() == '':
-                return {
-                    'success': False,
-                    'error': 'CV text is empty',
-                    'matches': []
-                }
-            
-            # 1. Vectoriser le CV avec CountVectorizer
-            cv_count = self.count_vectorizer.transform([cv_text])
-            
-            # 2. Transformer en distribution de topics avec LDA
-            cv_topic_distribution = self.lda_model.transform(cv_count)
-            
-            # 3. Calculer les similarités cosine avec tous les jobs
-            similarities = cosine_similarity(cv_topic_distribution, self.job_topic_distributions).flatten()
-            
-            # 4. Obtenir les indices des top N
-            top_indices = np.argsort(similarities)[::-1][:top_n]
-            
-            # 5. Construire les résultats
-            matches = []
-            for rank, idx in enumerate(top_indices, 1):
-                job = self.df_jobs.iloc[idx]
-                match = {
-                    'rank': rank,
-                    'job_title': str(job['job_title']) if 'job_title' in job.index else 'N/A',
-                    'company': str(job['company_name']) if 'company_name' in job.index else 'N/A',
-                    'location': str(job['company_location']) if 'company_location' in job.index else 'N/A',
-                    'salary': float(job['salary_usd']) if 'salary_usd' in job.index and pd.notna(job['salary_usd']) else None,
-                    'experience_level': str(job['experience_level']) if 'experience_level' in job.index else 'N/A',
-                    'required_skills': str(job['required_skills'])[:200] if 'required_skills' in job.index else 'N/A',
-                    'similarity_score': float(similarities[idx])
-                }
-                matches.append(match)
-            
-            return {
-                'success': True,
-                'matches': matches,
-                'cv_length': len(cv_text),
-                'total_jobs_searched': len(self.df_jobs),
-                'model_type': 'LDA',
-                'n_topics': self.lda_model.n_components
-            }
-            
-        except Exception as e:
-            print(f"[ERROR] Erreur lors du matching: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'matches': []
-            }
+        cv_topics, cv_terms, _ = self.cv_topics(cv_upload)
+        if (explain or engine != 'lda') and cv_terms is None:
+            cv_terms = self.upload_terms(cv_upload)
+            self.cv_cache.set(int(cv_upload.id), (cv_topics, cv_terms))
+        rows, scores, n_candidates = self.rank_jobs(cv_topics, offset, offset + limit, filters,
+                                                    engine=engine, cv_terms=cv_terms)
+        return self.match_records(rows, scores, offset + 1, cv_topics, cv_terms, explain), n_candidates
+    
+    @property
+    def df_cvs(self):
+        """CVs de référence (lignes alignées sur la matrice de topics, chargés à la première utilisation)"""
+        if self._df_cvs is None:
+            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+            self._df_cvs = pd.read_csv(os.path.join(backend_dir, 'data', 'dataset_cvs_cleaned.csv'))
+        return self._df_cvs
+    
+    def register_upload(self, cv_id, cv_topics, cv_terms=None):
+        """Garder les topics et termes d'un CV uploadé pour la pagination de ses matches"""
+        if cv_terms is not None:
+            self.cv_cache.set(int(cv_id), (cv_topics, cv_terms))
+    
+    def forget_uploads(self, cv_ids):
+        """Retirer des uploads supprimés du cache de topics"""
+        for cv_id in cv_ids:
+            self.cv_cache.pop(int(cv_id))
+    
+    def user_upload_topics(self, user_id):
+        """(ids, matrice de topics) des uploads d'un utilisateur ayant un vecteur du modèle courant"""
+        from app.models.user import CVUpload
+        rows = CVUpload.query.with_entities(CVUpload.id, CVUpload.topic_vector)\
+            .filter(CVUpload.user_id == user_id, CVUpload.model_version == self.model_version,
+                    CVUpload.topic_vector.isnot(None))\
+            .order_by(CVUpload.id).all()
+        if not rows:
+            return [], None
+        return [cv_id for cv_id, _ in rows], np.vstack([decode_topics(blob) for _, blob in rows])
+    
+    def match_job(self, job_id, top_n=10, include_dataset=True, user_id=None):
+        """
+        Matching inverse: meilleurs CVs pour une offre
+        
+        Les CVs uploadés ne sont cherchés que parmi ceux de `user_id`, lus en
+        base (vecteurs stockés), jamais ceux des autres comptes; le résultat
+        est donc le même quel que soit le worker qui répond.
+        
+        Args:
+            job_id: Identifiant de l'offre (colonne job_id)
+            top_n: Nombre de candidats
+            include_dataset: Chercher dans les CVs de référence
+            user_id: Chercher aussi dans les CVs uploadés par cet utilisateur (None = aucun)
+        
+        Returns:
+            Liste de candidats triés par similarité, ou None si l'offre est inconnue
+        """
+        row = self.job_index.get(str(job_id))
+        if row is None:
+            return None
+        job_topics = np.asarray(self.job_topic_distributions[row], dtype=np.float64)
+        
+        results = []
+        with timed_stage('similarity'):
+            if include_dataset:
+                results += self.cv_index.search(job_topics, k=top_n, include_base=True, include_extra=False)
+            if user_id is not None:
+                upload_ids, upload_topics = self.user_upload_topics(user_id)
+                if upload_ids:
+                    scores = cosine_scores(job_topics, upload_topics)
+                    results += [('upload', upload_ids[i], float(scores[i]))
+                                for i in top_k_window(scores, 0, top_n)]
+        results = sorted(results, key=lambda result: -result[2])[:top_n]
+        
+        candidates = []
+        for rank, (source, key, score) in enumerate(results, 1):
+            candidate = {'rank': rank, 'source': source, 'similarity_score': score}
+            if source == 'dataset':
+                cv = self.df_cvs.iloc[key]
+                candidate.update({
+                    'dataset_row': key,
+                    'experience': cv.get('experience'),
+                    'education': cv.get('education'),
+                    'skills': str(cv.get('skills', ''))[:200]
+                })
+            else:
+                candidate['cv_id'] = key
+            candidates.append(candidate)
+        return candidates
     
     def get_job_stats(self):
         """Retourner les statistiques des jobs"""
         try:
-            stats = {
-                'total_jobs': len(self.df_jobs),
-                'avg_salary': float(self.df_jobs['salary_usd'].mean()) if 'salary_usd' in self.df_jobs.columns else 0,
-                'locations': self.df_jobs['company_location'].nunique() if 'company_location' in self.df_jobs.columns else 0,
-                'experience_levels': self.df_jobs['experience_level'].unique().tolist() if 'experience_level' in self.df_jobs.columns else [],
-            }
-            return stats
-        except Exception as e:
-            print(f"[ERROR] Erreur lors des stats: {e}")
+            return super().get_job_stats()
+        except Exception:
+            logger.exception("Erreur lors des stats")
             return {}
 
 
 # Instance globale
 cv_matching_service = None
 
+def forget_deleted_uploads(cv_ids):
+    """Oublier des uploads supprimés, seulement si le service est déjà chargé"""
+    if cv_matching_service is not None:
+        cv_matching_service.forget_uploads(cv_ids)
+
 def get_cv_matching_service():
     """Récupérer ou créer l'instance du service"""
     global cv_matching_service
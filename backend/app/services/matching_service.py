@@ -1,41 +1,52 @@
+import logging
 import pandas as pd
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-import joblib
 import os
-from flask import current_app
+import time
+from app.utils.metrics import MODEL_LOAD_SECONDS
+from app.services.cv_matching_service import matcher_options
+from engine.matcher import Matcher
+from engine.topk import load_neighbors, NEIGHBORS_ARTIFACT
+from engine.topic_index import TopicIndex, TOPIC_INDEX_ARTIFACT
 
-class JobMatchingService:
-    """Service de matching de jobs utilisant LDA topic modeling"""
+logger = logging.getLogger(__name__)
+
+class JobMatchingService(Matcher):
+    """Service de matching de jobs utilisant LDA topic modeling (voir engine.matcher)"""
+    
+    def __init__(self, model_dir=None):
+        self.job_neighbors = None
+        self.job_neighbor_scores = None
+        self.topic_index = None
+        self._cvs_df = None
+        super().__init__(**matcher_options(model_dir))
+    
+    @property
+    def jobs_df(self):
+        return self.df_jobs
     
-    def __init__(self):
-        self.lda_model = None
-        self.count_vectorizer = None
-        self.job_topic_distributions = None
-        self.jobs_df = None
-        self.load_model()
+    @jobs_df.setter
+    def jobs_df(self, value):
+        self.df_jobs = value
     
-    def load_model(self):
+    def load(self):
         """Charger le modèle LDA pré-entrainé"""
+        started = time.perf_counter()
         try:
-            # Déterminer le chemin du modèle
-            if current_app:
-                backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            else:
-                backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            super().load()
             
-            model_dir = os.path.join(backend_dir, 'final_model')
+            # Listes de voisins pré-calculées ("jobs similaires", optionnel)
+            neighbors_path = self.artifact(NEIGHBORS_ARTIFACT)
+            if os.path.exists(neighbors_path):
+                self.job_neighbors, self.job_neighbor_scores = load_neighbors(neighbors_path)
+            # Index de navigation par topic (optionnel)
+            topic_index_path = self.artifact(TOPIC_INDEX_ARTIFACT)
+            if os.path.exists(topic_index_path):
+                self.topic_index = TopicIndex.load(topic_index_path)
             
-            # Charger tous les composants
-            self.lda_model = joblib.load(os.path.join(model_dir, 'lda_model.joblib'))
-            self.count_vectorizer = joblib.load(os.path.join(model_dir, 'count_vectorizer.joblib'))
-            self.job_topic_distributions = joblib.load(os.path.join(model_dir, 'job_topic_distributions.joblib'))
-            self.jobs_df = pd.read_pickle(os.path.join(model_dir, 'jobs_dataframe.pkl'))
+            MODEL_LOAD_SECONDS.set(time.perf_counter() - started, service='job_matching')
             
-            print(f"[OK] Modele LDA charge: {self.lda_model.n_components} topics, {len(self.jobs_df)} jobs")
-            
-        except Exception as e:
-            print(f"[ERROR] Erreur lors du chargement du modele: {e}")
+        except Exception:
+            logger.exception("Erreur lors du chargement du modele")
             # Fallback: créer un dataset minimal
             self.jobs_df = pd.DataFrame({
                 'job_title': ['Data Scientist', 'ML Engineer', 'AI Researcher'],
@@ -45,13 +56,27 @@ class JobMatchingService:
                 'required_skills': ['Python, ML, Statistics', 'Python, TensorFlow, Deep Learning', 'Python, NLP, Research']
             })
     
-    def find_top_matches(self, cv_text, top_n=5):
+    @property
+    def cvs_df(self):
+        """Dataset de CVs de référence (chargé à la première utilisation)"""
+        if self._cvs_df is None:
+            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            cv_path = os.path.join(backend_dir, 'data', 'dataset_cvs_cleaned.csv')
+            try:
+                self._cvs_df = pd.read_csv(cv_path)
+            except Exception:
+                logger.exception("Erreur lors du chargement du dataset de CVs")
+                self._cvs_df = pd.DataFrame()
+        return self._cvs_df
+    
+    def find_top_matches(self, cv_text, top_n=5, filters=None):
         """
         Trouver les top N jobs correspondant au CV en utilisant LDA
         
         Args:
             cv_text: Texte du CV
             top_n: Nombre de résultats
+            filters: Contraintes sur les offres (voir engine.filters), appliquées avant le top N
         
         Returns:
             Dictionnaire avec les matches et métadonnées
@@ -64,21 +89,16 @@ class JobMatchingService:
                     'matches': []
                 }
             
-            # 1. Vectoriser avec CountVectorizer
-            cv_count = self.count_vectorizer.transform([cv_text])
-            
-            # 2. Obtenir la distribution de topics
-            cv_topics = self.lda_model.transform(cv_count)
-            
-            # 3. Calculer similarités avec tous les jobs
-            similarity_scores = cosine_similarity(cv_topics, self.job_topic_distributions)[0]
+            # 1-2. Vectoriser et obtenir la distribution de topics
+            cv_terms = self.vectorize(cv_text)
+            cv_topics = self.infer_topics(cv_text, terms=cv_terms)[0]
             
-            # 4. Top N indices
-            top_indices = np.argsort(similarity_scores)[-top_n:][::-1]
+            # 3-4. Similarités avec les jobs qui respectent les filtres, top N
+            top_indices, scores, _ = self.rank_jobs(cv_topics, 0, top_n, filters)
             
             # 5. Construire les résultats
             matches = []
-            for rank, idx in enumerate(top_indices, 1):
+            for rank, (idx, score) in enumerate(zip(top_indices, scores), 1):
                 job = self.jobs_df.iloc[idx]
                 match = {
                     'rank': rank,
@@ -87,7 +107,7 @@ class JobMatchingService:
                     'location': job.get('company_location', 'N/A'),
                     'salary': float(job.get('salary_usd', 0)) if pd.notna(job.get('salary_usd', 0)) else None,
                     'required_skills': str(job.get('required_skills', 'N/A'))[:200],
-                    'similarity_score': float(similarity_scores[idx])
+                    'similarity_score': float(score)
                 }
                 matches.append(match)
             
@@ -99,15 +119,61 @@ class JobMatchingService:
             }
             
         except Exception as e:
-            print(f"[ERROR] Erreur lors du matching: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Erreur lors du matching")
             return {
                 'success': False,
                 'error': str(e),
                 'matches': []
             }
 
+    def similar_jobs(self, job_id, top_n=10):
+        """
+        Jobs les plus proches d'une offre dans l'espace des topics (listes pré-calculées)
+        
+        Args:
+            job_id: Identifiant de l'offre (colonne job_id)
+            top_n: Nombre de voisins (au plus k de l'artefact)
+        
+        Returns:
+            Liste de jobs avec score de similarité, ou None si l'offre est inconnue
+        """
+        row = self.job_index.get(str(job_id))
+        if row is None or self.job_neighbors is None:
+            return None
+        
+        ids = self.job_neighbors[row, :top_n]
+        scores = self.job_neighbor_scores[row, :top_n]
+        return self._job_records(ids, scores, 'similarity_score')
+    
+    def topic_summaries(self, n_words=10):
+        """Topics du modèle avec leurs mots principaux et le nombre de jobs dominés"""
+        index = self.topic_index
+        return [{
+            'topic': topic,
+            'top_words': [term for term, _ in index.words(topic, n_words)],
+            'dominant_jobs': int(index.dominant_counts[topic])
+        } for topic in range(index.n_topics)]
+    
+    def topic_jobs(self, topic, page=1, per_page=10):
+        """Une page des jobs classés par poids décroissant pour un topic (tranche pré-calculée)"""
+        rows, weights = self.topic_index.page(topic, (page - 1) * per_page, per_page)
+        return self._job_records(rows, weights, 'topic_weight')
+    
+    def _job_records(self, rows, scores, score_key):
+        """Métadonnées d'affichage des jobs `rows` avec leur score"""
+        jobs = self.jobs_df.iloc[rows]
+        return [{
+            'rank': rank,
+            'job_id': job.get('job_id'),
+            'job_title': job.get('job_title', 'N/A'),
+            'company': job.get('company_name', 'N/A'),
+            'location': job.get('company_location', 'N/A'),
+            'salary': job.get('salary_usd'),
+            'experience_level': job.get('experience_level', 'N/A'),
+            'required_skills': str(job.get('required_skills', 'N/A'))[:200],
+            score_key: float(score)
+        } for rank, ((_, job), score) in enumerate(zip(jobs.iterrows(), scores), 1)]
+
 # Global instance
 matching_service = None
 
@@ -0,0 +1,50 @@
+"""
+Re-matching of stored CV uploads against the current job catalog
+
+Uses the topic vector stored with each upload, so a refreshed catalog only
+costs a similarity scan per CV. Uploads saved before vectors were stored,
+or by an older model, are re-inferred once from their stored full text and
+the new vector is saved for next time. Uploads saved before the full text
+only have a 1000-character preview: their matches are refreshed from an
+approximate vector, which is reported ('approximate') but never saved.
+"""
+
+from collections import Counter
+
+from app import db
+from app.models.user import CVUpload, JobMatch
+from engine.topic_store import encode_topics
+
+
+def rematch_upload(cv_upload, service, top_n=5, filters=None):
+    """
+    Replace the saved matches of one upload (caller commits)
+
+    Returns:
+        (matches, number of candidate jobs, topic source: 'cache' | 'stored' | 'inferred' | 'approximate')
+    """
+    cv_topics, _, source = service.cv_topics(cv_upload)
+    if source == 'inferred':
+        cv_upload.topic_vector = encode_topics(cv_topics)
+        cv_upload.model_version = service.model_version
+    rows, scores, n_candidates = service.rank_jobs(cv_topics, 0, top_n, filters)
+    matches = service.match_records(rows, scores, 1, cv_topics)
+    cv_upload.matches = [JobMatch.from_match(match) for match in matches]
+    return matches, n_candidates, source
+
+
+def rematch_all(service, batch_size=500, top_n=5):
+    """Re-match every stored upload, committing per batch; returns counts per topic source"""
+    counts = Counter()
+    last_id = 0
+    while True:
+        batch = CVUpload.query.filter(CVUpload.id > last_id).order_by(CVUpload.id).limit(batch_size).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        for cv_upload in batch:
+            _, _, source = rematch_upload(cv_upload, service, top_n)
+            counts[source] += 1
+        db.session.commit()
+        db.session.expunge_all()
+    return dict(counts)
@@ -0,0 +1,139 @@
+"""
+Deletion and retention of CV uploads
+
+Uploads are deleted with set-based statements in chunks of `batch_size`
+ids, each chunk in its own short transaction, so neither a large account
+nor a retention run holds long table locks. Matches are deleted explicitly
+before their uploads: with ON DELETE CASCADE this is what the database
+would do anyway, and it keeps tables created before the foreign keys
+cascaded working. Files are removed after the commit, and only when no
+remaining upload points at them (re-uploading a file name reuses its path),
+together with the cached text extracted from them.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete
+
+from app import db, extraction_cache, identity_cache
+from app.models.user import CVUpload, JobMatch, User
+from app.services.cv_matching_service import forget_deleted_uploads
+from app.utils.extraction_cache import file_digest
+
+KEEP_FILES = ('.gitkeep',)
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _remove_files(paths, upload_folder):
+    """Remove files located under upload_folder and their extraction cache entries; returns how many were removed"""
+    root = os.path.realpath(upload_folder)
+    removed = 0
+    digests = set()
+    for path in paths:
+        real = os.path.realpath(path)
+        if os.path.commonpath([root, real]) != root:
+            continue
+        try:
+            if extraction_cache.enabled:
+                # Hashed before removal: the cache is keyed by file content
+                digests.add(file_digest(real))
+            os.remove(real)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    extraction_cache.delete(digests)
+    return removed
+
+
+def _delete_chunk(ids):
+    """Delete one chunk of uploads and commit; returns (deleted ids, file paths no longer referenced)"""
+    rows = db.session.query(CVUpload.id, CVUpload.file_path).filter(CVUpload.id.in_(ids)).all()
+    if not rows:
+        return [], []
+    ids = [cv_id for cv_id, _ in rows]
+    paths = {file_path for _, file_path in rows}
+    db.session.execute(delete(JobMatch).where(JobMatch.cv_upload_id.in_(ids)))
+    db.session.execute(delete(CVUpload).where(CVUpload.id.in_(ids)))
+    still_used = {path for (path,) in db.session.query(CVUpload.file_path).filter(CVUpload.file_path.in_(paths))}
+    db.session.commit()
+    return ids, sorted(paths - still_used)
+
+
+def _finish_chunk(ids, paths, counts):
+    counts['uploads'] += len(ids)
+    counts['files'] += _remove_files(paths, current_app.config['UPLOAD_FOLDER'])
+    forget_deleted_uploads(ids)
+
+
+def delete_uploads(cv_ids, batch_size=500):
+    """
+    Delete uploads with their matches and files
+
+    Returns:
+        {'uploads': deleted uploads, 'files': removed files}
+    """
+    counts = {'uploads': 0, 'files': 0}
+    for chunk in _chunks(sorted(set(cv_ids)), batch_size):
+        _finish_chunk(*_delete_chunk(chunk), counts)
+    return counts
+
+
+def _delete_selected(query, batch_size):
+    """Delete the uploads whose ids `query` selects, lowest ids first, chunk by chunk"""
+    counts = {'uploads': 0, 'files': 0}
+    while True:
+        ids = [cv_id for (cv_id,) in query.order_by(CVUpload.id).limit(batch_size)]
+        if not ids:
+            return counts
+        _finish_chunk(*_delete_chunk(ids), counts)
+
+
+def purge_user(user_id, batch_size=500):
+    """Delete an account: its uploads (matches, files) chunk by chunk, then the user row"""
+    counts = _delete_selected(db.session.query(CVUpload.id).filter(CVUpload.user_id == user_id), batch_size)
+    db.session.execute(delete(User).where(User.id == user_id))
+    db.session.commit()
+    identity_cache.invalidate(user_id)
+    try:
+        os.rmdir(os.path.join(current_app.config['UPLOAD_FOLDER'], str(user_id)))
+    except OSError:
+        pass
+    return counts
+
+
+def purge_expired(days, batch_size=500, now=None):
+    """Delete uploads older than `days` days"""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    query = db.session.query(CVUpload.id).filter(CVUpload.uploaded_at < cutoff)
+    return _delete_selected(query, batch_size)
+
+
+def remove_orphaned_files(min_age=3600, batch_size=500):
+    """
+    Remove files in UPLOAD_FOLDER that no upload references
+
+    Such files are left by uploads that failed after the file was saved.
+    Files younger than `min_age` seconds are kept, as their upload may
+    still be in progress.
+    """
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    cutoff = time.time() - min_age
+    candidates = []
+    for directory, _, names in os.walk(upload_folder):
+        for name in names:
+            path = os.path.join(directory, name)
+            if name not in KEEP_FILES and os.path.getmtime(path) < cutoff:
+                candidates.append(path)
+    orphaned = []
+    for chunk in _chunks(candidates, batch_size):
+        referenced = {path for (path,) in db.session.query(CVUpload.file_path).filter(CVUpload.file_path.in_(chunk))}
+        orphaned += [path for path in chunk if path not in referenced]
+    db.session.rollback()
+    return _remove_files(orphaned, upload_folder)
@@ -0,0 +1,133 @@
+"""
+Admission control for expensive routes
+
+`AdmissionLimiter` caps how many requests of one kind (CV uploads: parse,
+extract, match) run at once. Extra requests wait in a short bounded queue
+with a deadline; when the queue is full or the deadline passes they fail
+fast with `Overloaded` (503 + Retry-After) instead of occupying server
+threads. Running + queued requests are capped so that SERVER_THREADS always
+keeps UPLOAD_RESERVED_THREADS free for lightweight routes (health, auth,
+search).
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import jsonify
+
+from app.utils.metrics import ADMISSION_INFLIGHT, ADMISSION_QUEUED, ADMISSION_REJECTED, ADMISSION_WAIT
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """Raised when a limiter cannot admit a request"""
+
+    def __init__(self, retry_after=1):
+        super().__init__('Capacity exhausted')
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    def __init__(self, name, app=None):
+        self.name = name
+        self.max_inflight = 0  # 0 = unlimited
+        self.max_queue = 0
+        self.queue_timeout = 0.0
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._waiting = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        prefix = self.name.upper()
+        inflight = app.config.get(f'{prefix}_MAX_INFLIGHT', 0)
+        queue = app.config.get(f'{prefix}_MAX_QUEUE', 0)
+        threads = app.config.get('SERVER_THREADS')
+        reserved = app.config.get(f'{prefix}_RESERVED_THREADS', 0)
+
+        if inflight and threads:
+            # Waiting requests hold a server thread too: keep `reserved` threads out of reach
+            available = max(1, threads - reserved)
+            if inflight + queue > available:
+                inflight = min(inflight, available)
+                queue = available - inflight
+                logger.warning("%s admission reduced to %d in flight + %d queued (%d server threads, %d reserved)",
+                               self.name, inflight, queue, threads, reserved)
+
+        with self._cond:
+            self.max_inflight = inflight
+            self.max_queue = queue
+            self.queue_timeout = app.config.get(f'{prefix}_QUEUE_TIMEOUT', 5.0)
+
+    @property
+    def inflight(self):
+        return self._inflight
+
+    @property
+    def waiting(self):
+        return self._waiting
+
+    def _reject(self, reason):
+        ADMISSION_REJECTED.inc(limiter=self.name, reason=reason)
+        raise Overloaded(retry_after=max(1, math.ceil(self.queue_timeout)))
+
+    def acquire(self):
+        """Take a slot, waiting at most `queue_timeout` seconds; raises Overloaded"""
+        if not self.max_inflight:
+            return
+        started = time.monotonic()
+        with self._cond:
+            if self._inflight >= self.max_inflight or self._waiting:
+                if self._waiting >= self.max_queue:
+                    self._reject('queue_full')
+                self._waiting += 1
+                ADMISSION_QUEUED.inc(limiter=self.name)
+                try:
+                    deadline = started + self.queue_timeout
+                    while self._inflight >= self.max_inflight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._reject('timeout')
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                    ADMISSION_QUEUED.dec(limiter=self.name)
+            self._inflight += 1
+            ADMISSION_INFLIGHT.inc(limiter=self.name)
+        ADMISSION_WAIT.observe(time.monotonic() - started, limiter=self.name)
+
+    def release(self):
+        with self._cond:
+            if self._inflight <= 0:
+                return  # unlimited: acquire() took no slot
+            self._inflight -= 1
+            ADMISSION_INFLIGHT.dec(limiter=self.name)
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def limit(self, view):
+        """Decorator running `view` inside a slot; 503 + Retry-After when saturated"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                self.acquire()
+            except Overloaded as e:
+                return jsonify({'error': 'Server busy, please retry shortly'}), 503, {'Retry-After': str(e.retry_after)}
+            try:
+                return view(*args, **kwargs)
+            finally:
+                self.release()
+        return wrapper
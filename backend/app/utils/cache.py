@@ -0,0 +1,57 @@
+"""
+Small thread-safe in-process caches
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.metrics import record_cache
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after `ttl` seconds
+
+    Lookups are reported to the metrics registry under `name`.
+    """
+
+    def __init__(self, name, maxsize=1024, ttl=60.0, clock=time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                record_cache(self.name, True)
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+        record_cache(self.name, False)
+        return default
+
+    def set(self, key, value, ttl=None):
+        expires = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,36 @@
+"""
+Opaque paging cursors
+
+A cursor is URL-safe base64 JSON holding the offset of the next page and
+the filters and matching engine of the first one, so every page of a
+result list is ranked the same way without keeping per-client state on
+the server.
+"""
+
+import base64
+import binascii
+import json
+
+
+def encode_cursor(offset, filters=None, engine='lda'):
+    payload = json.dumps({'o': int(offset), 'f': filters or {}, 'e': engine}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    (offset, filters, engine) of a cursor
+
+    Raises:
+        ValueError: the cursor was not produced by `encode_cursor`
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        offset, filters, engine = payload['o'], payload['f'], payload.get('e', 'lda')
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError('Invalid cursor') from None
+    if not isinstance(offset, int) or offset < 0 or not isinstance(filters, dict) \
+            or not all(isinstance(value, list) for value in filters.values()) or not isinstance(engine, str):
+        raise ValueError('Invalid cursor')
+    return offset, filters, engine
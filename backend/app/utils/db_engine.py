@@ -0,0 +1,171 @@
+"""
+Database engine profiles
+
+`engine_options(config)` turns the app config into SQLAlchemy engine options
+for one of two profiles, picked from DB_ENGINE_PROFILE or the database URI:
+
+- ``sqlite`` (development): WAL journal so readers do not wait for the
+  writer, synchronous=NORMAL, a busy timeout instead of "database is locked"
+  errors and enforced foreign keys.
+- ``mysql`` (production): a queue pool sized from SERVER_THREADS (one
+  connection per request thread) and capped by DB_MAX_CONNECTIONS shared
+  across WEB_CONCURRENCY worker processes, with recycling below MySQL's
+  wait_timeout.
+
+Both use `InstrumentedQueuePool`, which exports checkout latency, pool
+timeouts and saturation on /metrics. Explicit SQLALCHEMY_ENGINE_OPTIONS in
+the config override the profile.
+"""
+
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+from app.utils.metrics import DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT, DB_POOL_SATURATION, DB_POOL_TIMEOUTS
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording checkout wait time, timeouts and connections in use"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started)
+            self._report()
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._report()
+
+    def _report(self):
+        in_use = self.checkedout()
+        DB_POOL_CHECKED_OUT.set(in_use)
+        capacity = self.size() + max(self._max_overflow, 0)
+        DB_POOL_SATURATION.set(in_use / capacity if capacity else 0.0)
+
+
+def detect_profile(uri):
+    backend = make_url(uri).get_backend_name()
+    return backend if backend in ('sqlite', 'mysql') else 'default'
+
+
+def _pool_size(config):
+    threads = config.get('SERVER_THREADS', 4)
+    size = config.get('DB_POOL_SIZE') or threads
+    max_connections = config.get('DB_MAX_CONNECTIONS')
+    if max_connections:
+        # The server-side limit is shared by every worker process
+        size = min(size, max(1, max_connections // max(1, config.get('WEB_CONCURRENCY', 1))))
+    return size
+
+
+def engine_options(config):
+    """SQLAlchemy engine options for the configured profile (explicit options win)"""
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    profile = config.get('DB_ENGINE_PROFILE') or detect_profile(uri)
+    url = make_url(uri)
+    options = {'pool_pre_ping': True}
+
+    if profile == 'sqlite':
+        options = {'connect_args': {'timeout': config.get('SQLITE_BUSY_TIMEOUT', 5.0)}}
+        if url.database not in (None, '', ':memory:'):
+            # In-memory databases get a StaticPool from Flask-SQLAlchemy
+            options.update(poolclass=InstrumentedQueuePool, pool_size=_pool_size(config),
+                           max_overflow=config.get('DB_MAX_OVERFLOW', 2),
+                           pool_timeout=config.get('DB_POOL_TIMEOUT', 10))
+    elif profile == 'mysql':
+        options.update(poolclass=InstrumentedQueuePool, pool_size=_pool_size(config),
+                       max_overflow=config.get('DB_MAX_OVERFLOW', 2),
+                       pool_timeout=config.get('DB_POOL_TIMEOUT', 10),
+                       pool_recycle=config.get('DB_POOL_RECYCLE', 300))
+    else:
+        options['pool_recycle'] = config.get('DB_POOL_RECYCLE', 300)
+
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def configure_engine(app):
+    """Apply the engine profile to `app.config` (call before `db.init_app`)"""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+
+def init_engine_events(engine):
+    """Connection-level settings that cannot be passed as engine options"""
+    if engine.dialect.name == 'sqlite' and not event.contains(engine, 'connect', _sqlite_pragmas):
+        event.listen(engine, 'connect', _sqlite_pragmas)
+
+
+def add_missing_columns(engine, metadata):
+    """
+    Add nullable model columns that an existing table lacks
+
+    `create_all` only creates missing tables; this keeps databases created
+    before a column was added usable without a migration tool. Run it from
+    the one-off `migrate_db.py` command, never from every worker at startup
+    (concurrent ALTER TABLEs race). Returns the added "table.column" names.
+    """
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    added = []
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                conn.exec_driver_sql(f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN '
+                                     f'{preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}')
+                added.append(f'{table.name}.{column.name}')
+    return added
+
+
+def _covered(columns, existing):
+    """True when an existing index starts with exactly these columns (in any order)"""
+    return any(set(index[:len(columns)]) == set(columns) for index in existing)
+
+
+def add_missing_indexes(engine, metadata):
+    """
+    Create model indexes that an existing table lacks; returns their names
+
+    An index is only created when no existing index (or unique constraint)
+    already leads with the same columns, whatever its name: MySQL creates
+    one for every foreign key, which must not be duplicated. Like
+    `add_missing_columns`, run it from `migrate_db.py`, not at startup.
+    """
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = [index['column_names'] for index in inspector.get_indexes(table.name)]
+            existing += [constraint['column_names'] for constraint in inspector.get_unique_constraints(table.name)]
+            names = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                columns = [column.name for column in index.columns]
+                if index.name in names or _covered(columns, existing):
+                    continue
+                index.create(conn)
+                existing.append(columns)
+                added.append(index.name)
+    return added
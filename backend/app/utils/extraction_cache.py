@@ -0,0 +1,181 @@
+"""
+Content-addressed cache of text extracted from uploaded CV files
+
+Entries are keyed by the SHA-256 of the file bytes and its extension, and
+hold the extracted text (already normalized by engine.extract) and page
+count, so a re-uploaded or shared CV skips
+PyPDF2/python-docx parsing entirely. They live in a local SQLite file shared
+by every worker on the host, bounded to `max_bytes` of text with
+least-recently-used eviction. Each entry records the extractor version
+(parser library versions); entries from another version are never served
+and are purged when the cache opens, so upgrading a parser invalidates it.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from importlib import metadata
+
+from app.utils.metrics import record_cache
+
+# Bump when the extraction code itself changes what it returns (2: normalized text)
+EXTRACTION_FORMAT = 2
+EXTRACTOR_PACKAGES = ('PyPDF2', 'python-docx')
+
+logger = logging.getLogger(__name__)
+
+
+def extractor_version(packages=EXTRACTOR_PACKAGES):
+    """e.g. 'v2;PyPDF2=3.0.1;python-docx=1.1.0'"""
+    parts = [f"v{EXTRACTION_FORMAT}"]
+    for package in packages:
+        try:
+            parts.append(f"{package}={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            parts.append(f"{package}=none")
+    return ';'.join(parts)
+
+
+def file_digest(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionStore:
+    """Extracted texts in a SQLite file, LRU-bounded by total text size"""
+
+    def __init__(self, path, max_bytes, version=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version or extractor_version()
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute('CREATE TABLE IF NOT EXISTS extractions '
+                     '(digest TEXT NOT NULL, extension TEXT NOT NULL, version TEXT NOT NULL, '
+                     'text TEXT NOT NULL, pages INTEGER, size INTEGER NOT NULL, last_used REAL NOT NULL, '
+                     'PRIMARY KEY (digest, extension))')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_extractions_last_used ON extractions (last_used)')
+        conn.execute('DELETE FROM extractions WHERE version != ?', (self.version,))
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, digest, extension):
+        """(text, pages), or None"""
+        conn = self._connect()
+        row = conn.execute('SELECT text, pages FROM extractions WHERE digest = ? AND extension = ? AND version = ?',
+                           (digest, extension, self.version)).fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE extractions SET last_used = ? WHERE digest = ? AND extension = ?',
+                     (time.time(), digest, extension))
+        return row[0], row[1]
+
+    def set(self, digest, extension, text, pages):
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        conn = self._connect()
+        conn.execute('INSERT OR REPLACE INTO extractions (digest, extension, version, text, pages, size, last_used) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                     (digest, extension, self.version, text, pages, size, time.time()))
+        self._evict(conn)
+
+    def _evict(self, conn):
+        # Keep the most recently used entries whose sizes add up to at most max_bytes
+        (total,) = conn.execute('SELECT COALESCE(SUM(size), 0) FROM extractions').fetchone()
+        if total <= self.max_bytes:
+            return
+        conn.execute('DELETE FROM extractions WHERE rowid IN ('
+                     'SELECT rowid FROM (SELECT rowid, SUM(size) OVER '
+                     '(ORDER BY last_used DESC, rowid DESC) AS running FROM extractions) '
+                     'WHERE running > ?)', (self.max_bytes,))
+
+    def delete(self, digests):
+        """Drop the entries of these file digests (any extension); returns how many were dropped"""
+        digests = list(digests)
+        conn = self._connect()
+        dropped = 0
+        for start in range(0, len(digests), 500):
+            chunk = digests[start:start + 500]
+            dropped += conn.execute(f"DELETE FROM extractions WHERE digest IN ({', '.join('?' * len(chunk))})",
+                                    chunk).rowcount
+        return dropped
+
+    def stats(self):
+        count, size = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions').fetchone()
+        return {'entries': count, 'bytes': size, 'max_bytes': self.max_bytes, 'version': self.version}
+
+    def clear(self):
+        self._connect().execute('DELETE FROM extractions')
+
+
+class ExtractionCache:
+    def __init__(self, app=None):
+        self._store = None
+        if app is not None:
+            self.init_app(app)
+
+    @property
+    def enabled(self):
+        return self._store is not None
+
+    def init_app(self, app):
+        path = app.config.get('EXTRACTION_CACHE_PATH')
+        max_bytes = app.config.get('EXTRACTION_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        self._store = None
+        if path and max_bytes > 0:
+            try:
+                self._store = ExtractionStore(path, max_bytes)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Extraction cache disabled: %s", e)
+
+    def get(self, digest, extension):
+        if self._store is None:
+            return None
+        try:
+            entry = self._store.get(digest, extension)
+        except sqlite3.Error:
+            entry = None
+        record_cache('extraction', entry is not None)
+        return entry
+
+    def set(self, digest, extension, text, pages):
+        if self._store is None:
+            return
+        try:
+            self._store.set(digest, extension, text, pages)
+        except sqlite3.Error:
+            pass
+
+    def delete(self, digests):
+        if self._store is None or not digests:
+            return 0
+        try:
+            return self._store.delete(digests)
+        except sqlite3.Error as e:
+            logger.warning("Extraction cache entries not deleted: %s", e)
+            return 0
+
+    def stats(self):
+        return self._store.stats() if self._store is not None else None
+
+    def clear(self):
+        if self._store is not None:
+            self._store.clear()
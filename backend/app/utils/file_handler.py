@@ -1,8 +1,9 @@
 import os
 from werkzeug.utils import secure_filename
 from flask import current_app
-import PyPDF2
-import docx
+from app import extraction_cache
+from app.utils.extraction_cache import file_digest
+from engine.extract import read_document, read_docx, read_pdf, read_txt
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -11,48 +12,40 @@ def allowed_file(filename):
 
 def extract_text_from_pdf(file_path):
     """Extract text from PDF file"""
-    try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ''
-            for page in pdf_reader.pages:
-                text += page.extract_text() + '\n'
-            return text
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return None
+    return read_pdf(file_path)[0]
 
 def extract_text_from_docx(file_path):
     """Extract text from DOCX file"""
-    try:
-        doc = docx.Document(file_path)
-        text = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-        return text
-    except Exception as e:
-        print(f"Error extracting text from DOCX: {e}")
-        return None
+    return read_docx(file_path)
 
 def extract_text_from_txt(file_path):
     """Extract text from TXT file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    except Exception as e:
-        print(f"Error extracting text from TXT: {e}")
-        return None
+    return read_txt(file_path)
 
-def extract_text_from_file(file_path):
-    """Extract text from various file formats"""
+def extract_text_from_file(file_path, use_cache=True):
+    """
+    Extract text from various file formats
+    
+    The extraction cache (keyed by the SHA-256 of the file bytes) is consulted
+    before any parser runs; use_cache=False always parses.
+    """
     extension = file_path.rsplit('.', 1)[1].lower()
+    if not (use_cache and extraction_cache.enabled):
+        return read_document(file_path)[0]
     
-    if extension == 'pdf':
-        return extract_text_from_pdf(file_path)
-    elif extension in ['doc', 'docx']:
-        return extract_text_from_docx(file_path)
-    elif extension == 'txt':
-        return extract_text_from_txt(file_path)
-    else:
+    try:
+        digest = file_digest(file_path)
+    except OSError:
         return None
+    cached = extraction_cache.get(digest, extension)
+    if cached is not None:
+        return cached[0]
+    
+    text, pages = read_document(file_path)
+    # Failed parses are not cached, so they are retried on the next upload
+    if text is not None:
+        extraction_cache.set(digest, extension, text, pages)
+    return text
 
 def save_uploaded_file(file, user_id):
     """Save uploaded file and return file path"""
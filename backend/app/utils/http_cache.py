@@ -0,0 +1,114 @@
+"""
+Conditional GET for catalog-derived endpoints
+
+Job search/stats and dataset statistics only change when the model artifacts
+or datasets change. Their ETag is built from a catalog version (file names,
+sizes and modification times, or CATALOG_VERSION when pinned) plus the
+request path and query string, so `If-None-Match` can be answered with a 304
+before the view runs - no service load, no pandas work, no serialization.
+"""
+
+import hashlib
+import os
+import threading
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def _catalog_files(app):
+    model_dir = app.config.get('MODEL_DIR')
+    paths = []
+    if model_dir and os.path.isdir(model_dir):
+        paths.extend(os.path.join(model_dir, name) for name in sorted(os.listdir(model_dir)))
+    for key in ('JOBS_DATASET_PATH', 'CV_DATASET_PATH'):
+        if app.config.get(key):
+            paths.append(app.config[key])
+    return paths
+
+
+def compute_catalog_version(paths):
+    """Short hash of the (path, size, mtime) of every existing file"""
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f'{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def catalog_version(app=None):
+    """Version of the model/catalog served by `app` (computed once per process)"""
+    app = app or current_app._get_current_object()
+    pinned = app.config.get('CATALOG_VERSION')
+    if pinned:
+        return str(pinned)
+    paths = tuple(_catalog_files(app))
+    version = _versions.get(paths)
+    if version is None:
+        with _versions_lock:
+            version = _versions.setdefault(paths, compute_catalog_version(paths))
+    return version
+
+
+def reset_catalog_version():
+    """Forget computed versions (after artifacts are replaced in place)"""
+    with _versions_lock:
+        _versions.clear()
+
+
+def make_etag():
+    """Strong ETag for the current request: catalog version + path + sorted query args"""
+    args = '&'.join(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+    raw = f'{catalog_version()}|{request.path}|{args}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def _matches(header, etag):
+    """Weak comparison (RFC 9110 8.8.3.2): gzip turns our ETags into W/ ones"""
+    if not header:
+        return False
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+def conditional(private=False):
+    """
+    Decorator adding ETag/Cache-Control to a GET view and answering 304 when
+    the client already has the current representation.
+
+    `private` marks responses of authenticated routes (not for shared caches).
+    Place it under `@jwt_required()` so the token is still checked.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            max_age = current_app.config.get('HTTP_CACHE_MAX_AGE', 60)
+            cache_control = f"{'private' if private else 'public'}, max-age={max_age}, must-revalidate"
+            etag = make_etag()
+
+            if _matches(request.headers.get('If-None-Match'), etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            response.vary.add('Accept-Encoding')
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,108 @@
+"""
+User-profile cache for JWT-protected routes
+
+Profiles (`User.to_dict()`) are cached by user id in process memory. An
+optional SQLite tier shared by every worker on the host lets one worker's
+lookup or invalidation benefit the others; when it is enabled the
+per-process tier keeps entries only briefly so invalidations propagate fast.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from app.utils.cache import TTLCache
+from app.utils.metrics import record_cache
+
+
+class SharedProfileStore:
+    """Profiles in a local SQLite file shared between worker processes"""
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS profiles '
+                         '(user_id INTEGER PRIMARY KEY, payload TEXT NOT NULL, expires REAL NOT NULL)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, user_id):
+        row = self._connect().execute('SELECT payload, expires FROM profiles WHERE user_id = ?',
+                                      (user_id,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, user_id, profile):
+        self._connect().execute('INSERT OR REPLACE INTO profiles (user_id, payload, expires) VALUES (?, ?, ?)',
+                                (user_id, json.dumps(profile), time.time() + self.ttl))
+
+    def delete(self, user_id):
+        self._connect().execute('DELETE FROM profiles WHERE user_id = ?', (user_id,))
+
+
+class IdentityCache:
+    def __init__(self, app=None):
+        self.enabled = False
+        self._local = TTLCache('identity', maxsize=0, ttl=0)
+        self._shared = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        ttl = app.config.get('IDENTITY_CACHE_TTL', 60)
+        shared_path = app.config.get('IDENTITY_CACHE_SHARED_PATH')
+        local_ttl = min(ttl, app.config.get('IDENTITY_CACHE_LOCAL_TTL', 5)) if shared_path else ttl
+        self.enabled = ttl > 0
+        self._local = TTLCache('identity', maxsize=app.config.get('IDENTITY_CACHE_MAX_SIZE', 10000),
+                               ttl=local_ttl)
+        self._shared = SharedProfileStore(shared_path, ttl) if shared_path and self.enabled else None
+
+    def get(self, user_id):
+        """Cached profile dict, or None when the caller must hit the database"""
+        if not self.enabled:
+            return None
+        user_id = int(user_id)
+        profile = self._local.get(user_id)
+        if profile is None and self._shared is not None:
+            try:
+                profile = self._shared.get(user_id)
+            except sqlite3.Error:
+                profile = None
+            record_cache('identity_shared', profile is not None)
+            if profile is not None:
+                self._local.set(user_id, profile)
+        return profile
+
+    def set(self, user_id, profile):
+        if not self.enabled:
+            return
+        user_id = int(user_id)
+        self._local.set(user_id, profile)
+        if self._shared is not None:
+            try:
+                self._shared.set(user_id, profile)
+            except sqlite3.Error:
+                pass
+
+    def invalidate(self, user_id):
+        user_id = int(user_id)
+        self._local.pop(user_id)
+        if self._shared is not None:
+            try:
+                self._shared.delete(user_id)
+            except sqlite3.Error:
+                pass
+
+    def clear(self):
+        self._local.clear()
@@ -0,0 +1,109 @@
+"""
+JSON provider and response compression
+
+`FastJSONProvider` serializes with orjson when it is installed (falling back
+to the standard library) and understands numpy/pandas scalars, arrays and
+timestamps, so routes can return DataFrame-derived values without manual
+float()/str() coercion. `init_compression` gzips large JSON/text responses
+for clients that accept it.
+"""
+
+import gzip
+import math
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/html', 'text/csv'}
+
+
+def _convert(o):
+    """Plain Python equivalent of numpy/pandas values (None when unsupported)"""
+    if isinstance(o, np.generic):
+        value = o.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, (pd.Timestamp, datetime, date)):
+        return o.isoformat()
+    if o is pd.NaT or o is pd.NA:
+        return None
+    if isinstance(o, (pd.Series, pd.Index)):
+        return o.tolist()
+    return NotImplemented
+
+
+def _without_nan(obj):
+    """Copy of `obj` with NaN/inf floats replaced by None (matches orjson output)"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _without_nan(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_without_nan(value) for value in obj]
+    return obj
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider with numpy/pandas support and an optional orjson fast path"""
+
+    def default(self, o):
+        value = _convert(o)
+        if value is NotImplemented:
+            return DefaultJSONProvider.default(o)
+        return value
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+            except TypeError:
+                # e.g. integers beyond 64 bits: let the standard encoder decide
+                pass
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        try:
+            return super().dumps(obj, allow_nan=False, **kwargs)
+        except ValueError:
+            # NaN is not valid JSON: emit null instead, like the orjson path
+            return super().dumps(_without_nan(obj), **kwargs)
+
+
+def init_compression(app):
+    """Gzip responses above COMPRESS_MIN_SIZE bytes when the client accepts gzip"""
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+    level = app.config.get('COMPRESS_LEVEL', 5)
+
+    @app.after_request
+    def compress_response(response):
+        if (min_size is None or response.direct_passthrough or response.status_code < 200
+                or response.status_code >= 300 or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers
+                or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=level))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        if response.headers.get('ETag') and not response.headers['ETag'].startswith('W/'):
+            # Same entity, different bytes: a strong validator would be wrong
+            response.headers['ETag'] = 'W/' + response.headers['ETag']
+        return response
@@ -0,0 +1,251 @@
+"""
+In-process metrics with Prometheus text exposition
+
+Counters, gauges and histograms live in a module-level registry and are
+rendered by the /metrics route. Everything is in memory and per process.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Latency buckets in seconds (sub-millisecond stages up to slow uploads)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts (last one is +Inf), sum, count]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def get(self, **labels):
+        """(count, sum) observed for the given labels"""
+        state = self._values.get(self._key(labels))
+        return (state[2], state[1]) if state else (0, 0.0)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound) if bound != float("inf") else "+Inf"}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        _update_cache_ratios()
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    'jobscope_http_requests_total', 'HTTP requests by route, method and status',
+    ('method', 'route', 'status'))
+HTTP_LATENCY = registry.histogram(
+    'jobscope_http_request_duration_seconds', 'HTTP request latency by route and method',
+    ('method', 'route'))
+STAGE_LATENCY = registry.histogram(
+    'jobscope_stage_duration_seconds', 'Latency of CV upload and matching stages',
+    ('stage',))
+MODEL_LOAD_SECONDS = registry.gauge(
+    'jobscope_model_load_seconds', 'Time spent loading model artifacts', ('service',))
+CACHE_REQUESTS = registry.counter(
+    'jobscope_cache_requests_total', 'Cache lookups by cache and result (hit/miss)',
+    ('cache', 'result'))
+CACHE_HIT_RATIO = registry.gauge(
+    'jobscope_cache_hit_ratio', 'Cache hit ratio since process start', ('cache',))
+PASSWORD_HASH_LATENCY = registry.histogram(
+    'jobscope_password_hash_duration_seconds', 'bcrypt hash/check latency including queueing',
+    ('operation',))
+PASSWORD_HASH_INFLIGHT = registry.gauge(
+    'jobscope_password_hash_inflight', 'bcrypt jobs running or queued in the hashing pool')
+PASSWORD_HASH_REJECTED = registry.counter(
+    'jobscope_password_hash_rejected_total', 'bcrypt jobs refused because the pool was saturated',
+    ('operation',))
+IDENTITY_DB_LOOKUPS = registry.counter(
+    'jobscope_identity_db_lookups_total', 'User profile reads that missed the identity cache')
+ADMISSION_INFLIGHT = registry.gauge(
+    'jobscope_admission_inflight', 'Requests running inside an admission limiter', ('limiter',))
+ADMISSION_QUEUED = registry.gauge(
+    'jobscope_admission_queued', 'Requests waiting for an admission slot', ('limiter',))
+ADMISSION_REJECTED = registry.counter(
+    'jobscope_admission_rejected_total', 'Requests shed by an admission limiter (queue_full/timeout)',
+    ('limiter', 'reason'))
+ADMISSION_WAIT = registry.histogram(
+    'jobscope_admission_wait_seconds', 'Time spent queued before admission', ('limiter',))
+DB_POOL_CHECKOUT = registry.histogram(
+    'jobscope_db_pool_checkout_seconds', 'Time to obtain a database connection from the pool')
+DB_POOL_CHECKED_OUT = registry.gauge(
+    'jobscope_db_pool_checked_out', 'Database connections currently in use')
+DB_POOL_SATURATION = registry.gauge(
+    'jobscope_db_pool_saturation', 'Connections in use / (pool size + max overflow)')
+DB_POOL_TIMEOUTS = registry.counter(
+    'jobscope_db_pool_timeouts_total', 'Requests that gave up waiting for a database connection')
+
+
+def timed_stage(stage):
+    """Context manager timing one upload/matching stage"""
+    return STAGE_LATENCY.time(stage=stage)
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def _update_cache_ratios():
+    totals = {}
+    with CACHE_REQUESTS._lock:
+        items = list(CACHE_REQUESTS._values.items())
+    for (cache, result), value in items:
+        hits, total = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (value if result == 'hit' else 0), total + value)
+    for cache, (hits, total) in totals.items():
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
@@ -0,0 +1,144 @@
+"""
+Password hashing off the request thread
+
+bcrypt runs in a small dedicated process pool so a login burst cannot tie up
+every server thread. Admission is bounded: when the pool and its queue are
+full, callers get `HasherBusy` immediately and the route answers 503.
+Hashes stay compatible with Flask-Bcrypt (same prefix, rounds and long
+password handling).
+"""
+
+import atexit
+import hashlib
+import hmac
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt as _bcrypt
+
+from app.utils.metrics import PASSWORD_HASH_INFLIGHT, PASSWORD_HASH_LATENCY, PASSWORD_HASH_REJECTED
+from engine.shards import worker_context
+
+_COST_RE = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing pool cannot accept more work"""
+
+    def __init__(self, retry_after=1):
+        super().__init__('Password hashing capacity exhausted')
+        self.retry_after = retry_after
+
+
+def _prepare(password, handle_long_passwords):
+    if isinstance(password, str):
+        password = password.encode('utf-8')
+    if handle_long_passwords:
+        password = hashlib.sha256(password).hexdigest().encode('utf-8')
+    return password
+
+
+def _generate(password, rounds, prefix, handle_long_passwords):
+    """bcrypt hash as text (runs in a worker process)"""
+    if not password:
+        raise ValueError('Password must be non-empty.')
+    salt = _bcrypt.gensalt(rounds=rounds, prefix=prefix.encode('utf-8'))
+    return _bcrypt.hashpw(_prepare(password, handle_long_passwords), salt).decode('utf-8')
+
+
+def _check(pw_hash, password, handle_long_passwords):
+    """Constant-time comparison of a candidate password (runs in a worker process)"""
+    pw_hash = pw_hash.encode('utf-8')
+    return hmac.compare_digest(_bcrypt.hashpw(_prepare(password, handle_long_passwords), pw_hash), pw_hash)
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.prefix = '2b'
+        self.handle_long_passwords = False
+        self.workers = 0
+        self.max_queue = 0
+        self.timeout = 10.0
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.prefix = app.config.get('BCRYPT_HASH_PREFIX', '2b')
+        self.handle_long_passwords = app.config.get('BCRYPT_HANDLE_LONG_PASSWORDS', False)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.max_queue = app.config.get('PASSWORD_HASH_MAX_QUEUE', 0)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10.0)
+        self.shutdown()
+        # In-flight + queued jobs; workers=0 hashes inline on the caller's thread
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue) if self.workers else None
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # Workers start from a clean forkserver that imports this module, not a
+                    # fork of a threaded web worker nor the server's __main__ (create_app())
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=worker_context(__name__))
+                    atexit.register(self.shutdown)
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _run(self, operation, fn, *args):
+        started = time.perf_counter()
+        if self._slots is None:
+            try:
+                return fn(*args)
+            finally:
+                PASSWORD_HASH_LATENCY.observe(time.perf_counter() - started, operation=operation)
+
+        if not self._slots.acquire(blocking=False):
+            PASSWORD_HASH_REJECTED.inc(operation=operation)
+            raise HasherBusy()
+        PASSWORD_HASH_INFLIGHT.inc()
+        slots = self._slots
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BaseException:
+            self._release(slots)
+            raise
+        # The slot is freed when the job really ends: a timed-out job cannot be
+        # cancelled once a worker runs it and still occupies that worker
+        future.add_done_callback(lambda _: self._release(slots))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            PASSWORD_HASH_REJECTED.inc(operation=operation)
+            raise HasherBusy()
+        finally:
+            PASSWORD_HASH_LATENCY.observe(time.perf_counter() - started, operation=operation)
+
+    @staticmethod
+    def _release(slots):
+        PASSWORD_HASH_INFLIGHT.dec()
+        slots.release()
+
+    def generate_password_hash(self, password, rounds=None):
+        """bcrypt hash (text) with the configured work factor"""
+        return self._run('hash', _generate, password, rounds or self.rounds, self.prefix,
+                         self.handle_long_passwords)
+
+    def check_password_hash(self, pw_hash, password):
+        return self._run('check', _check, pw_hash, password, self.handle_long_passwords)
+
+    def needs_rehash(self, pw_hash):
+        """True when the stored hash was made with a different work factor"""
+        match = _COST_RE.match(pw_hash or '')
+        return match is None or int(match.group(1)) != self.rounds
@@ -0,0 +1,8 @@
+"""
+Offline benchmark suite for the matching, extraction, search and upload hot paths
+
+Run from the backend directory:
+    python -m benchmarks                      # run every case, compare with baseline.json
+    python -m benchmarks match_cv cv_upload   # run selected cases
+    python -m benchmarks --update-baseline    # record a new baseline
+"""
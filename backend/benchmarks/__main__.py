@@ -0,0 +1,77 @@
+"""
+Command line entry point: python -m benchmarks [cases...] [options]
+"""
+
+import argparse
+import os
+import sys
+import warnings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from benchmarks.cases import CASES  # noqa: E402
+from benchmarks.context import BenchContext  # noqa: E402
+from benchmarks import runner  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('cases', nargs='*', help=f"cases to run (default: all). Available: {', '.join(CASES)}")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='where to write the JSON results')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='allowed p50/p95 slowdown before failing (0.5 = +50%%)')
+    parser.add_argument('--update-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every case iteration count')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        print(f"Unknown benchmark case(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    selected = args.cases or list(CASES)
+
+    warnings.filterwarnings('ignore')
+    ctx = BenchContext()
+    results = {}
+    try:
+        for name in selected:
+            spec = CASES[name]
+            fn = spec['setup'](ctx)
+            iterations = max(1, int(spec['iterations'] * args.scale))
+            results[name] = runner.measure(fn, iterations, warmup=spec['warmup'])
+            print(f"  {name}: p50 {results[name]['p50_ms']:.3f} ms", file=sys.stderr)
+    finally:
+        ctx.close()
+
+    baseline = {}
+    if not args.update_baseline and os.path.exists(args.baseline):
+        baseline = runner.load_results(args.baseline)
+
+    print(runner.format_table(results, baseline))
+    runner.save_results(args.output, results)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        runner.save_results(args.baseline, results)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    regressions = runner.compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSION (tolerance +{args.tolerance:.0%}):", file=sys.stderr)
+        for name, metric, before, after, ratio in regressions:
+            print(f"  {name} {metric}: {before:.3f} ms -> {after:.3f} ms ({ratio:.2f}x)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
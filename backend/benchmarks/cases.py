@@ -0,0 +1,102 @@
+"""
+Benchmark cases
+
+Each case receives the shared BenchContext, does its setup and returns the
+zero-argument callable to time.
+"""
+
+import itertools
+
+CASES = {}
+
+
+def case(name, iterations=100, warmup=3):
+    def register(setup):
+        CASES[name] = {'setup': setup, 'iterations': iterations, 'warmup': warmup}
+        return setup
+    return register
+
+
+def _expect(response, status):
+    if response.status_code != status:
+        raise RuntimeError(f"Unexpected status {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+# Matching ----------------------------------------------------------------------
+
+@case('match_cv_2p', iterations=300)
+def bench_match_cv(ctx):
+    service = ctx.cv_matching_service
+    text = ctx.cv_text(2)
+    return lambda: service.match_cv(text, top_n=5)
+
+
+@case('match_cv_10p', iterations=100)
+def bench_match_cv_long(ctx):
+    service = ctx.cv_matching_service
+    text = ctx.cv_text(10)
+    return lambda: service.match_cv(text, top_n=5)
+
+
+@case('find_top_matches_2p', iterations=300)
+def bench_find_top_matches(ctx):
+    service = ctx.job_matching_service
+    text = ctx.cv_text(2)
+    return lambda: service.find_top_matches(text, top_n=5)
+
+
+# Extraction --------------------------------------------------------------------
+
+def _extract_case(kind, n_pages, cached=False):
+    def setup(ctx):
+        from app.utils.file_handler import extract_text_from_file
+        path = ctx.cv_file(kind, n_pages)
+        if cached:
+            ctx.app  # initialises the extraction cache
+        if not extract_text_from_file(path, use_cache=cached):
+            raise RuntimeError(f"No text extracted from synthetic {kind}")
+        return lambda: extract_text_from_file(path, use_cache=cached)
+    return setup
+
+
+case('extract_pdf_2p', iterations=50)(_extract_case('pdf', 2))
+case('extract_pdf_10p', iterations=20)(_extract_case('pdf', 10))
+case('extract_docx_2p', iterations=50)(_extract_case('docx', 2))
+case('extract_txt_2p', iterations=200)(_extract_case('txt', 2))
+case('extract_pdf_10p_cached', iterations=200)(_extract_case('pdf', 10, cached=True))
+
+
+# HTTP through the Flask test client ----------------------------------------------
+
+def _search_case(page, per_page):
+    def setup(ctx):
+        client, headers = ctx.client, ctx.auth_headers
+        url = f"/api/jobs/search?page={page}&per_page={per_page}"
+        _expect(client.get(url, headers=headers), 200)
+        return lambda: client.get(url, headers=headers)
+    return setup
+
+
+case('jobs_search_first_page', iterations=200)(_search_case(1, 10))
+case('jobs_search_deep_page', iterations=200)(_search_case(1400, 10))
+case('jobs_search_per_page_500', iterations=30)(_search_case(1, 500))
+
+
+def _upload_case(kind, n_pages):
+    def setup(ctx):
+        client, headers = ctx.client, ctx.auth_headers
+        # A new nonce per call: the same bytes again would only measure extraction cache hits
+        nonces = itertools.count()
+
+        def upload():
+            _expect(client.post('/api/cv/upload', headers=headers,
+                                data=ctx.cv_upload_payload(kind, n_pages, nonce=next(nonces)),
+                                content_type='multipart/form-data'), 201)
+        upload()
+        return upload
+    return setup
+
+
+case('cv_upload_pdf_2p', iterations=30)(_upload_case('pdf', 2))
+case('cv_upload_docx_2p', iterations=30)(_upload_case('docx', 2))
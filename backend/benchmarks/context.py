@@ -0,0 +1,94 @@
+"""
+Shared, lazily built fixtures for benchmark cases
+
+The Flask app runs against a throwaway SQLite database and upload folder so
+the suite never touches a configured MySQL instance or real uploads.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+from functools import cached_property
+
+from benchmarks import fixtures
+
+BENCH_EMAIL = 'bench@example.com'
+BENCH_PASSWORD = 'bench-password'
+
+
+class BenchContext:
+    def __init__(self):
+        self.workdir = tempfile.mkdtemp(prefix='jobscope-bench-')
+        # Must happen before `config` is imported anywhere
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(self.workdir, 'bench.db')
+
+    def close(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    # ML services -----------------------------------------------------------
+
+    @cached_property
+    def cv_matching_service(self):
+        from app.services.cv_matching_service import CVMatchingService
+        return CVMatchingService()
+
+    @cached_property
+    def job_matching_service(self):
+        from app.services.matching_service import JobMatchingService
+        return JobMatchingService()
+
+    # Inputs ------------------------------------------------------------------
+
+    def cv_text(self, n_pages=2, seed=0):
+        return fixtures.cv_text(n_pages, seed)
+
+    def cv_file(self, kind, n_pages=2):
+        """Path of a synthetic CV file ('pdf', 'docx' or 'txt') written once per run"""
+        name = f"cv_{n_pages}p.{kind}"
+        path = os.path.join(self.workdir, name)
+        if not os.path.exists(path):
+            data = {
+                'pdf': fixtures.cv_pdf_bytes,
+                'docx': fixtures.cv_docx_bytes,
+                'txt': fixtures.cv_text,
+            }[kind](n_pages)
+            fixtures.write_fixture(self.workdir, name, data)
+        return path
+
+    def cv_upload_payload(self, kind, n_pages=2, nonce=None):
+        """Multipart form of the synthetic CV; a nonce changes its bytes (not its text), see fixtures.with_nonce"""
+        with open(self.cv_file(kind, n_pages), 'rb') as f:
+            data = f.read()
+        if nonce is not None:
+            data = fixtures.with_nonce(data, kind, nonce)
+        return {'file': (io.BytesIO(data), f"cv.{kind}")}
+
+    # Flask app -----------------------------------------------------------------
+
+    def make_app(self, **overrides):
+        """Flask app on the throwaway database, with optional config overrides"""
+        from app import create_app
+        from config import Config
+
+        settings = {'UPLOAD_FOLDER': os.path.join(self.workdir, 'uploads'), 'TESTING': True,
+                    'EXTRACTION_CACHE_PATH': os.path.join(self.workdir, 'extraction_cache.sqlite')}
+        settings.update(overrides)
+        return create_app(type('BenchConfig', (Config,), settings))
+
+    @cached_property
+    def app(self):
+        return self.make_app()
+
+    @cached_property
+    def client(self):
+        return self.app.test_client()
+
+    @cached_property
+    def auth_headers(self):
+        credentials = {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD, 'full_name': 'Bench'}
+        response = self.client.post('/api/auth/register', json=credentials)
+        if response.status_code != 201:
+            response = self.client.post('/api/auth/login', json=credentials)
+        token = response.get_json()['access_token']
+        return {'Authorization': f"Bearer {token}"}
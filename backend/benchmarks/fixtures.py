@@ -0,0 +1,110 @@
+"""
+Synthetic CV inputs: plain text, PDF and DOCX
+"""
+
+import io
+import os
+import random
+import struct
+
+import docx
+
+SECTIONS = ['SUMMARY', 'EXPERIENCE', 'EDUCATION', 'SKILLS', 'CERTIFICATIONS', 'PROJECTS']
+SKILLS = ['Python', 'SQL', 'TensorFlow', 'PyTorch', 'Docker', 'Kubernetes', 'AWS', 'GCP',
+          'Azure', 'NLP', 'Computer Vision', 'Deep Learning', 'Machine Learning', 'Spark',
+          'Hadoop', 'Tableau', 'Statistics', 'Linux', 'Git', 'Scala', 'R', 'MLOps']
+PHRASES = ['Designed and deployed', 'Led a team building', 'Improved the accuracy of',
+           'Maintained production', 'Collaborated with stakeholders on', 'Automated',
+           'Reduced latency of', 'Built data pipelines for', 'Researched new methods for']
+OBJECTS = ['recommendation systems', 'forecasting models', 'data platforms', 'REST APIs',
+           'computer vision pipelines', 'chatbots', 'fraud detection', 'dashboards',
+           'ETL workflows', 'search ranking', 'A/B testing frameworks']
+LINES_PER_PAGE = 45
+
+
+def cv_lines(n_pages, seed=0):
+    """Lines of a realistic-looking CV spanning roughly `n_pages` pages"""
+    rng = random.Random(seed)
+    lines = ['JANE DOE', 'jane.doe@example.com | +1 555 0100 | Berlin, Germany']
+    while len(lines) < n_pages * LINES_PER_PAGE:
+        lines.append('')
+        lines.append(rng.choice(SECTIONS))
+        for _ in range(rng.randint(4, 9)):
+            skills = ', '.join(rng.sample(SKILLS, 3))
+            lines.append(f"- {rng.choice(PHRASES)} {rng.choice(OBJECTS)} using {skills} "
+                         f"({rng.randint(2012, 2024)}).")
+    return lines[:n_pages * LINES_PER_PAGE]
+
+
+def cv_text(n_pages, seed=0):
+    return '\n'.join(cv_lines(n_pages, seed))
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def cv_pdf_bytes(n_pages, seed=0):
+    """Minimal multi-page PDF with one Helvetica text stream per page"""
+    lines = cv_lines(n_pages, seed)
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    n = len(pages)
+    # Objects: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            ' '.join(f"{4 + 2 * i} 0 R" for i in range(n)), n)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page in enumerate(pages):
+        text = ''.join(f"({_pdf_escape(line)}) Tj T* " for line in page)
+        stream = f"BT /F1 10 Tf 14 TL 50 800 Td {text}ET".encode('latin-1', 'replace')
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>").encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def cv_docx_bytes(n_pages, seed=0):
+    document = docx.Document()
+    for line in cv_lines(n_pages, seed):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def with_nonce(data, kind, nonce):
+    """
+    Same PDF or DOCX, different bytes: a comment after %%EOF or in the ZIP
+    end record. The extracted text is unchanged but the content hash (the
+    extraction cache key) differs.
+    """
+    tag = f"nonce {nonce}".encode()
+    if kind == 'pdf':
+        return data + b'%' + tag + b'\n'
+    if kind == 'docx' and data[-22:-18] == b'PK\x05\x06':
+        return data[:-2] + struct.pack('<H', len(tag)) + tag
+    raise ValueError(f"No nonce for {kind} files")
+
+
+def write_fixture(directory, name, data):
+    """Write bytes (or text) to `directory/name` and return the path"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
@@ -0,0 +1,100 @@
+"""
+Latency and agreement of the lexical (BM25 / TF-IDF) engine against LDA
+
+    python -m benchmarks.lexical                       # trained catalog and a 20x replicated one
+    python -m benchmarks.lexical --replicate 50 --queries 300
+
+Queries are the reference CVs (experience, education and skills). For each
+catalog size it reports per-query latency of the LDA dense scan, exhaustive
+BM25 scoring and the max-score top-k, checks that max-score returns the
+exhaustive ranking, and measures `overlap@5` between lexical and LDA top-5
+lists (how often the two engines agree on a job).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.lda_inference import INFERENCE_ARTIFACT, LDAInference  # noqa: E402
+from engine.lexical import LexicalIndex, SCHEMES  # noqa: E402
+from engine.quantize import cosine_scores  # noqa: E402
+from engine.topk import top_k_window  # noqa: E402
+from engine.vectorizer import FastCountVectorizer  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(BACKEND_DIR, 'final_model')
+TOP_N = 5
+
+
+def per_query_ms(fn, queries):
+    started = time.perf_counter()
+    results = [fn(*query) for query in queries]
+    return (time.perf_counter() - started) / len(queries) * 1000, results
+
+
+def evaluate(label, doc_terms, job_topics, queries):
+    print(f"\n{label}: {doc_terms.shape[0]:,} jobs, {len(queries)} queries "
+          f"({np.mean([len(terms[0]) for terms, _ in queries]):.1f} vocabulary terms per CV)")
+    print(f"{'engine':<22}{'ms/query':>10}{'exact':>8}{'overlap@5 vs LDA':>18}")
+    lda_ms, lda_top = per_query_ms(lambda terms, topics: top_k_window(cosine_scores(topics, job_topics), 0, TOP_N),
+                                   queries)
+    print(f"{'lda (dense scan)':<22}{lda_ms:>10.3f}{'-':>8}{1:>18.3f}")
+
+    for scheme in SCHEMES:
+        started = time.perf_counter()
+        index = LexicalIndex.build(doc_terms, scheme)
+        build_s = time.perf_counter() - started
+
+        def exhaustive(terms, topics):
+            scores = index.scores(*terms)
+            best = top_k_window(scores, 0, TOP_N)
+            return best[scores[best] > 0]
+
+        exhaustive_ms, expected = per_query_ms(exhaustive, queries)
+        search_ms, found = per_query_ms(lambda terms, topics: index.search(*terms, k=TOP_N)[0], queries)
+        exact = np.mean([np.array_equal(a, b) for a, b in zip(found, expected)])
+        overlap = np.mean([len(set(a) & set(b)) / TOP_N for a, b in zip(found, lda_top)])
+        print(f"{scheme + ' exhaustive':<22}{exhaustive_ms:>10.3f}{'-':>8}{overlap:>18.3f}")
+        print(f"{scheme + ' max-score':<22}{search_ms:>10.3f}{exact:>8.0%}{overlap:>18.3f}"
+              f"   (index built in {build_s:.2f}s, {index.impacts.nbytes / 1e6:.1f} MB of postings)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--replicate', type=int, default=20, help='copies of the catalog for the scale run')
+    args = parser.parse_args(argv)
+
+    inference = LDAInference.load(os.path.join(MODEL_DIR, INFERENCE_ARTIFACT))
+    vectorizer = FastCountVectorizer.from_inference(inference)
+    jobs = pd.read_pickle(os.path.join(MODEL_DIR, 'jobs_dataframe.pkl'))
+    job_topics = np.asarray(joblib.load(os.path.join(MODEL_DIR, 'job_topic_distributions.joblib')))
+    doc_terms = vectorizer.transform(jobs['Text'].fillna('').astype(str))
+
+    cvs = pd.read_csv(os.path.join(BACKEND_DIR, 'data', 'dataset_cvs_cleaned.csv')).fillna('')
+    texts = (cvs['experience'] + ' ' + cvs['education'] + ' ' + cvs['skills']).tolist()
+    queries = []
+    for text in texts:
+        terms = vectorizer.transform_one(text)
+        if len(terms[0]):
+            queries.append((terms, inference.transform_ids(*terms)))
+        if len(queries) == args.queries:
+            break
+
+    evaluate('trained catalog', doc_terms, job_topics, queries)
+    if args.replicate > 1:
+        evaluate(f'{args.replicate}x replicated catalog', sp.vstack([doc_terms] * args.replicate).tocsr(),
+                 np.tile(job_topics, (args.replicate, 1)), queries[:max(10, args.queries // 4)])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+Load generator for a running API server with a realistic traffic mix
+
+Start the server against SQLite, then drive it:
+    DATABASE_URL=sqlite:///loadtest.db python server.py
+    python -m benchmarks.loadtest --users 20 --concurrency 8 --duration 60          # closed loop
+    python -m benchmarks.loadtest --users 20 --rate 15 --duration 60                # open loop
+    python -m benchmarks.loadtest --users 20 --rates 2,4,8,16,32 --duration 30      # saturation sweep
+
+Closed loop keeps `--concurrency` virtual users busy back to back. Open loop
+schedules Poisson arrivals at `--rate` requests/s whatever the server does;
+latency is measured from the scheduled arrival time so queueing inside the
+server (e.g. the Waitress thread pool) shows up in the numbers.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures  # noqa: E402
+
+# Relative weights of each action in the traffic mix
+DEFAULT_MIX = {
+    'upload': 1,
+    'search': 6,
+    'history': 2,
+    'job_stats': 1,
+    'matching_stats': 1,
+    'me': 2,
+    'login': 1,
+}
+SEARCH_PAGES = 1500
+
+
+class Recorder:
+    """Thread-safe latency/outcome samples per endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+
+    def add(self, endpoint, latency, ok):
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append((latency, ok))
+
+    def report(self, elapsed):
+        report = {}
+        with self._lock:
+            items = {name: list(values) for name, values in self.samples.items()}
+        for endpoint, values in sorted(items.items()):
+            latencies = np.array([latency for latency, _ in values]) * 1000
+            errors = sum(1 for _, ok in values if not ok)
+            report[endpoint] = {
+                'requests': len(values),
+                'errors': errors,
+                'error_rate': round(errors / len(values), 4),
+                'p50_ms': round(float(np.percentile(latencies, 50)), 2),
+                'p95_ms': round(float(np.percentile(latencies, 95)), 2),
+                'p99_ms': round(float(np.percentile(latencies, 99)), 2),
+                'max_ms': round(float(latencies.max()), 2),
+                'throughput_per_s': round(len(values) / elapsed, 2),
+            }
+        return report
+
+
+class VirtualUser:
+    def __init__(self, base_url, email, password, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.email = email
+        self.password = password
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.headers = {}
+
+    def signup(self):
+        payload = {'email': self.email, 'password': self.password, 'full_name': 'Load Test'}
+        response = self.session.post(f"{self.base_url}/api/auth/register", json=payload, timeout=self.timeout)
+        if response.status_code not in (201, 400):
+            raise RuntimeError(f"register failed for {self.email}: {response.status_code} {response.text[:200]}")
+        self.login()
+
+    def login(self):
+        response = self.session.post(f"{self.base_url}/api/auth/login",
+                                     json={'email': self.email, 'password': self.password},
+                                     timeout=self.timeout)
+        response.raise_for_status()
+        self.headers = {'Authorization': f"Bearer {response.json()['access_token']}"}
+        return response
+
+    def request(self, action, rng, corpus):
+        url = self.base_url
+        if action == 'upload':
+            name, data = rng.choice(corpus)
+            return self.session.post(f"{url}/api/cv/upload", headers=self.headers,
+                                     files={'file': (name, data)}, timeout=self.timeout)
+        if action == 'search':
+            page = rng.randint(1, SEARCH_PAGES)
+            return self.session.get(f"{url}/api/jobs/search", headers=self.headers,
+                                    params={'page': page, 'per_page': 10}, timeout=self.timeout)
+        if action == 'history':
+            return self.session.get(f"{url}/api/cv/history", headers=self.headers, timeout=self.timeout)
+        if action == 'job_stats':
+            return self.session.get(f"{url}/api/jobs/stats", headers=self.headers, timeout=self.timeout)
+        if action == 'matching_stats':
+            return self.session.get(f"{url}/api/cv/matching-stats", timeout=self.timeout)
+        if action == 'me':
+            return self.session.get(f"{url}/api/auth/me", headers=self.headers, timeout=self.timeout)
+        if action == 'login':
+            return self.login()
+        raise ValueError(f"Unknown action: {action}")
+
+
+def load_corpus(cv_dir, size):
+    """(filename, bytes) pairs from a directory of CVs, or synthetic PDF/DOCX/TXT"""
+    if cv_dir:
+        corpus = []
+        for name in sorted(os.listdir(cv_dir)):
+            if name.rsplit('.', 1)[-1].lower() in ('pdf', 'docx', 'txt'):
+                with open(os.path.join(cv_dir, name), 'rb') as f:
+                    corpus.append((name, f.read()))
+        if not corpus:
+            raise SystemExit(f"No PDF/DOCX/TXT files found in {cv_dir}")
+        return corpus
+
+    builders = [('pdf', fixtures.cv_pdf_bytes), ('docx', fixtures.cv_docx_bytes),
+                ('txt', lambda pages, seed: fixtures.cv_text(pages, seed).encode('utf-8'))]
+    corpus = []
+    for i in range(size):
+        kind, build = builders[i % len(builders)]
+        corpus.append((f"cv_{i}.{kind}", build(1 + i % 5, i)))
+    return corpus
+
+
+def parse_mix(text):
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in text.split(','):
+        action, weight = item.split('=')
+        mix[action.strip()] = float(weight)
+    return mix
+
+
+def timed_call(user, action, rng, corpus, recorder, scheduled=None):
+    start = time.perf_counter()
+    try:
+        response = user.request(action, rng, corpus)
+        ok = response.status_code < 400
+    except requests.RequestException:
+        ok = False
+    recorder.add(action, time.perf_counter() - (scheduled or start), ok)
+
+
+def run_closed_loop(users, mix, corpus, concurrency, duration, think_time, seed):
+    recorder = Recorder()
+    actions, weights = zip(*mix.items())
+    deadline = time.perf_counter() + duration
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        user = users[index % len(users)]
+        while time.perf_counter() < deadline:
+            timed_call(user, rng.choices(actions, weights)[0], rng, corpus, recorder)
+            if think_time:
+                time.sleep(rng.expovariate(1.0 / think_time))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.report(time.perf_counter() - start)
+
+
+def run_open_loop(users, mix, corpus, rate, duration, max_outstanding, seed):
+    recorder = Recorder()
+    actions, weights = zip(*mix.items())
+    rng = random.Random(seed)
+    dropped = 0
+
+    start = time.perf_counter()
+    next_arrival = start
+    with ThreadPoolExecutor(max_workers=max_outstanding) as pool:
+        outstanding = threading.BoundedSemaphore(max_outstanding)
+        while next_arrival < start + duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            action = rng.choices(actions, weights)[0]
+            user = rng.choice(users)
+            call_rng = random.Random(rng.random())
+            if outstanding.acquire(blocking=False):
+                scheduled = next_arrival
+
+                def call(user=user, action=action, call_rng=call_rng, scheduled=scheduled):
+                    try:
+                        timed_call(user, action, call_rng, corpus, recorder, scheduled)
+                    finally:
+                        outstanding.release()
+                pool.submit(call)
+            else:
+                # The generator itself is saturated: count as a failed arrival
+                dropped += 1
+                recorder.add(action, 0.0, False)
+            next_arrival += rng.expovariate(rate)
+    elapsed = time.perf_counter() - start
+    report = recorder.report(elapsed)
+    return report, dropped
+
+
+def summarize(report):
+    total = sum(stats['requests'] for stats in report.values())
+    errors = sum(stats['errors'] for stats in report.values())
+    throughput = sum(stats['throughput_per_s'] for stats in report.values())
+    return {'requests': total, 'errors': errors, 'throughput_per_s': round(throughput, 2)}
+
+
+def print_report(title, report):
+    print(f"\n{title}")
+    header = f"{'endpoint':<16}{'reqs':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}"
+    print(header)
+    print('-' * len(header))
+    for endpoint, stats in report.items():
+        print(f"{endpoint:<16}{stats['requests']:>7}{stats['errors']:>8}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['throughput_per_s']:>9.2f}")
+    total = summarize(report)
+    print(f"{'TOTAL':<16}{total['requests']:>7}{total['errors']:>8}{'':>30}{total['throughput_per_s']:>9.2f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadtest', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--users', type=int, default=10, help='accounts to register and log in')
+    parser.add_argument('--corpus-size', type=int, default=12, help='synthetic CVs when --cv-dir is not given')
+    parser.add_argument('--cv-dir', help='directory of PDF/DOCX/TXT CVs to upload')
+    parser.add_argument('--mix', help='traffic mix, e.g. "upload=1,search=6,history=2,job_stats=1,me=2"')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds per run (per step when sweeping)')
+    parser.add_argument('--concurrency', type=int, default=4, help='closed loop: concurrent virtual users')
+    parser.add_argument('--think-time', type=float, default=0.0, help='closed loop: mean pause between requests (s)')
+    parser.add_argument('--rate', type=float, help='open loop: arrivals per second')
+    parser.add_argument('--rates', help='open loop sweep: comma-separated arrival rates')
+    parser.add_argument('--max-outstanding', type=int, default=256, help='open loop: in-flight request cap')
+    parser.add_argument('--timeout', type=float, default=60.0, help='per-request timeout (s)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+    corpus = load_corpus(args.cv_dir, args.corpus_size)
+
+    run_id = uuid.uuid4().hex[:8]
+    users = [VirtualUser(args.base_url, f"loadtest-{run_id}-{i}@example.com", 'loadtest-password', args.timeout)
+             for i in range(args.users)]
+    print(f"Registering {len(users)} users against {args.base_url} ...")
+    signup = Recorder()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(8, len(users))) as pool:
+        def register(user):
+            t0 = time.perf_counter()
+            user.signup()
+            signup.add('register+login', time.perf_counter() - t0, True)
+        list(pool.map(register, users))
+    output = {'config': vars(args), 'mix': mix, 'signup': signup.report(time.perf_counter() - started)}
+
+    if args.rates or args.rate:
+        rates = [float(r) for r in args.rates.split(',')] if args.rates else [args.rate]
+        output['mode'] = 'open'
+        output['steps'] = []
+        for rate in rates:
+            report, dropped = run_open_loop(users, mix, corpus, rate, args.duration,
+                                            args.max_outstanding, args.seed)
+            print_report(f"Open loop @ {rate:g} req/s offered ({dropped} dropped by the generator)", report)
+            output['steps'].append({'offered_rate': rate, 'dropped': dropped,
+                                    'summary': summarize(report), 'endpoints': report})
+        print("\nSaturation sweep (offered -> achieved, error rate, worst p95):")
+        for step in output['steps']:
+            summary = step['summary']
+            worst_p95 = max(stats['p95_ms'] for stats in step['endpoints'].values())
+            error_rate = summary['errors'] / summary['requests'] if summary['requests'] else 0
+            print(f"  {step['offered_rate']:>7g} -> {summary['throughput_per_s']:>7.2f} req/s, "
+                  f"{error_rate:6.1%} errors, p95 {worst_p95:.0f} ms")
+    else:
+        report = run_closed_loop(users, mix, corpus, args.concurrency, args.duration, args.think_time, args.seed)
+        print_report(f"Closed loop, {args.concurrency} concurrent users", report)
+        output['mode'] = 'closed'
+        output['summary'] = summarize(report)
+        output['endpoints'] = report
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Login throughput under concurrency, with and without the hashing pool
+
+A fixed pool of "server" threads (like Waitress threads=4) serves a burst of
+logins interleaved with lightweight /api/health requests, through the Flask
+test client:
+    python -m benchmarks.login                       # inline vs pooled hashing
+    python -m benchmarks.login --rounds 10 --logins 200 --concurrency 32
+
+Inline hashing keeps server threads busy for the whole bcrypt call, so health
+checks queue behind logins. The pool bounds bcrypt work and sheds the excess
+with 503, so health latency stays flat.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.context import BenchContext  # noqa: E402
+
+
+def percentiles(values):
+    if not values:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    values = np.array(values) * 1000
+    return {f"p{q}_ms": round(float(np.percentile(values, q)), 2) for q in (50, 95, 99)}
+
+
+def run_mode(ctx, label, server_threads, logins, health_every, rounds, workers, max_queue):
+    app = ctx.make_app(BCRYPT_LOG_ROUNDS=rounds, PASSWORD_HASH_WORKERS=workers,
+                       PASSWORD_HASH_MAX_QUEUE=max_queue)
+    email = f"login-bench-{label}@example.com"
+    credentials = {'email': email, 'password': 'bench-password'}
+    app.test_client().post('/api/auth/register', json=credentials)
+
+    local = threading.local()
+    lock = threading.Lock()
+    samples = {'login_ok': [], 'login_503': [], 'health': []}
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        return local.client
+
+    def call(kind, submitted):
+        if kind == 'login':
+            status = client().post('/api/auth/login', json=credentials).status_code
+            key = 'login_ok' if status == 200 else 'login_503' if status == 503 else None
+            if key is None:
+                raise RuntimeError(f"Unexpected login status {status}")
+        else:
+            client().get('/api/health')
+            key = 'health'
+        with lock:
+            samples[key].append(time.perf_counter() - submitted)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=server_threads) as server:
+        futures = []
+        for i in range(logins):
+            futures.append(server.submit(call, 'login', time.perf_counter()))
+            if i % health_every == 0:
+                futures.append(server.submit(call, 'health', time.perf_counter()))
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    from app import password_hasher
+    password_hasher.shutdown()
+    return {
+        'mode': label,
+        'elapsed_s': round(elapsed, 2),
+        'logins_per_s': round(len(samples['login_ok']) / elapsed, 2),
+        'rejected_503': len(samples['login_503']),
+        'login': percentiles(samples['login_ok']),
+        'health': percentiles(samples['health']),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.login', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=64, help='logins in the burst')
+    parser.add_argument('--server-threads', type=int, default=4)
+    parser.add_argument('--health-every', type=int, default=2, help='one health check per N logins')
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt work factor')
+    parser.add_argument('--workers', type=int, default=2, help='hashing processes for the pooled mode')
+    parser.add_argument('--max-queue', type=int, default=1, help='queued hashes beyond the workers')
+    args = parser.parse_args(argv)
+
+    ctx = BenchContext()
+    try:
+        results = [
+            run_mode(ctx, 'inline', args.server_threads, args.logins, args.health_every, args.rounds, 0, 0),
+            run_mode(ctx, 'pool', args.server_threads, args.logins, args.health_every, args.rounds,
+                     args.workers, args.max_queue),
+        ]
+    finally:
+        ctx.close()
+
+    print(f"{'mode':<8}{'logins/s':>10}{'503s':>6}{'login p50':>11}{'login p95':>11}"
+          f"{'health p50':>12}{'health p95':>12}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['logins_per_s']:>10.2f}{r['rejected_503']:>6}"
+              f"{r['login']['p50_ms'] or 0:>11.1f}{r['login']['p95_ms'] or 0:>11.1f}"
+              f"{r['health']['p50_ms'] or 0:>12.1f}{r['health']['p95_ms'] or 0:>12.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
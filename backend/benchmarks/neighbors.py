@@ -0,0 +1,65 @@
+"""
+Recompute time and artifact size of the "similar jobs" neighbour lists
+
+    python -m benchmarks.neighbors                    # 15k real jobs + 1M synthetic
+    python -m benchmarks.neighbors --jobs 1000000 --sample 4096 -k 20
+
+The real catalog is scored in full. Larger synthetic catalogs (Dirichlet
+topic mixtures shaped like the trained model) are scored for `--sample`
+query rows against the whole corpus and the total is extrapolated linearly:
+every query row costs the same (one row of the matrix product plus one
+argpartition over N columns). The artifact size is exact: N * k * 8 bytes.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.topk import DEFAULT_K, blocked_top_k, save_neighbors  # noqa: E402
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'final_model')
+
+
+def report(label, n_jobs, k, seconds, size_bytes, sampled=None):
+    note = f" (extrapolated from {sampled} rows)" if sampled else ''
+    print(f"{label:<22}{n_jobs:>10,}{k:>4}{seconds:>12.1f}{size_bytes / 1e6:>12.1f}  {n_jobs / seconds:>10,.0f}{note}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, nargs='*', default=[1_000_000], help='synthetic catalog sizes')
+    parser.add_argument('--sample', type=int, default=2048, help='query rows scored per synthetic catalog')
+    parser.add_argument('-k', type=int, default=DEFAULT_K)
+    args = parser.parse_args(argv)
+
+    topics = joblib.load(os.path.join(MODEL_DIR, 'job_topic_distributions.joblib'))
+    print(f"{'catalog':<22}{'jobs':>10}{'k':>4}{'seconds':>12}{'size MB':>12}  {'rows/s':>10}")
+
+    started = time.perf_counter()
+    ids, scores = blocked_top_k(topics, topics, k=args.k, exclude_self=True)
+    seconds = time.perf_counter() - started
+    with tempfile.TemporaryDirectory() as tmp:
+        size = os.path.getsize(save_neighbors(os.path.join(tmp, 'neighbors.npz'), ids, scores))
+    report('trained (real)', len(topics), args.k, seconds, size)
+
+    rng = np.random.default_rng(0)
+    alpha = np.maximum(topics.mean(axis=0), 1e-3)
+    for n_jobs in args.jobs:
+        corpus = rng.dirichlet(alpha, size=n_jobs).astype(np.float32)
+        sample = min(args.sample, n_jobs)
+        started = time.perf_counter()
+        blocked_top_k(corpus[:sample], corpus, k=args.k)
+        seconds = (time.perf_counter() - started) * n_jobs / sample
+        report('synthetic', n_jobs, args.k, seconds, n_jobs * args.k * 8, sampled=sample)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
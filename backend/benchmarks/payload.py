@@ -0,0 +1,92 @@
+"""
+Payload size and serialization time for the large JSON endpoints
+
+    python -m benchmarks.payload
+
+For /api/jobs/search with a large per_page, /api/cv/dataset/sample and
+/api/cv/history, reports the body size raw and gzip-compressed, and the
+time to serialize the payload with Flask's default provider versus
+FastJSONProvider (orjson when installed).
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.context import BenchContext  # noqa: E402
+
+HISTORY_UPLOADS = 100
+
+
+def best_of(fn, repeat=5, number=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings) * 1000
+
+
+def seed_history(ctx):
+    from app import db
+    from app.models.user import CVUpload, JobMatch, User
+    with ctx.app.app_context():
+        user = User.query.filter_by(email='bench@example.com').first()
+        for i in range(HISTORY_UPLOADS):
+            upload = CVUpload(user_id=user.id, filename=f"cv_{i}.pdf", file_path=f"/tmp/cv_{i}.pdf",
+                              extracted_text='x' * 1000, skills='TF-IDF Matched')
+            db.session.add(upload)
+            db.session.flush()
+            for rank in range(1, 6):
+                db.session.add(JobMatch(cv_upload_id=upload.id, job_title='Machine Learning Engineer',
+                                        company='TechCorp Inc', location='Germany', salary=98000.0,
+                                        required_skills='Python, TensorFlow, Kubernetes, AWS, SQL',
+                                        similarity_score=0.9 - rank / 100, rank=rank))
+        db.session.commit()
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    ctx = BenchContext()
+    try:
+        from flask.json.provider import DefaultJSONProvider
+        from app.utils.json_provider import FastJSONProvider, orjson
+
+        client, headers = ctx.client, ctx.auth_headers
+        seed_history(ctx)
+        endpoints = {
+            'search per_page=500': '/api/jobs/search?per_page=500',
+            'search per_page=2000': '/api/jobs/search?per_page=2000',
+            'dataset sample 1000': '/api/cv/dataset/sample?limit=1000',
+            f'history ({HISTORY_UPLOADS} CVs)': '/api/cv/history',
+        }
+        default_provider = DefaultJSONProvider(ctx.app)
+        fast_provider = FastJSONProvider(ctx.app)
+
+        print(f"JSON encoder: {'orjson' if orjson else 'stdlib json'}\n")
+        print(f"{'payload':<24}{'raw KB':>9}{'gzip KB':>9}{'ratio':>7}{'default ms':>12}{'fast ms':>9}{'gzip ms':>9}")
+        for name, url in endpoints.items():
+            response = client.get(url, headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url}: {response.status_code}")
+            payload = json.loads(response.get_data())
+            raw = fast_provider.dumps(payload).encode('utf-8')
+            compressed = gzip.compress(raw, compresslevel=ctx.app.config['COMPRESS_LEVEL'])
+            default_ms = best_of(lambda: default_provider.dumps(payload))
+            fast_ms = best_of(lambda: fast_provider.dumps(payload))
+            gzip_ms = best_of(lambda: gzip.compress(raw, compresslevel=ctx.app.config['COMPRESS_LEVEL']))
+            print(f"{name:<24}{len(raw) / 1024:>9.1f}{len(compressed) / 1024:>9.1f}"
+                  f"{len(raw) / len(compressed):>6.1f}x{default_ms:>12.2f}{fast_ms:>9.2f}{gzip_ms:>9.2f}")
+    finally:
+        ctx.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Memory, latency and top-5 agreement of quantized topic matrices
+
+    python -m benchmarks.quantization                  # trained catalog + 1M synthetic jobs
+    python -m benchmarks.quantization --jobs 200000 --queries 100
+
+Queries are reference CV topic vectors. Agreement is measured against the
+float64 ranking in two ways: `overlap@5`, the share of the exact top-5 ids
+returned, and `recall@5`, the share of returned jobs whose exact float64
+score reaches the exact 5th best score (minus 1e-6). The trained catalog
+has many near-identical postings, so ties make overlap understate quality;
+recall is the number that matters for users.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.quantize import QuantizedMatrix, cosine_scores  # noqa: E402
+from engine.topk import top_k_indices  # noqa: E402
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'final_model')
+TOP_N = 5
+
+
+def evaluate(label, jobs, queries):
+    exact = [cosine_scores(q, jobs) for q in queries]
+    exact_top = [top_k_indices(scores, TOP_N) for scores in exact]
+    exact_started = time.perf_counter()
+    for q in queries:
+        top_k_indices(cosine_scores(q, jobs), TOP_N)
+    exact_ms = (time.perf_counter() - exact_started) / len(queries) * 1000
+    print(f"\n{label}: {jobs.shape[0]:,} jobs x {jobs.shape[1]} topics, {len(queries)} queries")
+    print(f"{'storage':<10}{'MB':>9}{'saved':>8}{'ms/query':>10}{'overlap@5':>11}{'recall@5':>10}")
+    print(f"{'float64':<10}{jobs.nbytes / 1e6:>9.1f}{'-':>8}{exact_ms:>10.3f}{1:>11.3f}{1:>10.3f}")
+
+    for dtype in ('float32', 'float16', 'uint8'):
+        matrix = QuantizedMatrix.from_matrix(jobs, dtype)
+        started = time.perf_counter()
+        found = [top_k_indices(matrix.scores(q), TOP_N) for q in queries]
+        ms = (time.perf_counter() - started) / len(queries) * 1000
+        overlap = np.mean([len(set(a) & set(b)) / TOP_N for a, b in zip(exact_top, found)])
+        recall = np.mean([(scores[ids] >= scores[top[-1]] - 1e-6).mean()
+                          for scores, top, ids in zip(exact, exact_top, found)])
+        saved = 1 - matrix.nbytes / jobs.nbytes
+        print(f"{dtype:<10}{matrix.nbytes / 1e6:>9.1f}{saved:>7.0%}{ms:>10.3f}{overlap:>11.3f}{recall:>10.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, nargs='*', default=[1_000_000], help='synthetic catalog sizes')
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    jobs = np.asarray(joblib.load(os.path.join(MODEL_DIR, 'job_topic_distributions.joblib')), dtype=np.float64)
+    queries = np.load(os.path.join(MODEL_DIR, 'cv_topic_matrix.npy'))[:args.queries]
+    evaluate('trained catalog', jobs, queries)
+
+    rng = np.random.default_rng(0)
+    alpha = np.maximum(jobs.mean(axis=0), 1e-3)
+    for n_jobs in args.jobs:
+        evaluate('synthetic', rng.dirichlet(alpha, size=n_jobs), queries[:max(10, args.queries // 10)])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
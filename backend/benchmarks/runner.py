@@ -0,0 +1,92 @@
+"""
+Timing loop, percentile summary and baseline comparison
+"""
+
+import json
+import os
+import platform
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+def measure(fn, iterations, warmup=3):
+    """Call `fn` repeatedly and summarize per-call latency"""
+    for _ in range(warmup):
+        fn()
+
+    timings = np.empty(iterations)
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for i in range(iterations):
+        t0 = perf_counter()
+        fn()
+        timings[i] = perf_counter() - t0
+    elapsed = perf_counter() - start
+
+    timings_ms = timings * 1000
+    return {
+        'iterations': iterations,
+        'mean_ms': round(float(timings_ms.mean()), 4),
+        'p50_ms': round(float(np.percentile(timings_ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(timings_ms, 95)), 4),
+        'p99_ms': round(float(np.percentile(timings_ms, 99)), 4),
+        'max_ms': round(float(timings_ms.max()), 4),
+        'throughput_per_s': round(iterations / elapsed, 2),
+    }
+
+
+def environment():
+    import sklearn
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def save_results(path, results, extra=None):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {'environment': environment(), 'results': results}
+    if extra:
+        payload.update(extra)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, tolerance):
+    """Regressions where p50 or p95 grew by more than `tolerance` (0.5 = +50%)"""
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            if reference[metric] <= 0:
+                continue
+            ratio = current[metric] / reference[metric]
+            if ratio > 1 + tolerance:
+                regressions.append((name, metric, reference[metric], current[metric], ratio))
+    return regressions
+
+
+def format_table(results, baseline=None):
+    header = f"{'case':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>11}{'vs base':>9}"
+    rows = [header, '-' * len(header)]
+    for name, stats in results.items():
+        reference = (baseline or {}).get(name)
+        delta = f"{stats['p50_ms'] / reference['p50_ms']:.2f}x" if reference and reference['p50_ms'] > 0 else '-'
+        rows.append(f"{name:<28}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                    f"{stats['p99_ms']:>10.3f}{stats['throughput_per_s']:>11.1f}{delta:>9}")
+    return '\n'.join(rows)
@@ -0,0 +1,68 @@
+"""
+Scaling of sharded top-k matching with the number of worker processes
+
+    python -m benchmarks.shards                        # 1M synthetic jobs, 1..cpu_count processes
+    python -m benchmarks.shards --jobs 4000000 --processes 1 2 4 8 --queries 50
+
+Every run is checked against the single-process reference ranking; a
+mismatch aborts the benchmark. Fan-out costs a few hundred microseconds of
+inter-process round trips per query, so sharding only pays off once a
+full scan of the catalog takes longer than that.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.shards import ShardedMatcher, single_process_top_k  # noqa: E402
+from engine.topk import normalize_rows  # noqa: E402
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'final_model')
+TOP_N = 20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=1_000_000, help='synthetic catalog size')
+    parser.add_argument('--processes', type=int, nargs='*',
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--queries', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    reference = np.asarray(joblib.load(os.path.join(MODEL_DIR, 'job_topic_distributions.joblib')))
+    queries = np.load(os.path.join(MODEL_DIR, 'cv_topic_matrix.npy'))[:args.queries]
+    alpha = np.maximum(reference.mean(axis=0), 1e-3)
+    jobs = np.random.default_rng(0).dirichlet(alpha, size=args.jobs)
+
+    normalized = normalize_rows(jobs)
+    expected = [single_process_top_k(normalized, q, TOP_N) for q in queries]
+    started = time.perf_counter()
+    for q in queries:
+        single_process_top_k(normalized, q, TOP_N)
+    baseline = (time.perf_counter() - started) / len(queries) * 1000
+
+    print(f"{args.jobs:,} jobs x {jobs.shape[1]} topics, top-{TOP_N}, {len(queries)} queries, "
+          f"{os.cpu_count()} CPU(s)")
+    print(f"{'processes':<11}{'ms/query':>10}{'speedup':>9}")
+    print(f"{'in-process':<11}{baseline:>10.2f}{1:>9.2f}")
+    for processes in args.processes:
+        with ShardedMatcher(jobs, n_shards=processes) as matcher:
+            matcher.search(queries[0], TOP_N)  # start the workers
+            started = time.perf_counter()
+            found = [matcher.search(q, TOP_N) for q in queries]
+            ms = (time.perf_counter() - started) / len(queries) * 1000
+        if found != expected:
+            print(f"results differ from the single-process path with {processes} process(es)")
+            return 1
+        print(f"{processes:<11}{ms:>10.2f}{baseline / ms:>9.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,6 +2,8 @@ import os
 from datetime import timedelta
 from dotenv import load_dotenv
 
+from engine.database import normalize_database_url
+
 load_dotenv()
 
 class Config:
@@ -9,15 +11,28 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     
+    # Password hashing (bcrypt work factor and the dedicated hashing process pool)
+    # Hashes made with another work factor are upgraded transparently at login.
+    # PASSWORD_HASH_WORKERS=0 hashes inline on the request thread.
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_QUEUE = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', 1))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+    
+    # Identity (user profile) cache for /api/auth/me; TTL 0 disables it.
+    # Set IDENTITY_CACHE_SHARED_PATH to a SQLite file to share entries between workers.
+    IDENTITY_CACHE_TTL = float(os.environ.get('IDENTITY_CACHE_TTL', 60))
+    IDENTITY_CACHE_MAX_SIZE = int(os.environ.get('IDENTITY_CACHE_MAX_SIZE', 10000))
+    IDENTITY_CACHE_SHARED_PATH = os.environ.get('IDENTITY_CACHE_SHARED_PATH') or None
+    IDENTITY_CACHE_LOCAL_TTL = float(os.environ.get('IDENTITY_CACHE_LOCAL_TTL', 5))
+    
     # Database Configuration
     # Set DATABASE_URL for external MySQL (Railway, etc.)
     # Or use MYSQL_* vars for local MySQL
     database_url = os.environ.get('DATABASE_URL')
     if database_url:
-        # Convert mysql:// to mysql+pymysql:// if needed
-        if database_url.startswith('mysql://'):
-            database_url = database_url.replace('mysql://', 'mysql+pymysql://', 1)
-        SQLALCHEMY_DATABASE_URI = database_url
+        # Convert mysql:// to mysql+pymysql:// if needed (engine.allpairs does the same)
+        SQLALCHEMY_DATABASE_URI = normalize_database_url(database_url)
     elif os.environ.get('MYSQL_USER') or os.environ.get('MYSQL_PASSWORD'):
         # Local MySQL via individual vars
         SQLALCHEMY_DATABASE_URI = \
@@ -30,15 +45,78 @@ class Config:
         raise ValueError("No database configured. Set DATABASE_URL or MYSQL_* environment variables.")
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-    }
+    # Engine profile ('sqlite' or 'mysql'; detected from the URI when unset), see app/utils/db_engine.py.
+    # The pool holds one connection per server thread (DB_POOL_SIZE overrides), capped at
+    # DB_MAX_CONNECTIONS / WEB_CONCURRENCY when the server limits connections.
+    DB_ENGINE_PROFILE = os.environ.get('DB_ENGINE_PROFILE') or None
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 0)) or None
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 2))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 300))
+    DB_MAX_CONNECTIONS = int(os.environ.get('DB_MAX_CONNECTIONS', 0)) or None
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+    SQLITE_BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 5))
+    # Explicit engine options, applied on top of the profile
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    
+    # Gzip JSON/text responses larger than this many bytes (when the client accepts gzip)
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 5))
+    
+    # Conditional GET on catalog-derived endpoints (ETag = model/catalog version + query).
+    # CATALOG_VERSION pins the version, e.g. to share ETags between hosts.
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 60))
+    CATALOG_VERSION = os.environ.get('CATALOG_VERSION') or None
+    
+    # Server threads (waitress) and admission control for /api/cv/upload: at most
+    # UPLOAD_MAX_INFLIGHT uploads run at once, UPLOAD_MAX_QUEUE more wait up to
+    # UPLOAD_QUEUE_TIMEOUT seconds, the rest get 503. Running + queued uploads never
+    # use the last UPLOAD_RESERVED_THREADS threads. UPLOAD_MAX_INFLIGHT=0 disables the limit.
+    # SERVER_THREADS keeps waitress' default of 4; the upload limits (half of the threads
+    # reserved, the rest split between running and queued) and the DB pool follow it.
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4))
+    UPLOAD_RESERVED_THREADS = int(os.environ.get('UPLOAD_RESERVED_THREADS', SERVER_THREADS // 2))
+    UPLOAD_MAX_INFLIGHT = int(os.environ.get('UPLOAD_MAX_INFLIGHT',
+                                             max(1, (SERVER_THREADS - UPLOAD_RESERVED_THREADS) // 2)))
+    UPLOAD_MAX_QUEUE = int(os.environ.get('UPLOAD_MAX_QUEUE',
+                                          max(0, SERVER_THREADS - UPLOAD_RESERVED_THREADS - UPLOAD_MAX_INFLIGHT)))
+    UPLOAD_QUEUE_TIMEOUT = float(os.environ.get('UPLOAD_QUEUE_TIMEOUT', 5))
     
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
     
+    # Text extracted from uploaded files, keyed by content hash in a SQLite file shared
+    # by the workers; least recently used entries go beyond EXTRACTION_CACHE_MAX_BYTES
+    # of text. An empty EXTRACTION_CACHE_PATH disables the cache.
+    EXTRACTION_CACHE_PATH = os.environ.get('EXTRACTION_CACHE_PATH',
+                                           os.path.join(os.path.dirname(__file__), 'instance', 'extraction_cache.sqlite'))
+    EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    
+    # Uploads (matches, files) older than this many days are deleted by purge_uploads.py; 0 keeps them
+    UPLOAD_RETENTION_DAYS = int(os.environ.get('UPLOAD_RETENTION_DAYS', 0))
+    
+    # Storage of the job topic matrix used for matching: float64 (exact), float32,
+    # float16 or uint8 (per-row scaled); see benchmarks/quantization.py for recall
+    TOPIC_MATRIX_DTYPE = os.environ.get('TOPIC_MATRIX_DTYPE', 'float64')
+    
+    # Default CV -> jobs matching engine: lda (topic similarity), bm25 or tfidf
+    # (lexical inverted index over the same vocabulary); ?engine= overrides it per request
+    MATCHING_ENGINE = os.environ.get('MATCHING_ENGINE', 'lda')
+    
+    # LDA ranking over MATCH_SHARDS worker processes, each scanning a row shard of the job
+    # matrix in shared memory (engine.shards); one pool per web worker process, in the CV
+    # matching service that ranks uploads (upload, rematch, more matches).
+    # 0 (default) scans in-process, which is faster below millions of jobs
+    MATCH_SHARDS = int(os.environ.get('MATCH_SHARDS', 0))
+    
+    # "More matches" paging: topic vectors of recent uploads are cached for
+    # MATCH_CACHE_TTL seconds (re-inferred from the stored text afterwards)
+    MATCH_CACHE_TTL = float(os.environ.get('MATCH_CACHE_TTL', 900))
+    MATCH_CACHE_MAX_SIZE = int(os.environ.get('MATCH_CACHE_MAX_SIZE', 10000))
+    MATCH_PAGE_MAX_SIZE = int(os.environ.get('MATCH_PAGE_MAX_SIZE', 50))
+    
+    MODEL_DIR = os.path.join(os.path.dirname(__file__), 'final_model')
     JOBS_DATASET_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ai_job_dataset.csv')
     CV_DATASET_PATH = os.path.join(os.path.dirname(__file__), 'data', 'dataset_cvs_cleaned.csv')
     
@@ -0,0 +1,53 @@
+"""
+Shared test setup: every test runs on its own database, upload folder and
+extraction cache under tmp_path, builds apps with `make_app` and signs in
+with `auth_headers`
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# config.py reads these once, when the test modules import the app package;
+# apps built by make_app never use them
+_IMPORT_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(_IMPORT_DIR, 'test.db'))
+os.environ.setdefault('EXTRACTION_CACHE_PATH', os.path.join(_IMPORT_DIR, 'extraction_cache.sqlite'))
+
+
+@pytest.fixture(autouse=True)
+def isolated_environment(tmp_path, monkeypatch):
+    """DATABASE_URL and EXTRACTION_CACHE_PATH for code reading them at run time (CLIs, subprocesses)"""
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///' + str(tmp_path / 'test.db'))
+    monkeypatch.setenv('EXTRACTION_CACHE_PATH', str(tmp_path / 'extraction_cache.sqlite'))
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build test apps on the test's database, upload folder and extraction cache"""
+    from app import create_app
+    from config import Config
+
+    def factory(**overrides):
+        settings = {'TESTING': True,
+                    'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'test.db'),
+                    'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+                    'EXTRACTION_CACHE_PATH': str(tmp_path / 'extraction_cache.sqlite'),
+                    'BCRYPT_LOG_ROUNDS': 4, 'PASSWORD_HASH_WORKERS': 0, **overrides}
+        return create_app(type('TestConfig', (Config,), settings))
+    return factory
+
+
+@pytest.fixture
+def auth_headers():
+    """Register (or log in) an account on a test client and return its Authorization header"""
+    def sign_in(client, email='tester@example.com', password='pw123456'):
+        credentials = {'email': email, 'password': password, 'full_name': 'Test User'}
+        response = client.post('/api/auth/register', json=credentials)
+        if response.status_code != 201:
+            response = client.post('/api/auth/login', json=credentials)
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return sign_in
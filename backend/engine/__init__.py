@@ -0,0 +1,5 @@
+"""
+Flask-free building blocks of the LDA matching engine
+Shared by the training script, the API services and offline tools;
+`python -m engine` matches CVs from the command line (engine/cli.py)
+"""
@@ -0,0 +1,9 @@
+"""
+Command line entry point: python -m engine {match,batch-match,bench} (see engine/cli.py)
+"""
+
+import sys
+
+from engine.cli import main
+
+sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Offline all-pairs CV x job scoring
+
+Top-k jobs for every CV without materialising the (n_cvs, n_jobs) matrix.
+Rows are split into blocks handed to worker processes; each worker streams
+over the job catalog in column tiles, scores a (tile_rows, tile_cols)
+float32 block with one matrix product and folds it into a running (rows, k)
+top-k. The topic matrices are shared through .npy memory maps, so workers
+copy nothing but their own block of scores.
+
+    python -m engine.allpairs --output results/cv_top_jobs.npz
+    python -m engine.allpairs --uploads --database-url sqlite:///instance/app.db -k 20 --processes 4
+
+The result holds `job_rows` (n, k) int32 indices into the job catalog and
+`scores` (n, k) float32, best first, plus `sources`/`keys` telling which CV
+each row belongs to (dataset CSV row or cv_upload id). A `.parquet` output
+writes the same data in long format (needs pyarrow).
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine.topk import normalize_rows
+
+DEFAULT_TILE_ROWS = 1024
+DEFAULT_TILE_COLS = 8192
+
+_worker = {}
+
+
+def merge_top_k(best_ids, best_scores, ids, scores, k):
+    """Fold candidate columns (rows, c) into a running (rows, k) top-k, best first"""
+    all_ids = np.concatenate([best_ids, ids], axis=1)
+    all_scores = np.concatenate([best_scores, scores], axis=1)
+    if all_scores.shape[1] > k:
+        part = np.argpartition(all_scores, all_scores.shape[1] - k, axis=1)[:, -k:]
+        all_ids = np.take_along_axis(all_ids, part, axis=1)
+        all_scores = np.take_along_axis(all_scores, part, axis=1)
+    order = np.argsort(-all_scores, axis=1, kind='stable')
+    return np.take_along_axis(all_ids, order, axis=1), np.take_along_axis(all_scores, order, axis=1)
+
+
+def score_block(queries, corpus, k, tile_cols=DEFAULT_TILE_COLS):
+    """Running top-k of normalised `queries` against normalised `corpus`, one column tile at a time"""
+    n = queries.shape[0]
+    k = min(k, corpus.shape[0])
+    best_ids = np.empty((n, 0), dtype=np.int32)
+    best_scores = np.empty((n, 0), dtype=np.float32)
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    for start in range(0, corpus.shape[0], tile_cols):
+        tile = np.asarray(corpus[start:start + tile_cols], dtype=np.float32)
+        scores = queries @ tile.T
+        width = min(k, scores.shape[1])
+        if width < scores.shape[1]:
+            part = np.argpartition(scores, scores.shape[1] - width, axis=1)[:, -width:]
+            scores = np.take_along_axis(scores, part, axis=1)
+        else:
+            part = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        best_ids, best_scores = merge_top_k(best_ids, best_scores, (part + start).astype(np.int32), scores, k)
+    return best_ids, best_scores
+
+
+def _init_worker(queries_path, corpus_path, k, tile_cols):
+    _worker.update(queries=np.load(queries_path, mmap_mode='r'), corpus=np.load(corpus_path, mmap_mode='r'),
+                   k=k, tile_cols=tile_cols)
+
+
+def _score_rows(bounds):
+    start, stop = bounds
+    ids, scores = score_block(_worker['queries'][start:stop], _worker['corpus'], _worker['k'], _worker['tile_cols'])
+    return start, ids, scores
+
+
+def _as_npy(matrix, workdir, name):
+    """Path of a normalised float32 .npy copy of `matrix` that workers can memory-map"""
+    path = os.path.join(workdir, f'{name}.npy')
+    np.save(path, normalize_rows(matrix))
+    return path
+
+
+def score_all_pairs(queries, corpus, k=20, processes=1, tile_rows=DEFAULT_TILE_ROWS, tile_cols=DEFAULT_TILE_COLS):
+    """
+    Top-k corpus rows for every query row (cosine similarity)
+
+    Returns:
+        (ids, scores): (n, k) int32 corpus indices and float32 scores, best first
+    """
+    n = queries.shape[0]
+    k = min(k, corpus.shape[0])
+    ids = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+    blocks = [(start, min(n, start + tile_rows)) for start in range(0, n, tile_rows)]
+
+    if processes <= 1:
+        q, c = normalize_rows(queries), normalize_rows(corpus)
+        for start, stop in blocks:
+            ids[start:stop], scores[start:stop] = score_block(q[start:stop], c, k, tile_cols)
+        return ids, scores
+
+    with tempfile.TemporaryDirectory() as workdir:
+        init_args = (_as_npy(queries, workdir, 'queries'), _as_npy(corpus, workdir, 'corpus'), k, tile_cols)
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=init_args) as pool:
+            for start, block_ids, block_scores in pool.map(_score_rows, blocks):
+                ids[start:start + len(block_ids)] = block_ids
+                scores[start:start + len(block_scores)] = block_scores
+    return ids, scores
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process and its finished children (Linux: KB units)"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return own / 1024, children / 1024
+
+
+def load_upload_topics(database_url, model_dir):
+    """
+    (cv_upload ids, topic vectors, number of approximate vectors) of stored uploads
+
+    Uses the topic vector stored with each upload when it comes from the
+    current model; the others are inferred from their saved full text.
+    Uploads saved before the full text only have the 1000-character preview:
+    their vectors are approximate and counted apart.
+    """
+    from sqlalchemy import create_engine, inspect, text
+
+    from engine.database import normalize_database_url
+    from engine.lda_inference import INFERENCE_ARTIFACT, LDAInference
+    from engine.topic_store import decode_topics, model_fingerprint
+    from engine.vectorizer import FastCountVectorizer
+
+    inference = LDAInference.load(os.path.join(model_dir, INFERENCE_ARTIFACT))
+    engine = create_engine(normalize_database_url(database_url))
+    columns = {column['name'] for column in inspect(engine).get_columns('cv_uploads')}
+    stored = 'topic_vector, model_version' if {'topic_vector', 'model_version'} <= columns else 'NULL, NULL'
+    full_text = 'full_text' if 'full_text' in columns else 'NULL'
+    with engine.connect() as conn:
+        rows = conn.execute(text(f'SELECT id, extracted_text, {full_text}, {stored} '
+                                 'FROM cv_uploads ORDER BY id')).fetchall()
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, inference.n_components)), 0
+
+    version = model_fingerprint(model_dir)
+    keys = np.array([row[0] for row in rows], dtype=np.int64)
+    topics = np.empty((len(rows), inference.n_components))
+    missing, texts, approximate = [], [], 0
+    for i, (_, preview, full, blob, model_version) in enumerate(rows):
+        if blob is not None and model_version == version:
+            topics[i] = decode_topics(blob)
+            continue
+        missing.append(i)
+        texts.append(full if full is not None else preview or '')
+        approximate += full is None
+    if missing:
+        vectorizer = FastCountVectorizer.from_inference(inference)
+        topics[missing] = inference.transform(vectorizer.transform(texts))
+    return keys, topics, approximate
+
+
+def write_results(path, sources, keys, ids, scores):
+    if path.endswith('.parquet'):
+        import pandas as pd  # needs pyarrow (or fastparquet) for to_parquet
+        k = ids.shape[1]
+        pd.DataFrame({
+            'source': np.repeat(sources, k),
+            'key': np.repeat(keys, k),
+            'rank': np.tile(np.arange(1, k + 1, dtype=np.int16), len(keys)),
+            'job_row': ids.ravel(),
+            'score': scores.ravel(),
+        }).to_parquet(path, index=False)
+    else:
+        np.savez(path, sources=sources, keys=keys, job_rows=ids, scores=scores)
+    return path
+
+
+def main(argv=None):
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description='Top-k jobs for every reference CV and stored upload')
+    parser.add_argument('--model-dir', default=os.path.join(backend_dir, 'final_model'))
+    parser.add_argument('--output', default=os.path.join(backend_dir, 'results', 'cv_top_jobs.npz'),
+                        help='.npz (default) or .parquet')
+    parser.add_argument('-k', type=int, default=20)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--tile-rows', type=int, default=DEFAULT_TILE_ROWS)
+    parser.add_argument('--tile-cols', type=int, default=DEFAULT_TILE_COLS)
+    parser.add_argument('--no-dataset', action='store_true', help='skip the reference CV dataset')
+    parser.add_argument('--uploads', action='store_true', help='also score uploaded CVs from the database')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'))
+    args = parser.parse_args(argv)
+
+    import joblib
+    from engine.cv_index import CV_TOPICS_ARTIFACT
+
+    jobs = joblib.load(os.path.join(args.model_dir, 'job_topic_distributions.joblib'))
+    parts, sources, keys = [], [], []
+    if not args.no_dataset:
+        dataset = np.load(os.path.join(args.model_dir, CV_TOPICS_ARTIFACT), mmap_mode='r')
+        parts.append(dataset)
+        sources.append(np.full(len(dataset), 'dataset'))
+        keys.append(np.arange(len(dataset), dtype=np.int64))
+    if args.uploads:
+        if not args.database_url:
+            parser.error('--uploads needs --database-url or DATABASE_URL')
+        upload_ids, upload_topics, approximate = load_upload_topics(args.database_url, args.model_dir)
+        if approximate:
+            print(f"{approximate:,} uploads without full text scored from their 1000-character preview "
+                  "(approximate)", file=sys.stderr)
+        parts.append(upload_topics)
+        sources.append(np.full(len(upload_ids), 'upload'))
+        keys.append(upload_ids)
+    if not parts:
+        parser.error('nothing to score')
+
+    queries = np.concatenate([np.asarray(part, dtype=np.float32) for part in parts])
+    started = time.perf_counter()
+    ids, scores = score_all_pairs(queries, jobs, k=args.k, processes=args.processes,
+                                  tile_rows=args.tile_rows, tile_cols=args.tile_cols)
+    elapsed = time.perf_counter() - started
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_results(args.output, np.concatenate(sources), np.concatenate(keys), ids, scores)
+    own_mb, children_mb = peak_memory_mb()
+    print(f"{len(queries):,} CVs x {len(jobs):,} jobs, top-{ids.shape[1]}, {args.processes} process(es)")
+    print(f"{elapsed:.2f}s, {len(queries) / elapsed:,.0f} rows/s")
+    print(f"peak RSS: main {own_mb:.0f} MB, largest worker {children_mb:.0f} MB")
+    print(f"written: {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+Command line matching without the web app
+
+    python -m engine match cv.pdf                      # one CV (file or - for stdin text)
+    python -m engine batch-match cvs/ --processes 4    # every PDF/DOCX/TXT under a directory
+    python -m engine batch-match - < cvs.ndjson        # {"id": ..., "text": ...} or plain text per line
+    python -m engine bench --queries 500 --processes 4
+
+Results are streamed to stdout as NDJSON, one line per CV in input order:
+{"id", "engine", "total_jobs_searched", "matches"} or {"id", "error"} (empty
+CV, unreadable file, malformed NDJSON line; the batch goes on).
+Common options select the artifacts (--model-dir), the engine, the number of
+matches, filters (--filter location=Germany --filter min_salary=80000) and
+explanations. batch-match and bench spread CVs (extraction included) over a
+process pool; every worker loads its own copy of the model.
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine.extract import EXTENSIONS, read_document
+from engine.filters import parse_filters
+from engine.matcher import DEFAULT_MODEL_DIR, MATCHING_ENGINES, Matcher
+
+logger = logging.getLogger(__name__)
+
+_worker = {}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def iter_inputs(source, whole_stdin=False):
+    """
+    (id, kind, payload) items of a directory, file or stdin ('-')
+
+    Files are yielded as ('file', path) and read by the worker; stdin gives
+    ('text', text) items, one per line unless `whole_stdin`, and ('error',
+    message) for lines that are not valid JSON records.
+    """
+    if source == '-':
+        if whole_stdin:
+            yield 'stdin', 'text', sys.stdin.read()
+            return
+        for number, line in enumerate(sys.stdin, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield str(number), 'error', f'invalid JSON line: {e}'
+                    continue
+                yield str(record.get('id', number)), 'text', record.get('text', '')
+            else:
+                yield str(number), 'text', line
+    elif os.path.isdir(source):
+        for directory, dirs, names in os.walk(source):
+            dirs.sort()
+            for name in sorted(names):
+                if name.rsplit('.', 1)[-1].lower() in EXTENSIONS:
+                    path = os.path.join(directory, name)
+                    yield os.path.relpath(path, source), 'file', path
+    else:
+        yield source, 'file', source
+
+
+def _init_worker(matcher_options, match_options):
+    _worker['matcher'] = Matcher(**matcher_options)
+    _worker['options'] = match_options
+
+
+def _read(kind, payload):
+    return read_document(payload)[0] if kind == 'file' else payload
+
+
+def _match_item(item):
+    """NDJSON line for one input (runs in the worker)"""
+    item_id, kind, payload = item
+    if kind == 'error':
+        return json.dumps({'id': item_id, 'error': payload}, ensure_ascii=False)
+    try:
+        text = _read(kind, payload)
+    except Exception as e:
+        return json.dumps({'id': item_id, 'error': f'cannot read {payload}: {e}'}, ensure_ascii=False)
+    result = _worker['matcher'].match_cv(text, **_worker['options'])
+    if not result['success']:
+        record = {'id': item_id, 'error': result['error']}
+    else:
+        record = {'id': item_id, 'engine': result['engine'],
+                  'total_jobs_searched': result['total_jobs_searched'], 'matches': result['matches']}
+    return json.dumps(record, default=_json_default, ensure_ascii=False)
+
+
+def _timed_match(item):
+    """Seconds spent matching one input (extraction excluded)"""
+    _, kind, payload = item
+    text = _read(kind, payload)
+    started = time.perf_counter()
+    _worker['matcher'].match_cv(text, **_worker['options'])
+    return time.perf_counter() - started
+
+
+def run_pool(fn, items, processes, matcher_options, match_options, chunksize=8):
+    """
+    fn(item) over items, in order, inline (processes <= 1) or on a process pool
+
+    A feeder thread reads the items and submits them one by one, at most
+    `chunksize` per process waiting to be yielded, so memory stays bounded.
+    Every result is yielded as soon as it and the ones before it are done: a
+    slow stdin stream gets each line back without waiting for the next ones.
+    """
+    if processes <= 1:
+        _init_worker(matcher_options, match_options)
+        for item in items:
+            yield fn(item)
+        return
+    futures = queue.Queue(maxsize=chunksize * processes)
+    failure = []
+
+    def feed():
+        try:
+            for item in items:
+                futures.put(executor.submit(fn, item))
+        except Exception as e:  # re-raised after the results read so far
+            failure.append(e)
+        finally:
+            futures.put(None)
+
+    with ProcessPoolExecutor(processes, initializer=_init_worker,
+                             initargs=(matcher_options, match_options)) as executor:
+        threading.Thread(target=feed, daemon=True).start()
+        while (future := futures.get()) is not None:
+            yield future.result()
+    if failure:
+        raise failure[0]
+
+
+def _options(args):
+    try:
+        if any('=' not in value for value in args.filter):
+            raise ValueError('--filter expects KEY=VALUE')
+        params = {}
+        for key, value in (value.split('=', 1) for value in args.filter):
+            params.setdefault(key, []).append(value)
+        # Repeated keys add values (location=Germany --filter location=France)
+        filters = parse_filters({key: values if len(values) > 1 else values[0] for key, values in params.items()})
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+    matcher_options = {'model_dir': args.model_dir, 'topic_dtype': args.topic_dtype, 'default_engine': args.engine}
+    match_options = {'top_n': args.top_n, 'explain': args.explain, 'filters': filters}
+    return matcher_options, match_options
+
+
+def cmd_match(args, out):
+    matcher_options, match_options = _options(args)
+    items = iter_inputs(args.source, whole_stdin=True)
+    for line in run_pool(_match_item, items, 1, matcher_options, match_options):
+        out.write(line + '\n')
+    return 0
+
+
+def cmd_batch_match(args, out):
+    matcher_options, match_options = _options(args)
+    started = time.perf_counter()
+    count = 0
+    for line in run_pool(_match_item, iter_inputs(args.source), args.processes, matcher_options, match_options,
+                         chunksize=args.chunksize):
+        out.write(line + '\n')
+        out.flush()
+        count += 1
+    elapsed = time.perf_counter() - started
+    logger.info("%d CVs in %.2fs (%.1f/s, %d process(es))", count, elapsed, count / max(elapsed, 1e-9),
+                args.processes)
+    return 0
+
+
+def cmd_bench(args, out):
+    """Per-query latency in one process, then throughput over the pool; one JSON summary line"""
+    matcher_options, match_options = _options(args)
+    # One in-process matcher for sampling and the latency run (pool workers load their own)
+    _worker.update(matcher=Matcher(**matcher_options), options=match_options)
+    if args.source:
+        items = [item for item in iter_inputs(args.source) if item[1] != 'error']
+    else:
+        # Job descriptions stand in for CVs when no inputs are given
+        texts = _worker['matcher'].df_jobs['Text'].fillna('').astype(str)
+        picked = np.random.default_rng(0).choice(len(texts), size=min(args.queries, len(texts)), replace=False)
+        items = [(str(row), 'text', texts.iloc[row]) for row in picked]
+    items = [(item_id, 'text', _read(kind, payload)) for item_id, kind, payload in items]
+    if not items:
+        raise SystemExit('error: no inputs')
+
+    latencies = np.array([_timed_match(item) for item in items]) * 1000
+    summary = {'engine': args.engine, 'queries': len(items), 'top_n': args.top_n,
+               'p50_ms': float(np.percentile(latencies, 50)), 'p95_ms': float(np.percentile(latencies, 95)),
+               'p99_ms': float(np.percentile(latencies, 99)), 'single_process_per_s': float(1000 / latencies.mean())}
+    if args.processes > 1:
+        started = time.perf_counter()
+        for _ in run_pool(_match_item, items, args.processes, matcher_options, match_options, args.chunksize):
+            pass
+        # Includes the workers' model loading
+        summary.update(processes=args.processes, pool_per_s=len(items) / (time.perf_counter() - started))
+    out.write(json.dumps(summary) + '\n')
+    return 0
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--model-dir', default=DEFAULT_MODEL_DIR, help='training artifacts (default: final_model/)')
+    common.add_argument('--topic-dtype', default='float64', choices=('float64', 'float32', 'float16', 'uint8'))
+    common.add_argument('--engine', default='lda', choices=MATCHING_ENGINES)
+    common.add_argument('--top-n', type=int, default=5)
+    common.add_argument('--filter', action='append', default=[], metavar='KEY=VALUE',
+                        help='job filter as in the API, e.g. location=Germany,France or min_salary=80000')
+    common.add_argument('--explain', action='store_true', help='add contributing topics and shared terms')
+    common.add_argument('-v', '--verbose', action='store_true', help='log model loading and timings to stderr')
+    pool = argparse.ArgumentParser(add_help=False)
+    pool.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    pool.add_argument('--chunksize', type=int, default=8, help='inputs queued per worker process')
+
+    parser = argparse.ArgumentParser(prog='python -m engine', description=__doc__.split('\n\n')[0].strip())
+    commands = parser.add_subparsers(dest='command', required=True)
+    match = commands.add_parser('match', parents=[common], help='match one CV')
+    match.add_argument('source', help='PDF, DOCX or TXT file, or - for text on stdin')
+    match.set_defaults(handler=cmd_match)
+    batch = commands.add_parser('batch-match', parents=[common, pool], help='match many CVs (NDJSON out)')
+    batch.add_argument('source', help='directory of PDF/DOCX/TXT files, a file, or - for one CV per stdin line')
+    batch.set_defaults(handler=cmd_batch_match)
+    bench = commands.add_parser('bench', parents=[common, pool], help='latency and throughput')
+    bench.add_argument('source', nargs='?', help='inputs as for batch-match (default: sampled job texts)')
+    bench.add_argument('--queries', type=int, default=200, help='sampled job texts when no source is given')
+    bench.set_defaults(handler=cmd_bench)
+    return parser
+
+
+def main(argv=None, out=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr,
+                        format='%(levelname)s %(name)s: %(message)s')
+    if not args.verbose:
+        # scikit-learn version warnings when unpickling the model (inherited by forked workers)
+        warnings.filterwarnings('ignore', module='sklearn')
+    return args.handler(args, out or sys.stdout)
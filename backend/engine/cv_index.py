@@ -0,0 +1,107 @@
+"""
+CV topic index for reverse matching (job -> candidate CVs)
+
+Training saves the topic vectors of the reference CV dataset as
+`cv_topic_matrix.npy`: float32, L2-normalised rows in CSV row order, so it
+can be memory-mapped and searched with a single matrix-vector product.
+CVs uploaded after training are appended in memory, keyed by their upload
+id, and searched alongside the reference rows without retraining; deleted
+uploads are removed again.
+"""
+
+import threading
+
+import numpy as np
+
+from engine.topk import normalize_rows, top_k_indices
+
+CV_TOPICS_ARTIFACT = 'cv_topic_matrix.npy'
+
+
+def save_cv_topics(path, cv_topics):
+    """Write normalised CV topic vectors (one row per dataset CV)"""
+    np.save(path, normalize_rows(cv_topics))
+    return path
+
+
+class CVTopicIndex:
+    def __init__(self, base, n_topics=None):
+        """
+        Args:
+            base: (N, K) normalised reference vectors (possibly a memmap), or None
+            n_topics: K when there is no reference matrix
+        """
+        self.base = base
+        self.n_topics = base.shape[1] if base is not None else n_topics
+        self._lock = threading.Lock()
+        self._extra = np.empty((16, self.n_topics), dtype=np.float32)
+        self._extra_keys = []
+        self._positions = {}
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        return cls(np.load(path, mmap_mode='r' if mmap else None))
+
+    @property
+    def n_base(self):
+        return 0 if self.base is None else self.base.shape[0]
+
+    @property
+    def n_extra(self):
+        return len(self._extra_keys)
+
+    def append(self, key, topics):
+        """Add (or replace) the topic vector of an uploaded CV"""
+        vector = normalize_rows(np.asarray(topics).reshape(1, -1))[0]
+        with self._lock:
+            position = self._positions.get(key)
+            if position is None:
+                position = len(self._extra_keys)
+                if position == len(self._extra):
+                    grown = np.empty((2 * len(self._extra), self.n_topics), dtype=np.float32)
+                    grown[:position] = self._extra[:position]
+                    self._extra = grown
+                self._extra_keys.append(key)
+                self._positions[key] = position
+            self._extra[position] = vector
+
+    def remove(self, keys):
+        """Drop uploaded CVs (e.g. deleted uploads); returns how many were indexed"""
+        removed = 0
+        with self._lock:
+            for key in keys:
+                position = self._positions.pop(key, None)
+                if position is None:
+                    continue
+                # Move the last vector into the hole to keep the rows contiguous
+                last = len(self._extra_keys) - 1
+                if position != last:
+                    moved = self._extra_keys[last]
+                    self._extra[position] = self._extra[last]
+                    self._extra_keys[position] = moved
+                    self._positions[moved] = position
+                self._extra_keys.pop()
+                removed += 1
+        return removed
+
+    def search(self, query, k=10, include_base=True, include_extra=True):
+        """
+        k best CVs by cosine similarity to `query` (a topic vector)
+
+        Returns:
+            [(source, key, score)] best first; source is 'dataset' (key = CSV row)
+            or 'upload' (key = the key given to `append`)
+        """
+        query = normalize_rows(np.asarray(query).reshape(1, -1))[0]
+        candidates = []
+        if include_base and self.n_base:
+            scores = self.base @ query
+            candidates += [('dataset', int(row), float(scores[row])) for row in top_k_indices(scores, k)]
+        if include_extra:
+            with self._lock:
+                extra, keys = self._extra[:len(self._extra_keys)], list(self._extra_keys)
+            if keys:
+                scores = extra @ query
+                candidates += [('upload', keys[row], float(scores[row])) for row in top_k_indices(scores, k)]
+        candidates.sort(key=lambda candidate: -candidate[2])
+        return candidates[:k]
@@ -0,0 +1,13 @@
+"""
+Database URLs shared by the web app (config.py) and the offline tools
+
+Hosting providers hand out `mysql://` URLs; SQLAlchemy needs the driver
+spelled out to use PyMySQL, the only MySQL driver in requirements.txt.
+"""
+
+
+def normalize_database_url(url):
+    """Convert mysql:// to mysql+pymysql://; other URLs are returned unchanged"""
+    if url and url.startswith('mysql://'):
+        return url.replace('mysql://', 'mysql+pymysql://', 1)
+    return url
@@ -0,0 +1,64 @@
+"""
+Match explanations
+
+The cosine similarity between a CV and a job in topic space is a sum of
+per-topic terms (cv_t * job_t on normalised vectors), so each topic's share
+of the score says which themes drove the match. Shared terms are the words
+present in both documents, ranked by their weight in those contributing
+topics. The topic-word table and topic labels are computed once; one
+explanation is a few vector operations over K topics and the job's handful
+of terms.
+"""
+
+import numpy as np
+
+DEFAULT_LABEL_WORDS = 5
+
+
+class MatchExplainer:
+    def __init__(self, components, vocabulary, vectorizer, label_words=DEFAULT_LABEL_WORDS):
+        """
+        Args:
+            components: (K, V) LDA `components_` (or any topic-word weights)
+            vocabulary: (V,) terms indexed like the vectorizer columns
+            vectorizer: FastCountVectorizer used to tokenize job texts
+        """
+        components = np.asarray(components, dtype=np.float64)
+        self.topic_word = (components / components.sum(axis=1, keepdims=True)).astype(np.float32)
+        self.vocabulary = np.asarray(vocabulary, dtype=str)
+        self.vectorizer = vectorizer
+        top_ids = np.argsort(-self.topic_word, axis=1)[:, :label_words]
+        self.topic_labels = [', '.join(self.vocabulary[ids]) for ids in top_ids]
+
+    def explain(self, cv_topics, cv_term_ids, job_topics, job_text, n_topics=3, n_terms=5):
+        """
+        Top contributing topics and shared high-weight terms of one match
+
+        Args:
+            cv_topics: (K,) CV topic distribution
+            cv_term_ids: sorted vocabulary ids present in the CV
+            job_topics: (K,) job topic distribution
+            job_text: job text used at training time (title, skills, ...)
+
+        Returns:
+            {'top_topics': [{topic, label, share}], 'shared_terms': [str]}
+        """
+        cv_topics = np.asarray(cv_topics, dtype=np.float64).ravel()
+        job_topics = np.asarray(job_topics, dtype=np.float64).ravel()
+        norms = np.linalg.norm(cv_topics) * np.linalg.norm(job_topics)
+        contribution = cv_topics * job_topics / norms if norms else np.zeros_like(cv_topics)
+        total = contribution.sum()
+        shares = contribution / total if total > 0 else contribution
+
+        top = np.argsort(-contribution, kind='stable')[:n_topics]
+        top_topics = [{'topic': int(t), 'label': self.topic_labels[t], 'share': round(float(shares[t]), 4)}
+                      for t in top if contribution[t] > 0]
+
+        job_ids, _ = self.vectorizer.transform_one(job_text or '')
+        shared = np.intersect1d(cv_term_ids, job_ids, assume_unique=True)
+        shared_terms = []
+        if len(shared):
+            term_scores = contribution.astype(np.float32) @ self.topic_word[:, shared]
+            order = np.argsort(-term_scores, kind='stable')[:n_terms]
+            shared_terms = [str(term) for term in self.vocabulary[shared[order]]]
+        return {'top_topics': top_topics, 'shared_terms': shared_terms}
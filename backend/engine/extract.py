@@ -0,0 +1,80 @@
+"""
+Text extraction from CV files (PDF, DOCX, TXT)
+
+Shared by the upload route (through `app.utils.file_handler`, which adds
+the content-hash cache) and the command line matcher. Unreadable files
+yield (None, None) and a logged warning rather than an exception.
+`read_document` returns normalized text (Unicode NFC, collapsed spaces,
+trimmed lines), so the same CV gives the same text, cache key contents and
+stored preview whichever parser or platform produced it.
+"""
+
+import logging
+import re
+import unicodedata
+
+import docx
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = ('pdf', 'doc', 'docx', 'txt')
+
+_SPACES_RE = re.compile(r'[^\S\n]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+def normalize_text(text):
+    """NFC text, runs of spaces/tabs as one space, trimmed lines, at most one blank line in a row"""
+    text = unicodedata.normalize('NFC', text.replace('\r\n', '\n').replace('\r', '\n'))
+    lines = (_SPACES_RE.sub(' ', line).strip() for line in text.split('\n'))
+    return _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def read_pdf(file_path):
+    """(text, page count) of a PDF file, or (None, None)"""
+    try:
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            text = ''
+            for page in pdf_reader.pages:
+                text += page.extract_text() + '\n'
+            return text, len(pdf_reader.pages)
+    except Exception as e:
+        logger.warning("Error extracting text from PDF %s: %s", file_path, e)
+        return None, None
+
+
+def read_docx(file_path):
+    try:
+        doc = docx.Document(file_path)
+        return '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+    except Exception as e:
+        logger.warning("Error extracting text from DOCX %s: %s", file_path, e)
+        return None
+
+
+def read_txt(file_path):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return file.read()
+    except Exception as e:
+        logger.warning("Error extracting text from TXT %s: %s", file_path, e)
+        return None
+
+
+def _read_raw(file_path):
+    extension = file_path.rsplit('.', 1)[-1].lower()
+    if extension == 'pdf':
+        return read_pdf(file_path)
+    if extension in ('doc', 'docx'):
+        return read_docx(file_path), None
+    if extension == 'txt':
+        return read_txt(file_path), None
+    return None, None
+
+
+def read_document(file_path):
+    """(normalized text, page count) of a PDF, DOCX or TXT file; page count is None outside PDFs"""
+    text, pages = _read_raw(file_path)
+    return (normalize_text(text) if text is not None else None), pages
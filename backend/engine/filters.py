@@ -0,0 +1,199 @@
+"""
+Job filter index
+
+Constraints like "Germany, remote >= 50, salary >= 80k" are resolved before
+top-k instead of post-filtering a handful of matches. `JobFilterIndex`
+precomputes, per column:
+
+* categorical columns: a code per row and a sorted posting list of rows per
+  value (case-insensitive);
+* numeric columns: the values per row and the rows sorted by value, so a
+  range is two `searchsorted` calls.
+
+`candidates(filters)` starts from the most selective predicate's rows and
+checks the remaining predicates on those rows only, so the cost follows the
+size of the smallest candidate set rather than the catalog size. Scoring
+then runs over the returned row ids only.
+
+Filters are a dict keyed by column: an iterable of accepted values for a
+categorical column, a `(low, high)` pair (either bound may be None) for a
+numeric one. `parse_filters` builds it from request parameters.
+"""
+
+import math
+from collections.abc import Mapping
+
+import numpy as np
+
+CATEGORICAL_COLUMNS = ('company_location', 'experience_level', 'employment_type',
+                       'company_size', 'industry', 'education_required')
+NUMERIC_COLUMNS = ('salary_usd', 'remote_ratio', 'years_experience')
+
+# Public request parameters -> columns
+CATEGORICAL_PARAMS = {
+    'location': 'company_location',
+    'experience_level': 'experience_level',
+    'employment_type': 'employment_type',
+    'company_size': 'company_size',
+    'industry': 'industry',
+    'education': 'education_required',
+}
+RANGE_PARAMS = {
+    'salary': 'salary_usd',
+    'remote': 'remote_ratio',
+    'years_experience': 'years_experience',
+}
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(',') if part.strip()]
+    if isinstance(value, (list, tuple, set)):
+        return [part.strip() for item in value for part in str(item).split(',') if part.strip()]
+    return [str(value)]
+
+
+def _all_values(params, key):
+    """Every value of `key`: repeated query parameters (MultiDict) or one value / list (JSON)"""
+    if hasattr(params, 'getlist'):
+        return [part for value in params.getlist(key) for part in _as_list(value)]
+    return _as_list(params.get(key))
+
+
+def parse_filters(params):
+    """
+    Filters from request parameters
+
+    `location=Germany,France`, `experience_level=SE`, `employment_type`,
+    `company_size`, `industry`, `education` (comma-separated, repeated
+    parameters or lists, merged) and `min_salary`/`max_salary`,
+    `min_remote`/`max_remote`, `min_years_experience`/`max_years_experience`.
+    Other keys are ignored.
+
+    Args:
+        params: request values (MultiDict) or a dict decoded from JSON
+
+    Raises:
+        ValueError: params is not a mapping, a bound is not a finite number or min > max
+    """
+    if not isinstance(params, Mapping):
+        raise ValueError("filters must be an object of filter parameters")
+    filters = {}
+    for param, column in CATEGORICAL_PARAMS.items():
+        values = list(dict.fromkeys(_all_values(params, param)))
+        if values:
+            filters[column] = values
+    for param, column in RANGE_PARAMS.items():
+        bounds = []
+        for prefix in ('min_', 'max_'):
+            raw = params.get(prefix + param)
+            if raw is None or raw == '':
+                bounds.append(None)
+                continue
+            try:
+                bound = float(raw)
+            except (TypeError, ValueError):
+                raise ValueError(f"{prefix}{param} must be a number") from None
+            if not math.isfinite(bound):
+                raise ValueError(f"{prefix}{param} must be a finite number")
+            bounds.append(bound)
+        if bounds != [None, None]:
+            if None not in bounds and bounds[0] > bounds[1]:
+                raise ValueError(f"min_{param} is greater than max_{param}")
+            filters[column] = tuple(bounds)
+    return filters
+
+
+class JobFilterIndex:
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+        self.codes = {}      # column -> (N,) value code of every row
+        self.vocab = {}      # column -> {casefolded value: code}
+        self.postings = {}   # column -> [sorted rows] per code
+        self.values = {}     # column -> (N,) numeric values
+        self.sorted = {}     # column -> (sorted values, rows in that order)
+
+    @classmethod
+    def from_dataframe(cls, df, categorical=CATEGORICAL_COLUMNS, numeric=NUMERIC_COLUMNS):
+        index = cls(len(df))
+        for column in categorical:
+            if column in df.columns:
+                index.add_categorical(column, df[column].to_numpy())
+        for column in numeric:
+            if column in df.columns:
+                index.add_numeric(column, df[column].to_numpy(dtype=np.float64, na_value=np.nan))
+        return index
+
+    def add_categorical(self, column, values):
+        keys = np.array([str(value).casefold() for value in values])
+        uniques, codes = np.unique(keys, return_inverse=True)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self.codes[column] = codes.astype(np.int32)
+        self.vocab[column] = {key: code for code, key in enumerate(uniques)}
+        self.postings[column] = [order[bounds[c]:bounds[c + 1]] for c in range(len(uniques))]
+
+    def add_numeric(self, column, values):
+        order = np.argsort(values, kind='stable')
+        self.values[column] = values
+        self.sorted[column] = (values[order], order)
+
+    @property
+    def columns(self):
+        return list(self.vocab) + list(self.values)
+
+    def _plan(self, column, condition):
+        """(estimated rows, column, compiled condition)"""
+        if column in self.vocab:
+            vocab = self.vocab[column]
+            codes = sorted({vocab[key] for key in (str(v).casefold() for v in condition) if key in vocab})
+            return sum(len(self.postings[column][c]) for c in codes), column, np.array(codes, dtype=np.int32)
+        if column in self.values:
+            low, high = condition
+            sorted_values, _ = self.sorted[column]
+            start = 0 if low is None else np.searchsorted(sorted_values, low, side='left')
+            stop = np.searchsorted(sorted_values, np.inf if high is None else high, side='right')
+            return max(0, stop - start), column, (start, stop, low, high)
+        raise ValueError(f"Unknown filter column {column!r}")
+
+    def _rows(self, column, compiled):
+        if column in self.vocab:
+            parts = [self.postings[column][c] for c in compiled]
+            return np.sort(np.concatenate(parts)) if len(parts) > 1 else (parts[0] if parts else np.empty(0, np.intp))
+        start, stop, _, _ = compiled
+        return np.sort(self.sorted[column][1][start:stop])
+
+    def _keep(self, column, compiled, rows):
+        if column in self.vocab:
+            return np.isin(self.codes[column][rows], compiled)
+        _, _, low, high = compiled
+        values = self.values[column][rows]
+        keep = ~np.isnan(values)
+        if low is not None:
+            keep &= values >= low
+        if high is not None:
+            keep &= values <= high
+        return keep
+
+    def candidates(self, filters):
+        """Sorted row ids satisfying every filter, or None when there is no filter"""
+        if not filters:
+            return None
+        plans = sorted((self._plan(column, condition) for column, condition in filters.items()),
+                       key=lambda plan: plan[0])
+        _, column, compiled = plans[0]
+        rows = self._rows(column, compiled)
+        for _, column, compiled in plans[1:]:
+            if not len(rows):
+                break
+            rows = rows[self._keep(column, compiled, rows)]
+        return rows
+
+    def mask(self, filters):
+        """Boolean (N,) candidate mask"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        rows = self.candidates(filters)
+        mask[slice(None) if rows is None else rows] = True
+        return mask
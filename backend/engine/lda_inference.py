@@ -0,0 +1,141 @@
+"""
+Compact inference-only LDA artifact and a NumPy E-step
+
+The artifact keeps only what `LatentDirichletAllocation.transform` needs:
+the vocabulary, exp(E[log beta]), the doc-topic prior and the convergence
+settings. The E-step below reproduces sklearn's `_update_doc_distribution`
+(constant initialisation, no sufficient statistics) without the estimator's
+validation and dispatch overhead.
+"""
+
+import numpy as np
+from scipy.special import psi
+
+INFERENCE_ARTIFACT = 'lda_inference.npz'
+ARTIFACT_VERSION = 1
+
+
+def export_inference_artifact(lda_model, count_vectorizer, path):
+    """Write the inference-only artifact for a fitted LDA model and its vectorizer"""
+    vocabulary = np.empty(len(count_vectorizer.vocabulary_), dtype=object)
+    for term, idx in count_vectorizer.vocabulary_.items():
+        vocabulary[idx] = term
+
+    np.savez_compressed(
+        path,
+        version=np.int32(ARTIFACT_VERSION),
+        vocabulary=vocabulary.astype(str),
+        exp_topic_word=lda_model.exp_dirichlet_component_,
+        doc_topic_prior=np.float64(lda_model.doc_topic_prior_),
+        max_doc_update_iter=np.int32(lda_model.max_doc_update_iter),
+        mean_change_tol=np.float64(lda_model.mean_change_tol),
+        token_pattern=np.str_(count_vectorizer.token_pattern),
+        lowercase=np.bool_(count_vectorizer.lowercase),
+    )
+    return path
+
+
+class LDAInference:
+    """Topic inference for new documents from the compact artifact"""
+
+    def __init__(self, vocabulary, exp_topic_word, doc_topic_prior,
+                 max_doc_update_iter=100, mean_change_tol=1e-3,
+                 token_pattern=r'(?u)\b\w\w+\b', lowercase=True):
+        self.vocabulary = list(vocabulary)
+        self.exp_topic_word = np.ascontiguousarray(exp_topic_word, dtype=np.float64)
+        self.doc_topic_prior = float(doc_topic_prior)
+        self.max_doc_update_iter = int(max_doc_update_iter)
+        self.mean_change_tol = float(mean_change_tol)
+        self.token_pattern = str(token_pattern)
+        self.lowercase = bool(lowercase)
+        self.n_components, self.n_features = self.exp_topic_word.shape
+        self._eps = np.finfo(np.float64).eps
+
+    @classmethod
+    def load(cls, path):
+        """Load the artifact written by `export_inference_artifact`"""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['version'])
+            if version != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported LDA inference artifact version: {version}")
+            return cls(
+                vocabulary=data['vocabulary'].tolist(),
+                exp_topic_word=data['exp_topic_word'],
+                doc_topic_prior=data['doc_topic_prior'],
+                max_doc_update_iter=data['max_doc_update_iter'],
+                mean_change_tol=data['mean_change_tol'],
+                token_pattern=str(data['token_pattern']),
+                lowercase=bool(data['lowercase']),
+            )
+
+    def transform_ids(self, ids, counts):
+        """Topic distribution (n_components,) of one document given its term ids and counts"""
+        ids = np.asarray(ids, dtype=np.intp)
+        counts = np.asarray(counts, dtype=np.float64)
+        prior = self.doc_topic_prior
+        n_topics = self.n_components
+
+        if ids.size == 0:
+            return np.full(n_topics, 1.0 / n_topics)
+
+        exp_topic_word_d = self.exp_topic_word[:, ids]
+        doc_topic_d = np.ones(n_topics)
+        exp_doc_topic_d = np.exp(psi(doc_topic_d) - psi(doc_topic_d.sum()))
+
+        for _ in range(self.max_doc_update_iter):
+            last_d = doc_topic_d
+            norm_phi = exp_doc_topic_d @ exp_topic_word_d + self._eps
+            doc_topic_d = exp_doc_topic_d * ((counts / norm_phi) @ exp_topic_word_d.T) + prior
+            exp_doc_topic_d = np.exp(psi(doc_topic_d) - psi(doc_topic_d.sum()))
+            if np.abs(doc_topic_d - last_d).mean() < self.mean_change_tol:
+                break
+
+        return doc_topic_d / doc_topic_d.sum()
+
+    def transform(self, X):
+        """Normalized topic distributions (n_samples, n_components) for a document-term matrix
+
+        Documents are iterated together; each one stops updating as soon as it
+        converges, so results match the per-document loop in sklearn.
+        """
+        if hasattr(X, 'tocsr'):
+            X = X.tocsr()
+            n_samples = X.shape[0]
+            ids = np.unique(X.indices)
+            counts = np.zeros((n_samples, ids.size))
+            rows = np.repeat(np.arange(n_samples), np.diff(X.indptr))
+            counts[rows, np.searchsorted(ids, X.indices)] = X.data
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            n_samples = X.shape[0]
+            ids = np.flatnonzero(X.any(axis=0))
+            counts = X[:, ids]
+
+        prior = self.doc_topic_prior
+        n_topics = self.n_components
+        exp_topic_word_d = self.exp_topic_word[:, ids]
+
+        doc_topic = np.ones((n_samples, n_topics))
+        exp_doc_topic = np.exp(psi(doc_topic) - psi(doc_topic.sum(axis=1, keepdims=True)))
+        active = np.flatnonzero(counts.any(axis=1))
+
+        for _ in range(self.max_doc_update_iter):
+            if active.size == 0:
+                break
+            cnts = counts[active]
+            exp_d = exp_doc_topic[active]
+            last = doc_topic[active]
+
+            norm_phi = exp_d @ exp_topic_word_d + self._eps
+            updated = exp_d * ((cnts / norm_phi) @ exp_topic_word_d.T) + prior
+            doc_topic[active] = updated
+            exp_doc_topic[active] = np.exp(psi(updated) - psi(updated.sum(axis=1, keepdims=True)))
+
+            converged = np.abs(updated - last).mean(axis=1) < self.mean_change_tol
+            active = active[~converged]
+
+        # Documents without known terms keep the prior only, like sklearn
+        empty = ~counts.any(axis=1)
+        doc_topic[empty] = prior
+
+        return doc_topic / doc_topic.sum(axis=1, keepdims=True)
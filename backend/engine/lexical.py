@@ -0,0 +1,173 @@
+"""
+Lexical (BM25 / TF-IDF) job matching over an inverted index
+
+An alternative to the dense LDA scan for keyword-heavy CVs. Job texts are
+counted with the model's own vocabulary (`FastCountVectorizer`), and each
+term keeps a posting list of (job row, impact) sorted by row, where the
+impact is the term's precomputed BM25 or TF-IDF weight in that job. A query
+score is the sum of query-weight x impact over the CV's terms.
+
+`LexicalIndex.search` is a term-at-a-time max-score top-k: terms are
+processed by decreasing upper bound (query weight x max impact). Once the
+bounds of the remaining terms add up to less than the current k-th best
+score, no job that has not been seen yet can enter the top-k, so the
+remaining terms only update the jobs already accumulated that can still
+make it. Results equal the exhaustive scoring (`scores`).
+"""
+
+import numpy as np
+
+from engine.topk import top_k_window
+
+SCHEMES = ('bm25', 'tfidf')
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_K3 = 7.0
+
+
+class LexicalIndex:
+    def __init__(self, indptr, rows, impacts, idf, n_docs, scheme='bm25'):
+        """
+        Args:
+            indptr: (V + 1,) posting offsets per term
+            rows: job rows of every posting, sorted within a term
+            impacts: float32 weight of the term in that job
+            idf: (V,) inverse document frequencies
+            n_docs: number of jobs
+            scheme: 'bm25' or 'tfidf'
+        """
+        self.indptr = indptr
+        self.rows = rows
+        self.impacts = impacts
+        self.idf = idf
+        self.n_docs = n_docs
+        self.scheme = scheme
+        lengths = np.diff(indptr)
+        self.max_impact = np.zeros(len(lengths), dtype=np.float32)
+        nonempty = lengths > 0
+        if nonempty.any():
+            self.max_impact[nonempty] = np.maximum.reduceat(impacts, indptr[:-1][nonempty])
+
+    @classmethod
+    def build(cls, doc_terms, scheme='bm25', k1=BM25_K1, b=BM25_B):
+        """
+        Args:
+            doc_terms: (n_jobs, V) sparse term counts (CSR)
+            scheme: 'bm25' (Okapi BM25) or 'tfidf' (smooth idf, l2-normalised jobs)
+        """
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown lexical scheme {scheme!r}, expected one of {SCHEMES}")
+        csc = doc_terms.tocsc().astype(np.float64)
+        csc.sort_indices()
+        n_docs = doc_terms.shape[0]
+        df = np.diff(csc.indptr)
+        tf = csc.data
+        if scheme == 'bm25':
+            idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+            lengths = np.asarray(doc_terms.sum(axis=1)).ravel()
+            norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1e-9))
+            impacts = np.repeat(idf, df) * tf * (k1 + 1) / (tf + norm[csc.indices])
+        else:
+            idf = np.log((1 + n_docs) / (1 + df)) + 1
+            weights = np.repeat(idf, df) * tf
+            norms = np.sqrt(np.bincount(csc.indices, weights=weights ** 2, minlength=n_docs))
+            norms[norms == 0] = 1
+            impacts = weights / norms[csc.indices]
+        return cls(csc.indptr.astype(np.int64), csc.indices.astype(np.int32), impacts.astype(np.float32),
+                   idf.astype(np.float32), n_docs, scheme)
+
+    def query_weights(self, term_ids, counts):
+        """(term ids, weights) of the query terms that occur in at least one job"""
+        term_ids = np.asarray(term_ids, dtype=np.intp)
+        counts = np.asarray(counts, dtype=np.float64)
+        keep = (self.indptr[term_ids + 1] > self.indptr[term_ids])
+        term_ids, counts = term_ids[keep], counts[keep]
+        if self.scheme == 'bm25':
+            weights = (BM25_K3 + 1) * counts / (BM25_K3 + counts)
+        else:
+            weights = counts * self.idf[term_ids]
+            weights /= max(np.linalg.norm(weights), 1e-12)
+        return term_ids, weights.astype(np.float32)
+
+    def _posting(self, term):
+        start, stop = self.indptr[term], self.indptr[term + 1]
+        return self.rows[start:stop], self.impacts[start:stop]
+
+    def scores(self, term_ids, counts):
+        """Exhaustive (n_jobs,) scores"""
+        out = np.zeros(self.n_docs, dtype=np.float32)
+        for term, weight in zip(*self.query_weights(term_ids, counts)):
+            rows, impacts = self._posting(term)
+            out[rows] += weight * impacts
+        return out
+
+    def search(self, term_ids, counts, k=10, rows=None):
+        """
+        Max-score top-k
+
+        Args:
+            term_ids, counts: query terms (as from `FastCountVectorizer.transform_one`)
+            k: number of jobs
+            rows: optional sorted candidate job rows (filters); others are skipped
+
+        Returns:
+            (job rows, scores) best first, ties by lowest row
+        """
+        term_ids, weights = self.query_weights(term_ids, counts)
+        if k <= 0 or not len(term_ids):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        bounds = weights * self.max_impact[term_ids]
+        order = np.argsort(-bounds, kind='stable')
+        remaining = np.concatenate([np.cumsum(bounds[order][::-1])[::-1][1:], [0]])
+        allowed = None
+        if rows is not None:
+            allowed = np.zeros(self.n_docs, dtype=bool)
+            allowed[rows] = True
+
+        acc = np.zeros(self.n_docs, dtype=np.float32)
+        threshold = 0.0
+        position = 0
+        # Phase 1: full postings while the remaining terms could still bring in an unseen job.
+        # Partial scores never exceed final ones, so the k-th best partial score of the jobs
+        # in the current posting is a valid lower bound of the final k-th best score.
+        while position < len(order):
+            posting, impacts = self._posting(term_ids[order[position]])
+            if allowed is not None:
+                inside = allowed[posting]
+                posting, impacts = posting[inside], impacts[inside]
+            acc[posting] += weights[order[position]] * impacts
+            if len(posting) >= k:
+                partial = acc[posting]
+                threshold = max(threshold, partial[np.argpartition(partial, len(partial) - k)[len(partial) - k]])
+            position += 1
+            if position < len(order) and remaining[position - 1] < threshold:
+                break
+
+        if position == len(order):
+            # Nothing pruned: plain top-k over the accumulator
+            best = top_k_window(acc, 0, k)
+            best = best[acc[best] > 0]
+            return best, acc[best]
+
+        # Phase 2: remaining terms only update accumulated jobs that can still reach the threshold
+        candidates = np.flatnonzero(acc)
+        candidates = candidates[acc[candidates] + remaining[position - 1] >= threshold]
+        keep = None
+        for index in order[position:]:
+            posting, impacts = self._posting(term_ids[index])
+            if len(candidates) * max(1, int(np.log2(len(posting) + 1))) < len(posting):
+                # Few candidates: binary-search them in the posting
+                found = np.searchsorted(posting, candidates)
+                found[found == len(posting)] = 0
+                hit = posting[found] == candidates
+                acc[candidates[hit]] += weights[index] * impacts[found[hit]]
+            else:
+                # Many candidates: one pass over the posting, masked to the candidates
+                if keep is None:
+                    keep = np.zeros(self.n_docs, dtype=bool)
+                    keep[candidates] = True
+                hit = keep[posting]
+                acc[posting[hit]] += weights[index] * impacts[hit]
+
+        best = top_k_window(acc[candidates], 0, k)
+        return candidates[best], acc[candidates[best]]
@@ -0,0 +1,272 @@
+"""
+Flask-free CV -> job matching
+
+`Matcher(model_dir)` loads the trained artifacts from an explicit directory
+(LDA model, vocabulary, job topic matrix and catalog, plus the optional
+NumPy inference artifact) and ranks jobs for a CV text with the LDA topic
+similarity or the BM25 / TF-IDF inverted index, after optional filters.
+
+The API services (`app.services`) are thin subclasses adding the Flask
+configuration, metrics and upload persistence; batch jobs use this module
+directly, e.g. through `python -m engine` (see engine/__main__.py).
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from engine.explain import MatchExplainer
+from engine.filters import JobFilterIndex
+from engine.lda_inference import INFERENCE_ARTIFACT, LDAInference
+from engine.lexical import SCHEMES, LexicalIndex
+from engine.quantize import QuantizedMatrix, cosine_scores
+from engine.shards import ShardedMatcher
+from engine.topic_store import model_fingerprint
+from engine.topk import top_k_window
+from engine.vectorizer import FastCountVectorizer
+
+MATCHING_ENGINES = ('lda',) + SCHEMES
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'final_model')
+
+logger = logging.getLogger(__name__)
+
+
+def _no_timer(stage):
+    return nullcontext()
+
+
+def quantize_job_topics(job_topics, dtype='float64'):
+    """Job topic matrix stored as `dtype` (float64 = unchanged, see engine.quantize)"""
+    if dtype == 'float64':
+        return job_topics
+    quantized = QuantizedMatrix.from_matrix(job_topics, dtype)
+    logger.info("Job topics quantized to %s: %.1f MB -> %.1f MB", dtype, job_topics.nbytes / 1e6, quantized.nbytes / 1e6)
+    return quantized
+
+
+class Matcher:
+    def __init__(self, model_dir=DEFAULT_MODEL_DIR, topic_dtype='float64', default_engine='lda', timer=None,
+                 shards=0):
+        """
+        Args:
+            model_dir: directory of the training artifacts (final_model/)
+            topic_dtype: storage of the job topic matrix (float64, float32, float16 or uint8)
+            default_engine: 'lda', 'bm25' or 'tfidf' when `match_cv` gets none
+            timer: `timer(stage)` context manager timing each matching stage (metrics)
+            shards: rank LDA matches over this many worker processes holding float32 row
+                shards of the job matrix in shared memory (engine.shards); 0 scans in-process
+        """
+        if default_engine not in MATCHING_ENGINES:
+            raise ValueError(f"MATCHING_ENGINE must be one of {MATCHING_ENGINES}")
+        self.model_dir = model_dir
+        self.topic_dtype = topic_dtype
+        self.default_engine = default_engine
+        self.timer = timer or _no_timer
+        self.shards = shards
+        self.sharded = None
+        self.df_jobs = None
+        self.lda_model = None
+        self.lda_inference = None
+        self.count_vectorizer = None
+        self.vectorizer = None
+        self.explainer = None
+        self.job_topic_distributions = None
+        self.job_index = {}
+        self.job_filters = None
+        self.model_version = None
+        self.load_seconds = None
+        self.lexical_indexes = {}
+        self._lexical_lock = threading.Lock()
+        self.load()
+
+    def artifact(self, name):
+        return os.path.join(self.model_dir, name)
+
+    def load(self):
+        """Load the LDA model, the vocabulary and the job catalog"""
+        started = time.perf_counter()
+        self.lda_model = joblib.load(self.artifact('lda_model.joblib'))
+        self.count_vectorizer = joblib.load(self.artifact('count_vectorizer.joblib'))
+        # Compact NumPy E-step (optional artifact)
+        if os.path.exists(self.artifact(INFERENCE_ARTIFACT)):
+            self.lda_inference = LDAInference.load(self.artifact(INFERENCE_ARTIFACT))
+        # Fingerprint stored with the topic vectors of uploads
+        self.model_version = model_fingerprint(self.model_dir)
+        # Same counts as the CountVectorizer, compiled from its vocabulary
+        self.vectorizer = FastCountVectorizer.from_count_vectorizer(self.count_vectorizer)
+        self.explainer = MatchExplainer(self.lda_model.components_,
+                                        self.count_vectorizer.get_feature_names_out(), self.vectorizer)
+        job_topics = joblib.load(self.artifact('job_topic_distributions.joblib'))
+        self.job_topic_distributions = quantize_job_topics(job_topics, self.topic_dtype)
+        if self.shards:
+            self.close()
+            self.sharded = ShardedMatcher(job_topics, n_shards=self.shards)
+        self.df_jobs = pd.read_pickle(self.artifact('jobs_dataframe.pkl'))
+        if 'job_id' in self.df_jobs.columns:
+            self.job_index = {str(job_id): row for row, job_id in enumerate(self.df_jobs['job_id'])}
+        # Filterable columns (country, salary, remote ratio, level...)
+        self.job_filters = JobFilterIndex.from_dataframe(self.df_jobs)
+        self.load_seconds = time.perf_counter() - started
+        logger.info("LDA model loaded from %s: %d topics, %d words, %d jobs (%.2fs)", self.model_dir,
+                    self.lda_model.n_components, len(self.count_vectorizer.vocabulary_), len(self.df_jobs),
+                    self.load_seconds)
+
+    def vectorize(self, cv_text):
+        """Terms (sorted ids, counts) of a CV in the model vocabulary"""
+        with self.timer('vectorization'):
+            return self.vectorizer.transform_one(cv_text)
+
+    def infer_topics(self, cv_text, terms=None):
+        """(1, n_topics) topic distribution of a CV (NumPy E-step when the artifact exists)"""
+        ids, counts = terms if terms is not None else self.vectorize(cv_text)
+        with self.timer('lda_inference'):
+            if self.lda_inference is not None:
+                return self.lda_inference.transform_ids(ids, counts)[np.newaxis, :]
+            cv_count = csr_matrix((counts, ids, [0, len(ids)]), shape=(1, self.vectorizer.n_features))
+            return self.lda_model.transform(cv_count)
+
+    def lexical_index(self, scheme):
+        """BM25 / TF-IDF inverted index of the job texts (built on first use)"""
+        index = self.lexical_indexes.get(scheme)
+        if index is None:
+            with self._lexical_lock:
+                index = self.lexical_indexes.get(scheme)
+                if index is None:
+                    started = time.perf_counter()
+                    doc_terms = self.vectorizer.transform(self.df_jobs['Text'].fillna('').astype(str))
+                    index = self.lexical_indexes[scheme] = LexicalIndex.build(doc_terms, scheme)
+                    logger.info("%s index built in %.2fs", scheme, time.perf_counter() - started)
+        return index
+
+    def rank_jobs(self, cv_topics, start=0, stop=5, filters=None, engine='lda', cv_terms=None):
+        """
+        Jobs ranked `start`..`stop - 1` for a CV
+
+        Args:
+            cv_topics: topic distribution (engine 'lda')
+            engine: 'lda' (topic cosine similarity), 'bm25' or 'tfidf' (inverted index)
+            cv_terms: (ids, counts) of the CV terms, required by 'bm25' / 'tfidf'
+
+        Returns:
+            (job rows, scores, number of candidate jobs)
+        """
+        # Jobs passing the filters (None = all)
+        with self.timer('filter'):
+            candidates = self.job_filters.candidates(filters)
+
+        if engine != 'lda':
+            # Max-score top-k over the inverted index; only jobs sharing terms are scored
+            index = self.lexical_index(engine)
+            with self.timer('lexical_search'):
+                rows, scores = index.search(cv_terms[0], cv_terms[1], k=stop, rows=candidates)
+            return rows[start:], scores[start:], len(self.df_jobs) if candidates is None else len(candidates)
+
+        if self.sharded is not None:
+            with self.timer('similarity'):
+                ranked = self.sharded.search(cv_topics, k=stop, rows=candidates)[start:]
+            rows = np.array([row for row, _ in ranked], dtype=np.int64)
+            scores = np.array([score for _, score in ranked], dtype=np.float32)
+            return rows, scores, len(self.df_jobs) if candidates is None else len(candidates)
+
+        with self.timer('similarity'):
+            similarities = cosine_scores(cv_topics, self.job_topic_distributions, rows=candidates)
+
+        # Window of the ranking (argpartition, only jobs up to `stop` are sorted)
+        with self.timer('top_k'):
+            best = top_k_window(similarities, start, stop)
+        rows = best if candidates is None else candidates[best]
+        return rows, similarities[best], len(similarities)
+
+    def match_records(self, rows, scores, first_rank, cv_topics, cv_terms=None, explain=False):
+        """Match results for rows of df_jobs"""
+        matches = []
+        for rank, (idx, score) in enumerate(zip(rows, scores), first_rank):
+            job = self.df_jobs.iloc[idx]
+            match = {
+                'rank': rank,
+                'job_title': str(job['job_title']) if 'job_title' in job.index else 'N/A',
+                'company': str(job['company_name']) if 'company_name' in job.index else 'N/A',
+                'location': str(job['company_location']) if 'company_location' in job.index else 'N/A',
+                'salary': float(job['salary_usd']) if 'salary_usd' in job.index and pd.notna(job['salary_usd']) else None,
+                'experience_level': str(job['experience_level']) if 'experience_level' in job.index else 'N/A',
+                'required_skills': str(job['required_skills'])[:200] if 'required_skills' in job.index else 'N/A',
+                'similarity_score': float(score)
+            }
+            if explain:
+                with self.timer('explanation'):
+                    match['explanation'] = self.explainer.explain(
+                        cv_topics, cv_terms[0], self.job_topic_distributions[idx],
+                        job['Text'] if 'Text' in job.index else '')
+            matches.append(match)
+        return matches
+
+    def match_cv(self, cv_text, top_n=5, explain=False, filters=None, engine=None):
+        """
+        Best jobs for a CV text
+
+        Args:
+            cv_text: extracted CV text
+            top_n: number of jobs
+            explain: add the contributing topics and shared terms to each match
+            filters: job constraints (see engine.filters), applied before the top N
+            engine: 'lda', 'bm25' or 'tfidf' (default: `default_engine`)
+
+        Returns:
+            {'success': True, 'matches': [...], 'total_jobs_searched', 'engine', 'cv_topics',
+            'cv_terms', ...}, or {'success': False, 'error': ...}
+        """
+        try:
+            if not cv_text or cv_text.strip() == '':
+                return {
+                    'success': False,
+                    'error': 'CV text is empty',
+                    'matches': []
+                }
+
+            cv_terms = self.vectorize(cv_text)
+            cv_topics = self.infer_topics(cv_text, terms=cv_terms)[0]
+            engine = engine or self.default_engine
+            rows, scores, n_candidates = self.rank_jobs(cv_topics, 0, top_n, filters, engine=engine, cv_terms=cv_terms)
+            matches = self.match_records(rows, scores, 1, cv_topics, cv_terms, explain)
+
+            return {
+                'success': True,
+                'matches': matches,
+                'cv_length': len(cv_text),
+                'total_jobs_searched': n_candidates,
+                'model_type': 'LDA',
+                'engine': engine,
+                'n_topics': self.lda_model.n_components,
+                'cv_topics': cv_topics,
+                'cv_terms': cv_terms
+            }
+
+        except Exception as e:
+            logger.exception("Matching failed")
+            return {
+                'success': False,
+                'error': str(e),
+                'matches': []
+            }
+
+    def close(self):
+        """Stop the shard workers and free their shared memory (shards > 0)"""
+        if self.sharded is not None:
+            self.sharded.close()
+            self.sharded = None
+
+    def get_job_stats(self):
+        """Summary of the job catalog"""
+        return {
+            'total_jobs': len(self.df_jobs),
+            'avg_salary': float(self.df_jobs['salary_usd'].mean()) if 'salary_usd' in self.df_jobs.columns else 0,
+            'locations': self.df_jobs['company_location'].nunique() if 'company_location' in self.df_jobs.columns else 0,
+            'experience_levels': self.df_jobs['experience_level'].unique().tolist() if 'experience_level' in self.df_jobs.columns else [],
+        }
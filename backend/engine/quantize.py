@@ -0,0 +1,98 @@
+"""
+Quantized topic-matrix storage
+
+`QuantizedMatrix` keeps L2-normalised topic vectors as float16 (2 bytes per
+value) or per-row-scaled uint8 (1 byte per value plus a float32 scale and
+offset per row, x ~ code * scale + offset) instead of float64, and scores
+cosine similarity directly on the stored codes: rows are widened to float32
+one block at a time, so the full matrix is never expanded in memory.
+"""
+
+import numpy as np
+
+from engine.topk import normalize_rows
+
+DTYPES = ('float64', 'float32', 'float16', 'uint8')
+DEFAULT_BLOCK_ROWS = 65536
+
+
+class QuantizedMatrix:
+    def __init__(self, data, scales=None, offsets=None, block_rows=DEFAULT_BLOCK_ROWS):
+        self.data = data
+        self.scales = scales
+        self.offsets = offsets
+        self.block_rows = block_rows
+
+    @classmethod
+    def from_matrix(cls, matrix, dtype='float16', block_rows=DEFAULT_BLOCK_ROWS):
+        """Normalise the rows of `matrix` and store them as `dtype`"""
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype {dtype!r}, expected one of {DTYPES}")
+        normalized = normalize_rows(matrix, dtype=np.float64)
+        if dtype != 'uint8':
+            return cls(normalized.astype(dtype), block_rows=block_rows)
+
+        low = normalized.min(axis=1)
+        scales = (normalized.max(axis=1) - low) / 255
+        scales[scales == 0] = 1
+        codes = np.rint((normalized - low[:, None]) / scales[:, None]).astype(np.uint8)
+        return cls(codes, scales.astype(np.float32), low.astype(np.float32), block_rows=block_rows)
+
+    @property
+    def dtype(self):
+        return self.data.dtype.name
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + sum(a.nbytes for a in (self.scales, self.offsets) if a is not None)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def _decode(self, start, stop):
+        block = self.data[start:stop].astype(np.float32)
+        if self.scales is not None:
+            block = block * self.scales[start:stop, None] + self.offsets[start:stop, None]
+        return block
+
+    def __getitem__(self, row):
+        """Dequantized (normalised) float32 row"""
+        row = int(row) % len(self)
+        return self._decode(row, row + 1)[0]
+
+    def scores(self, query, rows=None):
+        """Cosine similarity (n_rows,) float32 of one topic vector against every row (or `rows` only)"""
+        query = normalize_rows(np.asarray(query).reshape(1, -1))[0]
+        if rows is not None:
+            block = self.data[rows].astype(np.float32) @ query
+            if self.scales is None:
+                return block
+            return block * self.scales[rows] + self.offsets[rows] * query.sum()
+        out = np.empty(len(self), dtype=np.float32)
+        query_sum = query.sum()
+        for start in range(0, len(self), self.block_rows):
+            stop = min(len(self), start + self.block_rows)
+            block = self.data[start:stop]
+            if self.scales is None:
+                out[start:stop] = block.astype(np.float32, copy=False) @ query
+            else:
+                # (code * scale + offset) . q = scale * (code . q) + offset * sum(q)
+                out[start:stop] = (block.astype(np.float32) @ query) * self.scales[start:stop] \
+                    + self.offsets[start:stop] * query_sum
+        return out
+
+
+def cosine_scores(query, matrix, rows=None):
+    """Cosine similarity of one topic vector against a float or quantized matrix (optionally a row subset)"""
+    if isinstance(matrix, QuantizedMatrix):
+        return matrix.scores(query, rows)
+    if rows is not None:
+        matrix = matrix[rows]
+    query = np.asarray(query, dtype=np.float64).ravel()
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    norms[norms == 0] = 1
+    return (matrix @ query) / norms
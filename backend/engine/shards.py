@@ -0,0 +1,130 @@
+"""
+Sharded top-k matching across worker processes
+
+`ShardedMatcher` copies the normalised float32 job matrix once into a
+`multiprocessing.shared_memory` block. Worker processes attach to it
+without copying and each query fans out one task per shard (a contiguous
+row range). Every shard returns its local top-k and `heapq.merge` combines
+them into the global top-k.
+
+Ranking is canonical on both paths: score descending, then row index
+ascending, so `ShardedMatcher.search` returns exactly what
+`single_process_top_k` returns for the same matrix. A sorted array of
+candidate rows (the job filters) restricts every shard to its part of it.
+
+`Matcher(shards=N)` (MATCH_SHARDS in the API) ranks LDA matches this way;
+it is off by default and only pays off for very large catalogs on hosts
+with spare cores (see benchmarks/shards.py).
+"""
+
+import atexit
+import heapq
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from engine.topk import normalize_rows, top_k_window
+
+_shard = {}
+
+# Modules the forkserver imports once for every worker (see worker_context)
+_PRELOAD = ['engine.shards']
+
+
+def worker_context(*preload):
+    """
+    Multiprocessing context for worker pools started from a threaded process
+
+    Workers come from a forkserver (spawn where it is unavailable), never a
+    fork of the caller. The forkserver imports only the worker modules: its
+    default preload is '__main__', which under `python server.py` would run
+    create_app() in the forkserver. Workers still re-import the main script
+    as '__mp_main__', so scripts that build an app skip it under that name.
+
+    Args:
+        preload: extra modules holding worker functions
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    _PRELOAD.extend(module for module in preload if module not in _PRELOAD)
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(_PRELOAD)
+    return context
+
+
+def canonical_top_k(scores, k, offset=0):
+    """[(-score, row)] of the k best rows, ties broken by lowest row index"""
+    return [(-float(scores[row]), int(row) + offset) for row in top_k_window(scores, 0, k)]
+
+
+def single_process_top_k(matrix, query, k):
+    """Reference path: [(row, score)] best first over a normalised float32 matrix"""
+    query = normalize_rows(np.asarray(query).reshape(1, -1))[0]
+    return [(row, -neg) for neg, row in canonical_top_k(matrix @ query, k)]
+
+
+def _attach(name, shape):
+    memory = shared_memory.SharedMemory(name=name)
+    _shard.update(memory=memory, matrix=np.ndarray(shape, dtype=np.float32, buffer=memory.buf))
+
+
+def _search_shard(start, stop, query, k, rows=None):
+    if rows is None:
+        return canonical_top_k(_shard['matrix'][start:stop] @ query, k, offset=start)
+    # Sorted candidate rows: local ties keep the row order
+    return [(neg, int(rows[i])) for neg, i in canonical_top_k(_shard['matrix'][rows] @ query, k)]
+
+
+class ShardedMatcher:
+    def __init__(self, matrix, n_shards=2, processes=None):
+        """
+        Args:
+            matrix: (N, K) job topic matrix (normalised here)
+            n_shards: number of contiguous row ranges
+            processes: worker processes (defaults to n_shards)
+        """
+        normalized = normalize_rows(matrix)
+        self.shape = normalized.shape
+        self._memory = shared_memory.SharedMemory(create=True, size=max(1, normalized.nbytes))
+        self.matrix = np.ndarray(self.shape, dtype=np.float32, buffer=self._memory.buf)
+        self.matrix[:] = normalized
+        bounds = np.linspace(0, self.shape[0], n_shards + 1).astype(int)
+        self.shards = [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+        self._pool = ProcessPoolExecutor(max_workers=processes or len(self.shards),
+                                         mp_context=worker_context(),
+                                         initializer=_attach, initargs=(self._memory.name, self.shape))
+        atexit.register(self.close)
+
+    def search(self, query, k=10, rows=None):
+        """
+        [(row, score)] of the global top-k, best first
+
+        Args:
+            rows: sorted candidate row indices (None = every row)
+        """
+        query = normalize_rows(np.asarray(query).reshape(1, -1))[0]
+        if rows is None:
+            tasks = [(start, stop, None) for start, stop in self.shards]
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            cuts = np.searchsorted(rows, [start for start, _ in self.shards] + [self.shape[0]])
+            tasks = [(start, stop, rows[a:b]) for (start, stop), a, b in zip(self.shards, cuts[:-1], cuts[1:]) if b > a]
+        futures = [self._pool.submit(_search_shard, start, stop, query, k, part) for start, stop, part in tasks]
+        merged = heapq.merge(*(future.result() for future in futures))
+        return [(row, -neg) for neg, row in list(merged)[:k]]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self.matrix = None
+            self._memory.close()
+            self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,83 @@
+"""
+Per-topic browse index
+
+For each LDA topic the artifact stores every job row sorted by its weight
+for that topic (best first) and the topic's highest-weight vocabulary terms
+from `components_`. Paging through a topic is then a slice of a
+precomputed array instead of a sort of the (N, K) topic matrix.
+"""
+
+import numpy as np
+
+TOPIC_INDEX_ARTIFACT = 'topic_index.npz'
+TOPIC_INDEX_VERSION = 1
+DEFAULT_TOP_WORDS = 15
+
+
+def build_topic_index(job_topics, components, vocabulary, n_words=DEFAULT_TOP_WORDS):
+    """
+    Arrays of the browse index
+
+    Args:
+        job_topics: (N, K) job topic distributions
+        components: (K, V) LDA `components_`
+        vocabulary: (V,) terms indexed like the vectorizer columns
+        n_words: top words kept per topic
+
+    Returns:
+        dict of arrays, see `save_topic_index`
+    """
+    job_topics = np.asarray(job_topics, dtype=np.float32)
+    order = np.argsort(-job_topics.T, axis=1, kind='stable').astype(np.int32)
+    weights = np.take_along_axis(job_topics.T, order, axis=1)
+
+    word_weights = components / components.sum(axis=1, keepdims=True)
+    top_ids = np.argsort(-word_weights, axis=1, kind='stable')[:, :n_words]
+    return {
+        'order': order,
+        'weights': weights,
+        'dominant_counts': np.bincount(job_topics.argmax(axis=1), minlength=job_topics.shape[1]).astype(np.int32),
+        'top_words': np.asarray(vocabulary, dtype=str)[top_ids],
+        'top_word_weights': np.take_along_axis(word_weights, top_ids, axis=1).astype(np.float32),
+    }
+
+
+def save_topic_index(path, index):
+    np.savez(path, version=np.int32(TOPIC_INDEX_VERSION), **index)
+    return path
+
+
+class TopicIndex:
+    """Ranked job lists and top words per topic"""
+
+    def __init__(self, order, weights, dominant_counts, top_words, top_word_weights):
+        self.order = order
+        self.weights = weights
+        self.dominant_counts = dominant_counts
+        self.top_words = top_words
+        self.top_word_weights = top_word_weights
+
+    @property
+    def n_topics(self):
+        return self.order.shape[0]
+
+    @property
+    def n_jobs(self):
+        return self.order.shape[1]
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data['version']) != TOPIC_INDEX_VERSION:
+                raise ValueError(f"Unsupported topic index version: {int(data['version'])}")
+            return cls(data['order'], data['weights'], data['dominant_counts'],
+                       data['top_words'], data['top_word_weights'])
+
+    def words(self, topic, limit=None):
+        """[(term, weight)] for one topic, best first"""
+        return [(str(term), float(weight)) for term, weight
+                in zip(self.top_words[topic][:limit], self.top_word_weights[topic][:limit])]
+
+    def page(self, topic, offset, limit):
+        """(job rows, topic weights) of one page of a topic's ranked list"""
+        return self.order[topic, offset:offset + limit], self.weights[topic, offset:offset + limit]
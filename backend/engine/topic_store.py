@@ -0,0 +1,38 @@
+"""
+Stored CV topic vectors
+
+Uploads keep their topic distribution as a little-endian float32 blob (40
+bytes for 10 topics) together with the fingerprint of the model that
+produced it. Re-matching against a refreshed job catalog is then pure
+vector math; a vector is only re-inferred when the model itself changed.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+BLOB_DTYPE = np.dtype('<f4')
+MODEL_FILES = ('lda_model.joblib', 'count_vectorizer.joblib')
+
+
+def encode_topics(topics):
+    return np.asarray(topics, dtype=BLOB_DTYPE).ravel().tobytes()
+
+
+def decode_topics(blob):
+    return np.frombuffer(blob, dtype=BLOB_DTYPE).astype(np.float64)
+
+
+def model_fingerprint(model_dir, files=MODEL_FILES):
+    """Short content hash of the LDA model and vocabulary (changes only on retraining)"""
+    digest = hashlib.sha1()
+    for name in files:
+        path = os.path.join(model_dir, name)
+        if not os.path.exists(path):
+            continue
+        digest.update(name.encode('utf-8'))
+        with open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
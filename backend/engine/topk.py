@@ -0,0 +1,107 @@
+"""
+Top-k cosine neighbours in topic space
+
+`blocked_top_k` scores query rows against a corpus one block of rows at a
+time (a float32 matrix product bounded by `max_block_bytes`), keeping only
+the k best columns of each block with `argpartition`. It is used at training
+time to precompute the "similar jobs" lists stored in `job_neighbors.npz`:
+`ids` (N, k) int32 row indices and `scores` (N, k) float32 cosine similarities,
+best first.
+"""
+
+import numpy as np
+
+NEIGHBORS_ARTIFACT = 'job_neighbors.npz'
+NEIGHBORS_VERSION = 1
+DEFAULT_K = 20
+
+
+def normalize_rows(matrix, dtype=np.float32):
+    """L2-normalised copy of `matrix` (zero rows stay zero)"""
+    matrix = np.asarray(matrix, dtype=dtype)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def top_k_indices(scores, k):
+    """Indices of the k largest values of a 1-D array, best first"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        candidates = np.argpartition(scores, len(scores) - k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def top_k_window(scores, start, stop):
+    """
+    Indices ranked `start`..`stop - 1` of a 1-D array
+
+    Ranking is score descending, ties by lowest index, so consecutive windows
+    never repeat or skip a row. Only the rows scoring at least the `stop`-th
+    best value (found with `argpartition`) are sorted.
+    """
+    stop = min(stop, len(scores))
+    if start >= stop:
+        return np.empty(0, dtype=np.intp)
+    if stop < len(scores):
+        threshold = scores[np.argpartition(scores, len(scores) - stop)[len(scores) - stop]]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))[start:stop]]
+
+
+def blocked_top_k(queries, corpus, k=DEFAULT_K, exclude_self=False, max_block_bytes=64 << 20):
+    """
+    k most cosine-similar corpus rows for every query row
+
+    Args:
+        queries: (n, d) matrix
+        corpus: (N, d) matrix
+        k: neighbours per query
+        exclude_self: queries are the corpus itself; drop each row's own index
+        max_block_bytes: memory budget of one (block, N) float32 score block
+
+    Returns:
+        (ids, scores): (n, k) int32 indices and float32 similarities, best first
+    """
+    q = normalize_rows(queries)
+    c_t = np.ascontiguousarray(normalize_rows(corpus).T)
+    n, n_corpus = q.shape[0], c_t.shape[1]
+    k = max(0, min(k, n_corpus - 1 if exclude_self else n_corpus))
+    block_rows = max(1, min(n, max_block_bytes // (4 * max(n_corpus, 1))))
+
+    ids = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+    for start in range(0, n, block_rows):
+        stop = min(n, start + block_rows)
+        block = q[start:stop] @ c_t
+        if exclude_self:
+            block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        if k < n_corpus:
+            part = np.argpartition(block, n_corpus - k, axis=1)[:, n_corpus - k:]
+        else:
+            part = np.broadcast_to(np.arange(n_corpus), block.shape)
+        part_scores = np.take_along_axis(block, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind='stable')
+        ids[start:stop] = np.take_along_axis(part, order, axis=1)
+        scores[start:stop] = np.take_along_axis(part_scores, order, axis=1)
+    return ids, scores
+
+
+def save_neighbors(path, ids, scores):
+    np.savez(path, version=np.int32(NEIGHBORS_VERSION),
+             ids=ids.astype(np.int32, copy=False), scores=scores.astype(np.float32, copy=False))
+    return path
+
+
+def load_neighbors(path):
+    """(ids, scores) arrays of a neighbours artifact"""
+    with np.load(path) as data:
+        if int(data['version']) != NEIGHBORS_VERSION:
+            raise ValueError(f"Unsupported neighbours artifact version: {int(data['version'])}")
+        return data['ids'], data['scores']
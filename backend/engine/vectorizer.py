@@ -0,0 +1,96 @@
+"""
+Fast word-count vectorizer compiled from a fitted CountVectorizer vocabulary
+
+Produces exactly the counts of `CountVectorizer.transform` for the word
+analyzer used by the project (lowercase, regex tokens, unigram, stop words)
+without rebuilding the analyzer or allocating a CSR matrix per document.
+"""
+
+import re
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+DEFAULT_TOKEN_PATTERN = r'(?u)\b\w\w+\b'
+# Same tokens as the default pattern: a greedy run of 2+ word characters can only
+# start at a word boundary, so the boundary assertions are redundant (and slow)
+_DEFAULT_TOKEN_REGEX = r'(?u)\w\w+'
+
+
+class FastCountVectorizer:
+    """Term-id counter for a fixed vocabulary"""
+
+    def __init__(self, vocabulary, token_pattern=DEFAULT_TOKEN_PATTERN, lowercase=True,
+                 stop_words=None, dtype=np.int64):
+        if not isinstance(vocabulary, dict):
+            vocabulary = {term: idx for idx, term in enumerate(vocabulary)}
+        if stop_words == 'english':
+            stop_words = ENGLISH_STOP_WORDS
+        stop_words = frozenset(stop_words or ())
+
+        # Stop words are filtered before lookup in sklearn, so they can never match
+        self.vocabulary = {term: idx for term, idx in vocabulary.items() if term not in stop_words}
+        self.n_features = max(vocabulary.values()) + 1 if vocabulary else 0
+        self.lowercase = lowercase
+        self.dtype = dtype
+        if token_pattern == DEFAULT_TOKEN_PATTERN:
+            token_pattern = _DEFAULT_TOKEN_REGEX
+        self._findall = re.compile(token_pattern).findall
+
+    @classmethod
+    def from_count_vectorizer(cls, count_vectorizer):
+        """Compile from a fitted sklearn CountVectorizer"""
+        params = count_vectorizer.get_params()
+        if (params['analyzer'] != 'word' or params['ngram_range'] != (1, 1)
+                or params['tokenizer'] is not None or params['preprocessor'] is not None
+                or params['strip_accents'] is not None or params['binary']):
+            raise ValueError("Only the unigram word analyzer without custom hooks is supported")
+        return cls(
+            count_vectorizer.vocabulary_,
+            token_pattern=params['token_pattern'],
+            lowercase=params['lowercase'],
+            stop_words=params['stop_words'],
+            dtype=params['dtype'],
+        )
+
+    @classmethod
+    def from_inference(cls, lda_inference):
+        """Compile from the vocabulary stored in the compact LDA artifact"""
+        return cls(
+            lda_inference.vocabulary,
+            token_pattern=lda_inference.token_pattern,
+            lowercase=lda_inference.lowercase,
+        )
+
+    def transform_one(self, text):
+        """Sorted term ids and their counts for a single document"""
+        if self.lowercase:
+            text = text.lower()
+        vocabulary = self.vocabulary
+        found = [(vocabulary[token], count)
+                 for token, count in Counter(self._findall(text)).items()
+                 if token in vocabulary]
+        if not found:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=self.dtype)
+        found.sort()
+        ids, counts = zip(*found)
+        return np.array(ids, dtype=np.intp), np.array(counts, dtype=self.dtype)
+
+    def transform_many(self, texts):
+        """(ids, counts) pairs for a batch of documents"""
+        return [self.transform_one(text) for text in texts]
+
+    def transform(self, texts):
+        """Document-term CSR matrix, same layout as `CountVectorizer.transform`"""
+        rows = self.transform_many(texts)
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([ids.size for ids, _ in rows])
+        if rows:
+            indices = np.concatenate([ids for ids, _ in rows])
+            data = np.concatenate([counts for _, counts in rows])
+        else:
+            indices = np.empty(0, dtype=np.intp)
+            data = np.empty(0, dtype=self.dtype)
+        return sp.csr_matrix((data, indices, indptr), shape=(len(rows), self.n_features))
@@ -0,0 +1,49 @@
+"""
+Bring an existing database up to the current models
+
+    python migrate_db.py            # once per deploy, before starting the server workers
+
+Creates missing tables, then adds the nullable columns and the indexes
+added to the models since the tables were created (`create_all` never
+alters an existing table). Indexes whose columns an existing index already
+covers (such as MySQL's foreign key indexes) are not duplicated. The web
+app does not do this at startup: several worker processes running ALTER
+TABLE / CREATE INDEX at once race, and the losers fail on duplicates.
+Safe to run again; it only adds what is missing.
+"""
+
+import argparse
+import sys
+
+from app import create_app, db
+from app.utils.db_engine import add_missing_columns, add_missing_indexes
+
+
+def migrate(app):
+    """
+    Create missing tables, columns and indexes of `app`'s databases
+
+    Returns:
+        (added "table.column" names, added index names)
+    """
+    columns, indexes = [], []
+    with app.app_context():
+        db.create_all()
+        for engine in db.engines.values():
+            columns += add_missing_columns(engine, db.metadata)
+            indexes += add_missing_indexes(engine, db.metadata)
+    return columns, indexes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.parse_args(argv)
+
+    columns, indexes = migrate(create_app())
+    print(f"Columns added: {', '.join(columns) if columns else 'none'}")
+    print(f"Indexes added: {', '.join(indexes) if indexes else 'none'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
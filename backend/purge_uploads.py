@@ -0,0 +1,48 @@
+"""
+Delete CV uploads older than the retention period, with their matches and files
+
+    python purge_uploads.py                   # UPLOAD_RETENTION_DAYS from the config
+    python purge_uploads.py --days 180 --batch-size 500
+    python purge_uploads.py --orphans-only    # only files no upload references
+
+Uploads are deleted in chunks, each in its own short transaction; files in
+the upload folder that no upload references (and older than --orphan-age
+seconds) are removed afterwards.
+"""
+
+import argparse
+import sys
+import time
+
+from app import create_app
+from app.services.retention import purge_expired, remove_orphaned_files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--days', type=int, default=None,
+                        help='retention period in days (default: UPLOAD_RETENTION_DAYS, 0 keeps uploads)')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--orphan-age', type=float, default=3600,
+                        help='keep unreferenced files younger than this many seconds')
+    parser.add_argument('--orphans-only', action='store_true')
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        days = args.days if args.days is not None else app.config['UPLOAD_RETENTION_DAYS']
+        started = time.perf_counter()
+        counts = {'uploads': 0, 'files': 0}
+        if days > 0 and not args.orphans_only:
+            counts = purge_expired(days, batch_size=args.batch_size)
+        orphans = remove_orphaned_files(min_age=args.orphan_age, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - started
+
+    if days > 0 and not args.orphans_only:
+        print(f"Deleted {counts['uploads']} uploads older than {days} days ({counts['files']} files)")
+    print(f"Removed {orphans} orphaned files in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
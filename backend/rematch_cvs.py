@@ -0,0 +1,45 @@
+"""
+Re-match every stored CV upload against the current job catalog
+
+    python rematch_cvs.py                     # after a catalog refresh
+    python rematch_cvs.py --batch-size 1000 --top-n 5
+
+Saved matches are replaced using each upload's stored topic vector; uploads
+without one (or from an older model) are re-inferred once from their
+stored full text and get a vector for next time. Old uploads that only
+kept a 1000-character preview are counted as approximate and keep no vector.
+"""
+
+import argparse
+import sys
+import time
+
+from app import create_app
+from app.services.cv_matching_service import get_cv_matching_service
+from app.services.rematch import rematch_all
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--top-n', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        service = get_cv_matching_service()
+        started = time.perf_counter()
+        counts = rematch_all(service, batch_size=args.batch_size, top_n=args.top_n)
+        elapsed = time.perf_counter() - started
+
+    total = sum(counts.values())
+    print(f"Re-matched {total} CV uploads in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f}/s)")
+    for source, count in sorted(counts.items()):
+        print(f"  topics {source}: {count}")
+    if counts.get('approximate'):
+        print("  (approximate: uploads without full text, matched from their 1000-character preview; no vector saved)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,8 @@
 import os
 from app import create_app
 
-app = create_app()
+# Pool workers re-import this script as __mp_main__ (see engine.shards.worker_context)
+app = create_app() if __name__ != '__mp_main__' else None
 
 if __name__ == '__main__':
     # Respect PORT env var like Node/Express, default to 5000
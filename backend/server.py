@@ -20,36 +20,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create the Flask app
-logger.info("Creating Flask app...")
-app = create_app()
-logger.info("Flask app created successfully!")
+def build_app():
+    """Flask app with the root-level health routes"""
+    # Create the Flask app
+    logger.info("Creating Flask app...")
+    app = create_app()
+    logger.info("Flask app created successfully!")
 
-# Log CORS configuration
-logger.info("CORS Configuration:")
-logger.info(f"  - Origins: http://localhost:3000, http://localhost:3001, https://jobscopeml.vercel.app")
-logger.info(f"  - Methods: GET, POST, PUT, DELETE, OPTIONS, PATCH")
-logger.info(f"  - Headers: Content-Type, Authorization, X-Requested-With")
+    # Log CORS configuration
+    logger.info("CORS Configuration:")
+    logger.info(f"  - Origins: http://localhost:3000, http://localhost:3001, https://jobscopeml.vercel.app")
+    logger.info(f"  - Methods: GET, POST, PUT, DELETE, OPTIONS, PATCH")
+    logger.info(f"  - Headers: Content-Type, Authorization, X-Requested-With")
 
-# Test route
-@app.route("/", methods=["GET"])
-def home():
-    logger.info("Health check requested")
-    return {
-        "status": "API is running",
-        "service": "JobScope-ML",
-        "environment": os.environ.get('FLASK_ENV', 'development')
-    }, 200
+    # Test route
+    @app.route("/", methods=["GET"])
+    def home():
+        logger.info("Health check requested")
+        return {
+            "status": "API is running",
+            "service": "JobScope-ML",
+            "environment": os.environ.get('FLASK_ENV', 'development')
+        }, 200
 
-# Root-level health to aid external checks
-@app.route("/health", methods=["GET"])
-def root_health():
-    return {
-        "status": "ok",
-        "message": "Backend is running",
-        "api_version": "1.0.0",
-        "environment": os.environ.get('FLASK_ENV', 'development')
-    }, 200
+    # Root-level health to aid external checks
+    @app.route("/health", methods=["GET"])
+    def root_health():
+        return {
+            "status": "ok",
+            "message": "Backend is running",
+            "api_version": "1.0.0",
+            "environment": os.environ.get('FLASK_ENV', 'development')
+        }, 200
+
+    return app
+
+
+# Worker processes (shard and password hashing pools) re-import this script as
+# __mp_main__: they only need their worker functions, not a second app
+app = build_app() if __name__ != '__mp_main__' else None
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
@@ -58,6 +67,8 @@ if __name__ == "__main__":
     logger.info("Starting JobScope-ML API")
     logger.info(f"Port: {port}")
     logger.info(f"Environment: {os.environ.get('FLASK_ENV', 'development')}")
+    logger.info(f"Threads: {app.config['SERVER_THREADS']} "
+                f"(uploads: {app.config['UPLOAD_MAX_INFLIGHT']} in flight, {app.config['UPLOAD_MAX_QUEUE']} queued)")
     logger.info("=" * 70)
     
     if _USE_WAITRESS:
@@ -67,7 +78,7 @@ if __name__ == "__main__":
                 app,
                 host="0.0.0.0",
                 port=port,
-                threads=4,
+                threads=app.config['SERVER_THREADS'],
                 _quiet=False
             )
         except Exception as e:
@@ -0,0 +1,77 @@
+"""
+Test upload admission control: bounded concurrency, queue deadline,
+503 + Retry-After when saturated and reserved capacity for light routes
+"""
+import threading
+import time
+
+from app import upload_limiter
+from app.utils.admission import AdmissionLimiter, Overloaded
+from config import Config
+
+
+def test_queue_and_deadline(make_app):
+    """One slot, one queue place: the waiter gets the slot, the next caller is shed"""
+    limiter = AdmissionLimiter('test', make_app(TEST_MAX_INFLIGHT=1, TEST_MAX_QUEUE=1, TEST_QUEUE_TIMEOUT=2))
+    limiter.acquire()
+
+    admitted = []
+    waiter = threading.Thread(target=lambda: (limiter.acquire(), admitted.append(True), limiter.release()))
+    waiter.start()
+    while limiter.waiting == 0:
+        time.sleep(0.01)
+
+    try:
+        limiter.acquire()
+        assert False, 'queue is full'
+    except Overloaded as e:
+        assert e.retry_after == 2
+
+    limiter.release()
+    waiter.join(timeout=5)
+    assert admitted == [True]
+    assert limiter.inflight == 0
+
+    limiter.queue_timeout = 0.05
+    limiter.acquire()
+    started = time.monotonic()
+    try:
+        limiter.acquire()
+        assert False, 'deadline passed'
+    except Overloaded:
+        assert time.monotonic() - started >= 0.05
+    limiter.release()
+    print("✅ Queue, deadline and shedding")
+
+
+def test_reserved_threads(make_app):
+    """Running + queued uploads never take the reserved server threads"""
+    limiter = AdmissionLimiter('upload', make_app(SERVER_THREADS=4, UPLOAD_MAX_INFLIGHT=3, UPLOAD_MAX_QUEUE=3,
+                                                  UPLOAD_RESERVED_THREADS=2))
+    assert (limiter.max_inflight, limiter.max_queue) == (2, 0)
+    print("✅ Reserved capacity kept")
+
+
+def test_default_limits_fit_threads(make_app):
+    """Default upload limits follow SERVER_THREADS and keep the reserved threads"""
+    limiter = AdmissionLimiter('upload', make_app())
+    assert limiter.max_inflight >= 1
+    assert limiter.max_inflight + limiter.max_queue <= Config.SERVER_THREADS - Config.UPLOAD_RESERVED_THREADS
+    print("✅ Default limits fit the server threads")
+
+
+def test_upload_returns_503_when_saturated(make_app, auth_headers):
+    """Saturated uploads fail fast with Retry-After while /api/health still answers"""
+    client = make_app(UPLOAD_MAX_INFLIGHT=1, UPLOAD_MAX_QUEUE=0).test_client()
+    headers = auth_headers(client, 'admission@example.com')
+
+    upload_limiter.acquire()
+    try:
+        response = client.post('/api/cv/upload', headers=headers, data={})
+        assert response.status_code == 503
+        assert response.headers['Retry-After']
+        assert client.get('/api/health').status_code == 200
+    finally:
+        upload_limiter.release()
+    assert client.post('/api/cv/upload', headers=headers, data={}).status_code == 400
+    print("✅ 503 + Retry-After on saturation")
@@ -0,0 +1,108 @@
+"""
+Test the extracted-text cache: content-hash hits across file names and
+uploads, LRU eviction by size and invalidation on extractor upgrades
+"""
+import io
+import PyPDF2
+
+from app import extraction_cache
+from app.utils import file_handler
+from app.utils.extraction_cache import ExtractionStore
+from app.utils.metrics import CACHE_REQUESTS
+from benchmarks import fixtures
+
+
+def counting_parser():
+    """Replace read_document by a wrapper counting parser runs"""
+    calls = []
+    original = file_handler.read_document
+
+    def read_document(file_path):
+        calls.append(file_path)
+        return original(file_path)
+    file_handler.read_document = read_document
+    return calls, original
+
+
+def test_same_bytes_parsed_once(make_app, tmp_path):
+    """A PDF copied under another name is served from the cache with its page count"""
+    make_app()
+    data = fixtures.cv_pdf_bytes(3)
+    paths = [fixtures.write_fixture(str(tmp_path), name, data) for name in ('first.pdf', 'copy.pdf')]
+    calls, original = counting_parser()
+    try:
+        hits = CACHE_REQUESTS.get(cache='extraction', result='hit')
+        first = file_handler.extract_text_from_file(paths[0])
+        second = file_handler.extract_text_from_file(paths[1])
+        assert first and first == second
+        assert calls == [paths[0]]
+        assert CACHE_REQUESTS.get(cache='extraction', result='hit') == hits + 1
+        assert file_handler.extract_text_from_file(paths[1], use_cache=False) == first
+        assert len(calls) == 2
+    finally:
+        file_handler.read_document = original
+    assert extraction_cache.stats()['entries'] == 1
+    assert extraction_cache._store.get(file_handler.file_digest(paths[0]), 'pdf')[1] == \
+        len(PyPDF2.PdfReader(paths[0]).pages)
+    print("✅ Identical bytes parsed once, page count stored")
+
+
+def test_upload_reuses_extraction(make_app, auth_headers):
+    """Uploading the same CV twice parses it once"""
+    client = make_app().test_client()
+    headers = auth_headers(client, 'extraction@example.com')
+    data = fixtures.cv_docx_bytes(2)
+    calls, original = counting_parser()
+    try:
+        for name in ('cv.docx', 'cv-again.docx'):
+            response = client.post('/api/cv/upload', headers=headers,
+                                   data={'file': (io.BytesIO(data), name)}, content_type='multipart/form-data')
+            assert response.status_code == 201, response.get_json()
+    finally:
+        file_handler.read_document = original
+    assert len(calls) == 1
+    print("✅ Re-uploaded CV skips parsing")
+
+
+def test_normalized_text_cached(make_app, tmp_path):
+    """Text is NFC with collapsed whitespace, identical on a miss and on a hit"""
+    make_app()
+    raw = 'Cafe\u0301  \t developer\r\n\r\n\r\n\r\n  Python\u00a0and   SQL  \n'
+    path = fixtures.write_fixture(str(tmp_path), 'cv.txt', raw)
+    miss = file_handler.extract_text_from_file(path)
+    assert miss == 'Caf\u00e9 developer\n\nPython and SQL'
+    assert file_handler.extract_text_from_file(path) == miss
+    assert extraction_cache._store.get(file_handler.file_digest(path), 'txt')[0] == miss
+    print("✅ Normalized text cached")
+
+
+def test_lru_eviction_and_version(tmp_path):
+    """Least recently used entries go first; another extractor version sees an empty cache"""
+    path = str(tmp_path / 'extraction.sqlite')
+    store = ExtractionStore(path, max_bytes=25, version='v1')
+    store.set('a', 'txt', 'x' * 10, None)
+    store.set('b', 'txt', 'y' * 10, None)
+    assert store.get('a', 'txt') == ('x' * 10, None)  # a is now more recent than b
+    store.set('c', 'txt', 'z' * 10, None)
+    assert store.get('b', 'txt') is None
+    assert store.get('a', 'txt') and store.get('c', 'txt')
+    assert store.stats()['bytes'] == 20
+    store.set('huge', 'txt', 'h' * 100, None)
+    assert store.get('huge', 'txt') is None and store.stats()['entries'] == 2
+    print("✅ LRU eviction by text size")
+
+    upgraded = ExtractionStore(path, max_bytes=25, version='v2')
+    assert upgraded.get('a', 'txt') is None
+    assert upgraded.stats()['entries'] == 0
+    print("✅ Extractor upgrade invalidates entries")
+
+
+def test_disabled(make_app, tmp_path):
+    """An empty path disables the cache"""
+    make_app(EXTRACTION_CACHE_PATH='')
+    assert not extraction_cache.enabled
+    path = str(tmp_path / 'cv.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Python developer')
+    assert file_handler.extract_text_from_file(path) == 'Python developer'
+    print("✅ Cache can be disabled")
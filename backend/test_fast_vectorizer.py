@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Test the fast vectorizer compiled from the trained CountVectorizer vocabulary
+Checks exact token counts and benchmarks realistic 2-10 page CV texts
+"""
+import sys
+import os
+import time
+import random
+sys.path.insert(0, os.path.dirname(__file__))
+
+import joblib
+import pandas as pd
+from engine.vectorizer import FastCountVectorizer
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'final_model')
+WORDS_PER_PAGE = 500
+
+
+def load_vectorizers():
+    count_vectorizer = joblib.load(os.path.join(MODEL_DIR, 'count_vectorizer.joblib'))
+    return count_vectorizer, FastCountVectorizer.from_count_vectorizer(count_vectorizer)
+
+
+def make_cv_text(n_pages, seed=0):
+    """Synthetic CV text built from catalog vocabulary, headings and punctuation"""
+    rng = random.Random(seed)
+    jobs_df = pd.read_pickle(os.path.join(MODEL_DIR, 'jobs_dataframe.pkl'))
+    words = ' '.join(jobs_df['Text'].head(2000)).split()
+    filler = ['EXPERIENCE', 'Education:', 'the', 'and', 'with', '2019-2023', 'e-mail:',
+              'C++', 'Node.js', 'résumé', '•', 'Led', 'team', 'of', '5', 'engineers.']
+    lines = []
+    for _ in range(n_pages * WORDS_PER_PAGE // 10):
+        lines.append(' '.join(rng.choice(words if rng.random() < 0.7 else filler) for _ in range(10)))
+    return '\n'.join(lines)
+
+
+def test_counts_match_count_vectorizer():
+    """Same CSR matrix as count_vectorizer.transform for single and batched documents"""
+    print("\n" + "="*80)
+    print("TESTING FAST VECTORIZER COUNTS")
+    print("="*80)
+    
+    count_vectorizer, fast = load_vectorizers()
+    jobs_df = pd.read_pickle(os.path.join(MODEL_DIR, 'jobs_dataframe.pkl'))
+    texts = jobs_df['Text'].head(500).tolist() + [
+        make_cv_text(2), '', 'THE and OF', 'Ünïcode Café PYTHON_3 c++ c# node.js x y z'
+    ]
+    
+    expected = count_vectorizer.transform(texts)
+    batch = fast.transform(texts)
+    assert batch.shape == expected.shape
+    assert (batch != expected).nnz == 0
+    
+    for i, text in enumerate(texts):
+        ids, counts = fast.transform_one(text)
+        row = expected[i]
+        assert ids.tolist() == row.indices.tolist()
+        assert counts.tolist() == row.data.tolist()
+    print(f"✅ Identical counts for {len(texts)} documents")
+
+
+def test_vectorizer_latency():
+    """Per-document latency on 2-10 page CVs"""
+    print("\n" + "="*80)
+    print("BENCHMARKING FAST VECTORIZER")
+    print("="*80)
+    
+    count_vectorizer, fast = load_vectorizers()
+    n_runs = 20
+    
+    for n_pages in (2, 5, 10):
+        cv_text = make_cv_text(n_pages, seed=n_pages)
+        
+        start = time.perf_counter()
+        for _ in range(n_runs):
+            count_vectorizer.transform([cv_text])
+        sklearn_ms = (time.perf_counter() - start) / n_runs * 1000
+        
+        start = time.perf_counter()
+        for _ in range(n_runs):
+            fast.transform_one(cv_text)
+        fast_ms = (time.perf_counter() - start) / n_runs * 1000
+        
+        print(f"{n_pages:>2} pages: CountVectorizer {sklearn_ms:.3f} ms | fast {fast_ms:.3f} ms "
+              f"({sklearn_ms / fast_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    test_counts_match_count_vectorizer()
+    test_vectorizer_latency()
+    print("\n✅ ALL FAST VECTORIZER TESTS PASSED!")
@@ -0,0 +1,113 @@
+"""
+Test filtered matching: candidate sets from the filter index, top-k over
+the candidates only, and filters on CV upload and test-match
+"""
+import os
+import io
+
+import numpy as np
+import pandas as pd
+
+from engine.filters import JobFilterIndex, parse_filters
+
+SAMPLE_CV = """
+Machine Learning Engineer with 5 years of experience in Python, PyTorch,
+Kubernetes and AWS. Built NLP pipelines and deployed deep learning models.
+"""
+
+
+def test_candidates_match_pandas():
+    """Index candidates equal a plain DataFrame query"""
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'company_location': rng.choice(['Germany', 'France', 'Canada'], 2000),
+        'experience_level': rng.choice(['EN', 'MI', 'SE'], 2000),
+        'salary_usd': rng.integers(30_000, 200_000, 2000),
+        'remote_ratio': rng.choice([0, 50, 100], 2000),
+    })
+    index = JobFilterIndex.from_dataframe(df)
+    filters = parse_filters({'location': 'germany,France', 'min_salary': '80000', 'min_remote': 50,
+                             'experience_level': ['SE'], 'explain': 'true'})
+    expected = df.index[df.company_location.isin(['Germany', 'France']) & (df.salary_usd >= 80_000)
+                        & (df.remote_ratio >= 50) & (df.experience_level == 'SE')].to_numpy()
+    assert np.array_equal(index.candidates(filters), expected)
+    assert index.mask(filters).sum() == len(expected)
+    assert index.candidates({}) is None
+    assert len(index.candidates({'company_location': ['Atlantis']})) == 0
+    assert len(index.candidates({'salary_usd': (None, 29_999)})) == 0
+
+    for bad in ({'min_salary': 'lots'}, {'min_remote': 100, 'max_remote': 50}, {'min_salary': 'nan'},
+                {'max_salary': 'inf'}, {'min_remote': float('-inf')}, ['location'], 'Germany'):
+        try:
+            parse_filters(bad)
+            assert False, bad
+        except ValueError:
+            pass
+    print("✅ Candidate sets from the filter index")
+
+
+def test_repeated_parameters():
+    """Repeated query parameters and comma-separated values are merged"""
+    from werkzeug.datastructures import MultiDict
+
+    params = MultiDict([('location', 'Germany'), ('location', 'France,Canada'), ('industry', 'Tech'),
+                        ('location', 'germany')])
+    assert parse_filters(params) == {'company_location': ['Germany', 'France', 'Canada', 'germany'],
+                                     'industry': ['Tech']}
+    assert parse_filters({'location': ['Germany', 'France,Canada']})['company_location'] == \
+        ['Germany', 'France', 'Canada']
+    print("✅ Repeated and comma-separated values merged")
+
+
+def test_filtered_match_cv():
+    """Filtered top-k is the unfiltered ranking restricted to the candidates"""
+    from app.services.cv_matching_service import CVMatchingService
+    from engine.quantize import cosine_scores
+
+    service = CVMatchingService()
+    filters = parse_filters({'location': 'Germany', 'min_remote': 50, 'min_salary': 80000})
+    result = service.match_cv(SAMPLE_CV, top_n=5, filters=filters)
+    assert result['success'] and len(result['matches']) == 5
+    for match in result['matches']:
+        assert match['location'] == 'Germany' and match['salary'] >= 80000
+
+    candidates = service.job_filters.candidates(filters)
+    assert result['total_jobs_searched'] == len(candidates) < len(service.df_jobs)
+    scores = cosine_scores(result['cv_topics'], service.job_topic_distributions)[candidates]
+    expected = np.sort(scores)[::-1][:5]
+    assert np.allclose([m['similarity_score'] for m in result['matches']], expected)
+
+    empty = service.match_cv(SAMPLE_CV, filters={'company_location': ['Atlantis']})
+    assert empty['success'] and empty['matches'] == []
+    print("✅ match_cv applies filters before top-k")
+
+
+def test_endpoints_accept_filters(make_app, auth_headers):
+    """Upload form fields and test-match JSON carry filters; bad bounds are 400"""
+    app = make_app()
+    client = app.test_client()
+    headers = auth_headers(client, 'filters@example.com')
+
+    def upload(filename='cv.txt', **fields):
+        data = {'file': (io.BytesIO(SAMPLE_CV.encode('utf-8')), filename), **fields}
+        return client.post('/api/cv/upload', headers=headers, data=data, content_type='multipart/form-data')
+
+    response = upload(location='Canada', min_remote='100')
+    assert response.status_code == 201
+    assert all(match['location'] == 'Canada' for match in response.get_json()['top_5_matches'])
+    # Rejected before the file is saved
+    assert upload('rejected.txt', min_salary='lots').status_code == 400
+    assert upload('rejected.txt', engine='word2vec').status_code == 400
+    saved = [name for _, _, names in os.walk(app.config['UPLOAD_FOLDER']) for name in names]
+    assert 'rejected.txt' not in saved and 'cv.txt' in saved
+
+    response = client.post('/api/test-match', json={'cv_text': SAMPLE_CV, 'filters': {'location': ['France']}})
+    assert response.status_code == 200
+    assert all(match['location'] == 'France' for match in response.get_json()['matches'])
+    for bad in (['France'], 'France', {'min_salary': 'NaN'}):
+        assert client.post('/api/test-match', json={'cv_text': SAMPLE_CV, 'filters': bad}).status_code == 400
+    response = client.post('/api/cv/upload?location=Canada&location=Germany', headers=headers,
+                           data={'file': (io.BytesIO(SAMPLE_CV.encode('utf-8')), 'cv.txt')},
+                           content_type='multipart/form-data')
+    assert response.get_json()['filters']['company_location'] == ['Canada', 'Germany']
+    print("✅ Upload and test-match accept filters")
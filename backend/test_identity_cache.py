@@ -0,0 +1,63 @@
+"""
+Test the identity cache behind /api/auth/me: hits, TTL expiry,
+invalidation on update and the shared SQLite tier between workers
+"""
+from types import SimpleNamespace
+
+from app import identity_cache
+from app.utils.cache import TTLCache
+from app.utils.identity_cache import IdentityCache
+from app.utils.metrics import IDENTITY_DB_LOOKUPS, CACHE_REQUESTS
+
+
+def test_me_served_from_cache_until_update(make_app, auth_headers):
+    """Repeated /me calls hit the database once; update_user invalidates the entry"""
+    client = make_app().test_client()
+    headers = auth_headers(client, 'identity@example.com')
+    identity_cache.clear()
+    
+    lookups = IDENTITY_DB_LOOKUPS.get()
+    hits = CACHE_REQUESTS.get(cache='identity', result='hit')
+    for _ in range(5):
+        response = client.get('/api/auth/me', headers=headers)
+        assert response.status_code == 200
+    assert IDENTITY_DB_LOOKUPS.get() == lookups + 1
+    assert CACHE_REQUESTS.get(cache='identity', result='hit') == hits + 4
+    
+    assert client.put('/api/auth/update', headers=headers, json={'full_name': 'Renamed'}).status_code == 200
+    response = client.get('/api/auth/me', headers=headers)
+    assert response.get_json()['user']['full_name'] == 'Renamed'
+    assert IDENTITY_DB_LOOKUPS.get() == lookups + 2
+    print("✅ /me cached, update invalidates")
+
+
+def test_ttl_expiry():
+    """Entries disappear after their TTL"""
+    now = [100.0]
+    cache = TTLCache('test', maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set(1, 'a')
+    assert cache.get(1) == 'a'
+    now[0] += 11
+    assert cache.get(1) is None
+    
+    cache.set(1, 'a')
+    cache.set(2, 'b')
+    cache.set(3, 'c')  # evicts the least recently used entry
+    assert cache.get(1) is None and cache.get(3) == 'c'
+
+
+def test_shared_tier_between_workers(tmp_path):
+    """A profile cached by one worker is visible to another; invalidation removes it for both"""
+    path = str(tmp_path / 'identity.sqlite')
+    config = {'IDENTITY_CACHE_TTL': 60, 'IDENTITY_CACHE_SHARED_PATH': path, 'IDENTITY_CACHE_LOCAL_TTL': 5}
+    worker_a = IdentityCache(SimpleNamespace(config=config))
+    worker_b = IdentityCache(SimpleNamespace(config=config))
+    
+    profile = {'id': 7, 'email': 'shared@example.com', 'full_name': 'Shared', 'created_at': '2024-01-01T00:00:00'}
+    worker_a.set(7, profile)
+    assert worker_b.get(7) == profile
+    
+    worker_a.invalidate(7)
+    worker_b.clear()  # local tier would expire within IDENTITY_CACHE_LOCAL_TTL
+    assert worker_b.get(7) is None
+    print("✅ Shared SQLite tier works across cache instances")
@@ -0,0 +1,66 @@
+"""
+Test the JSON provider (numpy/pandas types, orjson and stdlib paths)
+and gzip compression of large responses
+"""
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import jsonify
+from app.utils import json_provider
+
+PAYLOAD = {
+    'count': np.int64(3),
+    'score': np.float32(0.5),
+    'flag': np.bool_(True),
+    'missing': np.float64('nan'),
+    'vector': np.arange(3),
+    'when': pd.Timestamp('2024-10-18'),
+    'counts': pd.Series([1, 2]).value_counts().to_dict(),
+}
+EXPECTED = {'count': 3, 'score': 0.5, 'flag': True, 'missing': None, 'vector': [0, 1, 2],
+            'when': '2024-10-18T00:00:00', 'counts': {'1': 1, '2': 1}}
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(COMPRESS_MIN_SIZE=512)
+    
+    @app.route('/_test/payload/<int:size>')
+    def payload(size):
+        return jsonify({'items': ['job'] * size, **PAYLOAD})
+    return app
+
+
+def test_numpy_and_pandas_values(app):
+    """numpy/pandas values serialize without manual coercion, with or without orjson"""
+    original = json_provider.orjson
+    try:
+        for encoder in ([original] if original else []) + [None]:
+            json_provider.orjson = encoder
+            with app.app_context():
+                decoded = json.loads(app.json.dumps(PAYLOAD))
+            assert decoded == EXPECTED, (encoder, decoded)
+    finally:
+        json_provider.orjson = original
+    print("✅ numpy/pandas payload serialized by every encoder")
+
+
+def test_gzip_negotiation_and_threshold(app):
+    """Only responses above the threshold are compressed, and only when gzip is accepted"""
+    client = app.test_client()
+    
+    small = client.get('/_test/payload/1', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+    
+    plain = client.get('/_test/payload/500')
+    assert 'Content-Encoding' not in plain.headers
+    
+    compressed = client.get('/_test/payload/500', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert len(compressed.get_data()) < len(plain.get_data())
+    assert json.loads(gzip.decompress(compressed.get_data())) == plain.get_json()
+    print(f"✅ {len(plain.get_data())} bytes -> {len(compressed.get_data())} bytes gzip")
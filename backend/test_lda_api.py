@@ -105,7 +105,11 @@ def test_model_artifacts():
         "count_vectorizer.joblib": "CountVectorizer",
         "job_topic_distributions.joblib": "Job Topic Distributions",
         "jobs_dataframe.pkl": "Jobs DataFrame (PKL)",
-        "jobs_dataframe.csv": "Jobs DataFrame (CSV)"
+        "jobs_dataframe.csv": "Jobs DataFrame (CSV)",
+        "lda_inference.npz": "LDA Inference Artifact",
+        "job_neighbors.npz": "Similar Jobs Neighbour Lists",
+        "topic_index.npz": "Topic Browse Index",
+        "cv_topic_matrix.npy": "CV Topic Matrix (reverse matching)"
     }
     
     all_exist = True
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Test the compact LDA inference artifact against sklearn's transform
+Checks topic distributions match and compares per-call latency
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+import joblib
+import numpy as np
+import pandas as pd
+from engine.lda_inference import LDAInference, INFERENCE_ARTIFACT
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'final_model')
+
+SAMPLE_CV = """
+Senior Machine Learning Engineer with 7 years of experience.
+Skills: Python, TensorFlow, PyTorch, Docker, Kubernetes, AWS, NLP, SQL
+Built recommendation systems and computer vision pipelines in production.
+"""
+
+
+def load_artifacts():
+    lda_model = joblib.load(os.path.join(MODEL_DIR, 'lda_model.joblib'))
+    count_vectorizer = joblib.load(os.path.join(MODEL_DIR, 'count_vectorizer.joblib'))
+    inference = LDAInference.load(os.path.join(MODEL_DIR, INFERENCE_ARTIFACT))
+    return lda_model, count_vectorizer, inference
+
+
+def test_inference_matches_sklearn():
+    """Topic distributions from the NumPy E-step match sklearn within tolerance"""
+    print("\n" + "="*80)
+    print("TESTING NUMPY E-STEP AGAINST SKLEARN")
+    print("="*80)
+    
+    lda_model, count_vectorizer, inference = load_artifacts()
+    
+    assert inference.n_components == lda_model.n_components
+    assert inference.vocabulary == count_vectorizer.get_feature_names_out().tolist()
+    
+    jobs_df = pd.read_pickle(os.path.join(MODEL_DIR, 'jobs_dataframe.pkl'))
+    texts = jobs_df['Text'].head(200).tolist() + [SAMPLE_CV, '', 'qwertyuiop asdfgh']
+    X = count_vectorizer.transform(texts)
+    
+    expected = lda_model.transform(X)
+    batch = inference.transform(X)
+    print(f"Batch max abs diff: {np.abs(expected - batch).max():.2e}")
+    assert np.allclose(expected, batch, atol=1e-6)
+    
+    for i in range(X.shape[0]):
+        row = X[i]
+        single = inference.transform_ids(row.indices, row.data)
+        assert np.allclose(expected[i], single, atol=1e-6)
+    print("✅ Single and batch inference match sklearn")
+
+
+def test_inference_latency():
+    """Per-call latency for a single CV: sklearn transform vs NumPy E-step"""
+    print("\n" + "="*80)
+    print("TESTING SINGLE-CV INFERENCE LATENCY")
+    print("="*80)
+    
+    lda_model, count_vectorizer, inference = load_artifacts()
+    cv_count = count_vectorizer.transform([SAMPLE_CV])
+    n_runs = 100
+    
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        lda_model.transform(cv_count)
+    sklearn_ms = (time.perf_counter() - start) / n_runs * 1000
+    
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        inference.transform_ids(cv_count.indices, cv_count.data)
+    numpy_ms = (time.perf_counter() - start) / n_runs * 1000
+    
+    artifact_kb = os.path.getsize(os.path.join(MODEL_DIR, INFERENCE_ARTIFACT)) / 1024
+    model_kb = os.path.getsize(os.path.join(MODEL_DIR, 'lda_model.joblib')) / 1024
+    print(f"sklearn transform: {sklearn_ms:.3f} ms/call ({model_kb:.1f} KB)")
+    print(f"NumPy E-step:      {numpy_ms:.3f} ms/call ({artifact_kb:.1f} KB)")
+    assert artifact_kb < model_kb
+
+
+if __name__ == "__main__":
+    test_inference_matches_sklearn()
+    test_inference_latency()
+    print("\n✅ ALL LDA INFERENCE TESTS PASSED!")
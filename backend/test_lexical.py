@@ -0,0 +1,102 @@
+"""
+Test the lexical matching engine: BM25/TF-IDF weights, max-score top-k
+against exhaustive scoring, and engine selection on CV upload and paging
+"""
+import io
+
+import numpy as np
+import scipy.sparse as sp
+
+from engine.lexical import LexicalIndex
+from engine.topk import top_k_window
+
+SAMPLE_CV = """
+NLP engineer: Python, PyTorch, TensorFlow, Hugging Face transformers, spaCy.
+Fine-tuned language models, built search and recommendation pipelines on GCP.
+"""
+# Longer than the 1000-character preview, with terms only in the tail
+LONG_CV = ('Accountant: payroll, invoicing, audit and tax reporting for retail clients. ' * 14
+           + 'Data engineer running Spark, Kafka and Airflow pipelines on Snowflake. ' * 4)
+
+
+def test_bm25_weights():
+    """Impacts follow the Okapi BM25 formula"""
+    counts = sp.csr_matrix(np.array([[2, 0, 1], [0, 1, 1], [1, 0, 0]]))
+    index = LexicalIndex.build(counts, 'bm25', k1=1.2, b=0.75)
+    lengths, avg = np.array([3, 2, 1]), 2.0
+    idf = np.log1p((3 - 2 + 0.5) / (2 + 0.5))
+    expected = idf * 2 * 2.2 / (2 + 1.2 * (0.25 + 0.75 * lengths[0] / avg))
+    # qtf = 1: the query weight (k3 + 1) * 1 / (k3 + 1) is 1
+    assert np.isclose(index.scores([0], [1])[0], expected, rtol=1e-5)
+    print("✅ BM25 impacts")
+
+
+def test_max_score_equals_exhaustive():
+    """Pruned top-k returns exactly the exhaustive ranking, with and without filters"""
+    rng = np.random.default_rng(11)
+    # Zipf-like term frequencies: a few very common terms, a long tail
+    probabilities = 1 / np.arange(1, 301) ** 1.1
+    docs = [rng.choice(300, size=rng.integers(3, 40), p=probabilities / probabilities.sum()) for _ in range(3000)]
+    rows = np.repeat(np.arange(len(docs)), [len(d) for d in docs])
+    counts = sp.csr_matrix((np.ones(len(rows)), (rows, np.concatenate(docs))), shape=(len(docs), 300))
+    allowed = np.sort(rng.choice(len(docs), 700, replace=False))
+
+    for scheme in ('bm25', 'tfidf'):
+        index = LexicalIndex.build(counts, scheme)
+        for _ in range(40):
+            terms = np.unique(rng.choice(300, size=rng.integers(1, 25), p=probabilities / probabilities.sum()))
+            query_counts = rng.integers(1, 4, len(terms))
+            full = index.scores(terms, query_counts)
+            for k, subset in ((10, None), (3, None), (10, allowed)):
+                found, scores = index.search(terms, query_counts, k=k, rows=subset)
+                reference = full if subset is None else np.where(np.isin(np.arange(len(full)), subset), full, 0)
+                expected = top_k_window(reference, 0, k)
+                expected = expected[reference[expected] > 0]
+                assert np.array_equal(found, expected), (scheme, k)
+                assert np.allclose(scores, reference[expected], atol=1e-5)
+    print("✅ Max-score top-k equals exhaustive scoring")
+
+
+def test_engine_selection(make_app, auth_headers):
+    """?engine=bm25 ranks lexically, pages keep the engine, unknown engines are 400"""
+    from app.services.cv_matching_service import get_cv_matching_service
+
+    client = make_app().test_client()
+    headers = auth_headers(client, 'lexical@example.com')
+
+    def upload(text=SAMPLE_CV, **fields):
+        data = {'file': (io.BytesIO(text.encode('utf-8')), 'cv.txt'), **fields}
+        return client.post('/api/cv/upload', headers=headers, data=data, content_type='multipart/form-data')
+
+    assert upload(engine='word2vec').status_code == 400
+    uploaded = upload(engine='bm25').get_json()
+    assert uploaded['engine'] == 'bm25'
+    page = client.get(f"/api/cv/{uploaded['cv_id']}/matches?cursor={uploaded['next_cursor']}", headers=headers)
+    assert page.get_json()['engine'] == 'bm25'
+
+    expected = get_cv_matching_service().match_cv(SAMPLE_CV, top_n=10, engine='bm25')['matches']
+    matches = uploaded['top_5_matches'] + page.get_json()['matches']
+    assert [m['similarity_score'] for m in matches] == [m['similarity_score'] for m in expected]
+    assert [m['rank'] for m in matches] == list(range(1, 11))
+    print("✅ Engine selection on upload and paging")
+
+    # Lexical pages after a topic cache miss score the full CV, not the stored preview
+    from app import db
+    from app.models.user import CVUpload
+
+    uploaded = upload(LONG_CV, engine='bm25').get_json()
+    get_cv_matching_service().cv_cache.clear()
+    page = client.get(f"/api/cv/{uploaded['cv_id']}/matches?cursor={uploaded['next_cursor']}", headers=headers)
+    expected = get_cv_matching_service().match_cv(LONG_CV, top_n=10, engine='bm25')['matches']
+    assert [m['similarity_score'] for m in page.get_json()['matches']] == \
+        [m['similarity_score'] for m in expected[5:]]
+
+    # Uploads from before the full text was kept: BM25 cursors are refused, LDA pages still work
+    with client.application.app_context():
+        db.session.get(CVUpload, uploaded['cv_id']).full_text = None
+        db.session.commit()
+    get_cv_matching_service().cv_cache.clear()
+    page = client.get(f"/api/cv/{uploaded['cv_id']}/matches?cursor={uploaded['next_cursor']}", headers=headers)
+    assert page.status_code == 400
+    assert client.get(f"/api/cv/{uploaded['cv_id']}/matches?engine=lda", headers=headers).status_code == 200
+    print("✅ BM25 paging after a cache miss")
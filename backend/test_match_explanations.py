@@ -0,0 +1,80 @@
+"""
+Test match explanations: topic shares, shared terms and the explain flag
+on CV upload
+"""
+import io
+
+import numpy as np
+
+from engine.explain import MatchExplainer
+from engine.vectorizer import FastCountVectorizer
+
+SAMPLE_CV = """
+Machine Learning Engineer with 5 years of experience in Python, PyTorch,
+Kubernetes and AWS. Built NLP pipelines and deployed deep learning models.
+"""
+# Terms past the 1000-character preview must still be explained
+LONG_CV = ('Financial analyst: Excel models, budgeting and accounting reports. ' * 16
+           + 'Machine learning engineer shipping PyTorch models on Kubernetes. ' * 4)
+
+
+def test_explainer():
+    """Topic shares follow the cosine decomposition; shared terms are in both texts"""
+    vocabulary = ['python', 'pytorch', 'kubernetes', 'finance', 'excel', 'nlp']
+    vectorizer = FastCountVectorizer({term: i for i, term in enumerate(vocabulary)})
+    components = np.array([[5, 4, 1, 0.1, 0.1, 3], [0.1, 0.1, 0.1, 6, 5, 0.1]])
+    explainer = MatchExplainer(components, vocabulary, vectorizer, label_words=2)
+    assert explainer.topic_labels == ['python, pytorch', 'finance, excel']
+
+    cv_ids, _ = vectorizer.transform_one('python pytorch nlp excel')
+    result = explainer.explain(np.array([0.8, 0.2]), cv_ids, np.array([0.9, 0.1]), 'Python NLP Kubernetes excel')
+    shares = [topic['share'] for topic in result['top_topics']]
+    assert result['top_topics'][0]['topic'] == 0
+    assert abs(sum(shares) - 1) < 1e-3
+    assert result['shared_terms'][:2] == ['python', 'nlp']
+    assert set(result['shared_terms']) == {'python', 'nlp', 'excel'}
+    print("✅ Explainer decomposes the score")
+
+
+def test_upload_with_explanations(make_app, auth_headers):
+    """?explain=true adds an explanation to every match"""
+    client = make_app().test_client()
+    headers = auth_headers(client, 'explain@example.com')
+
+    def upload(query=''):
+        data = {'file': (io.BytesIO(SAMPLE_CV.encode('utf-8')), 'cv.txt')}
+        return client.post('/api/cv/upload' + query, headers=headers, data=data, content_type='multipart/form-data')
+
+    plain = upload().get_json()['top_5_matches']
+    explained = upload('?explain=true').get_json()['top_5_matches']
+    assert all('explanation' not in match for match in plain)
+    assert [m['similarity_score'] for m in plain] == [m['similarity_score'] for m in explained]
+    for match in explained:
+        assert match['explanation']['top_topics']
+        assert all(term in SAMPLE_CV.lower() for term in match['explanation']['shared_terms'])
+    print("✅ Upload returns explanations on request")
+
+    # Explained pages after the topic cache expired use the full stored text
+    from app import db
+    from app.models.user import CVUpload
+    from app.services.cv_matching_service import get_cv_matching_service
+
+    data = {'file': (io.BytesIO(LONG_CV.encode('utf-8')), 'long_cv.txt')}
+    uploaded = client.post('/api/cv/upload?explain=true', headers=headers, data=data,
+                           content_type='multipart/form-data').get_json()
+    cv_id = uploaded['cv_id']
+    warm = client.get(f'/api/cv/{cv_id}/matches?explain=true&limit=5', headers=headers).get_json()['matches']
+    get_cv_matching_service().cv_cache.clear()
+    cold = client.get(f'/api/cv/{cv_id}/matches?explain=true&limit=5', headers=headers).get_json()['matches']
+    assert [m['explanation']['shared_terms'] for m in cold] == [m['explanation']['shared_terms'] for m in warm]
+    assert any(term in LONG_CV[1000:].lower() and term not in LONG_CV[:1000].lower()
+               for m in cold for term in m['explanation']['shared_terms'])
+
+    # Uploads from before the full text was kept cannot be explained
+    with client.application.app_context():
+        db.session.get(CVUpload, cv_id).full_text = None
+        db.session.commit()
+    get_cv_matching_service().cv_cache.clear()
+    assert client.get(f'/api/cv/{cv_id}/matches?explain=true', headers=headers).status_code == 400
+    assert client.get(f'/api/cv/{cv_id}/matches', headers=headers).status_code == 200
+    print("✅ Explained pages survive a topic cache miss")
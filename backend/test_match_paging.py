@@ -0,0 +1,66 @@
+"""
+Test "more matches" paging: ranked windows, cursors that follow the upload
+ranking with its filters, and the topic cache fallback
+"""
+import io
+
+import numpy as np
+
+from engine.topk import top_k_window
+from app.utils.cursor import encode_cursor, decode_cursor
+
+SAMPLE_CV = """
+Data Scientist with 4 years of experience in Python, SQL, Tableau and
+statistics. Built forecasting models, A/B tests and dashboards on AWS.
+"""
+
+
+def test_windows_and_cursors():
+    """Consecutive windows tile the full ranking, ties by lowest index"""
+    scores = np.random.default_rng(5).integers(0, 20, 500).astype(np.float32)
+    full = np.lexsort((np.arange(500), -scores))
+    pages = np.concatenate([top_k_window(scores, start, start + 7) for start in range(0, 500, 7)])
+    assert np.array_equal(pages, full)
+    assert len(top_k_window(scores, 600, 610)) == 0
+
+    assert decode_cursor(encode_cursor(10, {'salary_usd': (80000.0, None)}, 'bm25')) == \
+        (10, {'salary_usd': [80000.0, None]}, 'bm25')
+    for bad in ('not-a-cursor', encode_cursor(-1), 'eyJvIjoxfQ'):
+        try:
+            decode_cursor(bad)
+            assert False, bad
+        except ValueError:
+            pass
+    print("✅ Ranked windows and cursors")
+
+
+def test_paging_endpoint(make_app, auth_headers):
+    """Pages after the upload continue its ranking without repeats, keeping filters"""
+    from app.services.cv_matching_service import get_cv_matching_service
+
+    client = make_app().test_client()
+    headers = auth_headers(client, 'paging@example.com')
+    data = {'file': (io.BytesIO(SAMPLE_CV.encode('utf-8')), 'cv.txt'), 'min_remote': '50'}
+    uploaded = client.post('/api/cv/upload', headers=headers, data=data, content_type='multipart/form-data').get_json()
+    cv_id, cursor = uploaded['cv_id'], uploaded['next_cursor']
+    matches = uploaded['top_5_matches']
+    for _ in range(3):
+        page = client.get(f'/api/cv/{cv_id}/matches?limit=5&cursor={cursor}', headers=headers).get_json()
+        matches += page['matches']
+        cursor = page['next_cursor']
+    assert [m['rank'] for m in matches] == list(range(1, 21))
+
+    expected = get_cv_matching_service().match_cv(SAMPLE_CV, top_n=20, filters={'remote_ratio': (50, None)})
+    assert [m['similarity_score'] for m in matches] == [m['similarity_score'] for m in expected['matches']]
+    assert [(m['job_title'], m['company']) for m in matches] == \
+        [(m['job_title'], m['company']) for m in expected['matches']]
+
+    # Expired cache: topics come from the stored float32 vector, same page
+    get_cv_matching_service().cv_cache.clear()
+    page = client.get(f'/api/cv/{cv_id}/matches?limit=5&cursor={uploaded["next_cursor"]}', headers=headers)
+    assert np.allclose([m['similarity_score'] for m in page.get_json()['matches']],
+                       [m['similarity_score'] for m in matches[5:10]], atol=1e-6)
+
+    assert client.get(f'/api/cv/{cv_id}/matches?cursor=garbage', headers=headers).status_code == 400
+    assert client.get(f'/api/cv/{cv_id}/matches', headers=auth_headers(client, 'other-pager@example.com')).status_code == 404
+    print("✅ Cursor paging follows the upload ranking")
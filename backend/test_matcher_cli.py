@@ -0,0 +1,133 @@
+"""
+Test the Flask-free matcher and its command line: no Flask import, same
+results as the API service, NDJSON batch output over a process pool
+"""
+import sys
+import os
+import io
+import json
+import subprocess
+import threading
+
+from benchmarks import fixtures
+from engine import cli
+from engine.matcher import Matcher
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_CV = """
+Machine learning engineer: Python, PyTorch, NLP and computer vision models.
+Deployed models with Docker and Kubernetes on AWS, built data pipelines in Spark.
+"""
+
+
+def run_cli(*argv, stdin=None):
+    out = io.StringIO()
+    original = sys.stdin
+    sys.stdin = io.StringIO(stdin) if stdin is not None else original
+    try:
+        assert cli.main(list(argv), out=out) == 0
+    finally:
+        sys.stdin = original
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_no_flask_import():
+    """engine.matcher and engine.cli load without Flask or the app package"""
+    code = ('import sys; import engine.cli, engine.matcher; '
+            'print(any(name == "flask" or name.startswith(("flask.", "app.")) or name == "app" for name in sys.modules))')
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+    print("✅ Matcher is Flask-free")
+
+
+def test_service_is_a_thin_wrapper():
+    """CVMatchingService returns exactly what the standalone matcher returns"""
+    from app.services.cv_matching_service import CVMatchingService
+
+    matcher = Matcher()
+    service = CVMatchingService()
+    assert isinstance(service, Matcher)
+    for engine in ('lda', 'bm25'):
+        expected = matcher.match_cv(SAMPLE_CV, top_n=5, engine=engine, filters={'company_location': ['Germany']})
+        actual = service.match_cv(SAMPLE_CV, top_n=5, engine=engine, filters={'company_location': ['Germany']})
+        assert expected['matches'] == actual['matches']
+        assert expected['total_jobs_searched'] == actual['total_jobs_searched']
+    assert not matcher.match_cv('   ')['success']
+    print("✅ Service delegates to the matcher")
+
+
+def test_batch_match_ndjson(tmp_path):
+    """Directory inputs (PDF, DOCX, TXT) stream one line each, in order, same on 1 or 2 processes"""
+    workdir = str(tmp_path)
+    fixtures.write_fixture(workdir, 'a.pdf', fixtures.cv_pdf_bytes(2))
+    fixtures.write_fixture(workdir, 'b.docx', fixtures.cv_docx_bytes(2))
+    fixtures.write_fixture(workdir, 'c.txt', SAMPLE_CV)
+    fixtures.write_fixture(workdir, 'd.txt', '')
+    fixtures.write_fixture(workdir, 'notes.md', SAMPLE_CV)
+
+    inline = run_cli('batch-match', workdir, '--processes', '1', '--top-n', '3')
+    pooled = run_cli('batch-match', workdir, '--processes', '2', '--top-n', '3', '--chunksize', '1')
+    assert [record['id'] for record in inline] == ['a.pdf', 'b.docx', 'c.txt', 'd.txt']
+    assert inline == pooled
+    assert all(len(record['matches']) == 3 for record in inline[:3])
+    assert inline[3] == {'id': 'd.txt', 'error': 'CV text is empty'}
+
+    expected = Matcher().match_cv(SAMPLE_CV, top_n=3)['matches']
+    assert json.loads(json.dumps(expected)) == inline[2]['matches']
+    print("✅ batch-match NDJSON over a process pool")
+
+
+def test_stdin_inputs():
+    """match reads one CV from stdin; batch-match reads one per line (JSON or plain text)"""
+    [single] = run_cli('match', '-', '--engine', 'tfidf', '--top-n', '2', '--explain', stdin=SAMPLE_CV)
+    assert single['id'] == 'stdin' and single['engine'] == 'tfidf'
+    assert len(single['matches']) == 2 and 'explanation' in single['matches'][0]
+
+    lines = json.dumps({'id': 'cv-42', 'text': SAMPLE_CV}) + '\n\nPython developer with Django\n'
+    records = run_cli('batch-match', '-', '--processes', '1', '--filter', 'location=Germany', stdin=lines)
+    assert [record['id'] for record in records] == ['cv-42', '3']
+    assert all(match['location'] == 'Germany' for record in records for match in record['matches'])
+
+    lines = '{"id": "broken", "text": \n' + json.dumps({'id': 'cv-7', 'text': SAMPLE_CV}) + '\n'
+    records = run_cli('batch-match', '-', '--processes', '2', '--chunksize', '1', stdin=lines)
+    assert records[0]['id'] == '1' and records[0]['error'].startswith('invalid JSON line')
+    assert records[1]['id'] == 'cv-7' and records[1]['matches']
+    print("✅ stdin inputs and filters, malformed lines reported")
+
+
+def test_pool_reads_inputs_in_batches():
+    """The pool yields results before the whole input is read, with a bounded number in flight"""
+    read = []
+
+    def items():
+        for number in range(40):
+            read.append(number)
+            yield str(number), 'text', SAMPLE_CV
+
+    results = cli.run_pool(cli._match_item, items(), 2, {}, {'top_n': 1}, chunksize=1)
+    first = json.loads(next(results))
+    assert first['id'] == '0' and len(read) <= 4
+    assert [json.loads(line)['id'] for line in results] == [str(number) for number in range(1, 40)]
+    print("✅ Pool consumes inputs lazily")
+
+
+def test_pool_does_not_wait_for_next_input():
+    """A result is yielded while the next input is still being read (slow stdin)"""
+    more = threading.Event()
+
+    def items():
+        yield '0', 'text', SAMPLE_CV
+        assert more.wait(30), 'first result held back until the next input'
+        yield '1', 'text', SAMPLE_CV
+
+    results = cli.run_pool(cli._match_item, items(), 2, {}, {'top_n': 1}, chunksize=8)
+    assert json.loads(next(results))['id'] == '0'
+    more.set()
+    assert [json.loads(line)['id'] for line in results] == ['1']
+    print("✅ Results stream without waiting for the next input")
+
+
+def test_bench():
+    [summary] = run_cli('bench', '--queries', '20', '--processes', '1')
+    assert summary['queries'] == 20 and 0 < summary['p50_ms'] <= summary['p99_ms']
+    print("✅ bench summary")
@@ -0,0 +1,61 @@
+"""
+Test per-stage latency instrumentation and the Prometheus /metrics endpoint
+"""
+import io
+
+from app.utils.metrics import Registry, STAGE_LATENCY
+
+SAMPLE_CV = """
+Data Scientist with 6 years of experience in machine learning and statistics.
+Skills: Python, SQL, TensorFlow, Spark, AWS, Tableau
+"""
+
+
+def test_registry_text_format():
+    """Counters, gauges and histograms render in Prometheus text format"""
+    registry = Registry()
+    requests_total = registry.counter('demo_requests_total', 'Demo requests', ('route',))
+    load_time = registry.gauge('demo_load_seconds', 'Demo load time')
+    latency = registry.histogram('demo_latency_seconds', 'Demo latency', ('route',), buckets=(0.1, 1.0))
+    
+    requests_total.inc(route='/a')
+    requests_total.inc(2, route='/a')
+    load_time.set(1.5)
+    latency.observe(0.05, route='/a')
+    latency.observe(0.5, route='/a')
+    latency.observe(5, route='/a')
+    
+    text = registry.render()
+    print(text)
+    assert '# TYPE demo_requests_total counter' in text
+    assert 'demo_requests_total{route="/a"} 3' in text
+    assert 'demo_load_seconds 1.5' in text
+    assert 'demo_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'demo_latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'demo_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'demo_latency_seconds_count{route="/a"} 3' in text
+
+
+def test_metrics_endpoint_reports_upload_stages(make_app, auth_headers):
+    """An upload records every stage and /metrics exposes route counters"""
+    client = make_app().test_client()
+    headers = auth_headers(client, 'metrics@example.com')
+    
+    before = {stage: STAGE_LATENCY.get(stage=stage)[0] for stage in
+              ('save_file', 'extraction', 'vectorization', 'lda_inference', 'similarity', 'top_k', 'db_commit')}
+    response = client.post('/api/cv/upload', headers=headers,
+                           data={'file': (io.BytesIO(SAMPLE_CV.encode()), 'cv.txt')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 201, response.get_json()
+    
+    for stage, count in before.items():
+        assert STAGE_LATENCY.get(stage=stage)[0] == count + 1, stage
+    
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    text = response.get_data(as_text=True)
+    assert 'jobscope_http_requests_total{method="POST",route="/api/cv/upload",status="201"}' in text
+    assert 'jobscope_stage_duration_seconds_count{stage="extraction"}' in text
+    assert 'jobscope_model_load_seconds{service="cv_matching"}' in text
+    print("✅ /metrics exposes route and stage metrics")
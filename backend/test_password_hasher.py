@@ -0,0 +1,138 @@
+"""
+Test bcrypt offloading: pool admission control, Flask-Bcrypt compatibility
+and transparent rehash-on-login when the work factor changes
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from flask_bcrypt import Bcrypt
+from app import db, password_hasher
+from app.models.user import User
+from app.utils.password_hasher import PasswordHasher, HasherBusy
+
+
+def make_hasher(**config):
+    settings = {'BCRYPT_LOG_ROUNDS': 4, 'PASSWORD_HASH_WORKERS': 1, 'PASSWORD_HASH_MAX_QUEUE': 0}
+    settings.update(config)
+    return PasswordHasher(SimpleNamespace(config=settings))
+
+
+def test_hashes_compatible_with_flask_bcrypt():
+    """Pool hashes verify with Flask-Bcrypt and vice versa"""
+    hasher = make_hasher()
+    legacy = Bcrypt()
+    try:
+        pw_hash = hasher.generate_password_hash('s3cret')
+        assert pw_hash.startswith('$2b$04$')
+        assert legacy.check_password_hash(pw_hash, 's3cret')
+        
+        legacy_hash = legacy.generate_password_hash('s3cret', 5).decode('utf-8')
+        assert hasher.check_password_hash(legacy_hash, 's3cret')
+        assert not hasher.check_password_hash(legacy_hash, 'wrong')
+        assert hasher.needs_rehash(legacy_hash)
+        assert not hasher.needs_rehash(pw_hash)
+    finally:
+        hasher.shutdown()
+    print("✅ Hashes are interchangeable with Flask-Bcrypt")
+
+
+def test_workers_skip_main():
+    """The forkserver preloads the hashing module, never the server's __main__"""
+    import multiprocessing
+    from multiprocessing import forkserver
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return
+    hasher = make_hasher()
+    try:
+        assert hasher._get_pool()._mp_context.get_start_method() == 'forkserver'
+        preload = forkserver._forkserver._preload_modules
+        assert 'app.utils.password_hasher' in preload and '__main__' not in preload
+    finally:
+        hasher.shutdown()
+    print("✅ Hashing workers preload only app.utils.password_hasher")
+
+
+def test_saturated_pool_rejects_immediately():
+    """With one worker and no queue, concurrent hashes beyond capacity raise HasherBusy"""
+    hasher = make_hasher(BCRYPT_LOG_ROUNDS=12)
+    outcomes = []
+    
+    def attempt():
+        try:
+            hasher.generate_password_hash('s3cret')
+            outcomes.append('ok')
+        except HasherBusy:
+            outcomes.append('busy')
+    
+    try:
+        threads = [threading.Thread(target=attempt) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        hasher.shutdown()
+    print(f"Outcomes: {outcomes}")
+    assert 'ok' in outcomes and 'busy' in outcomes
+
+
+def test_timed_out_job_keeps_its_slot():
+    """A hash that times out still occupies its worker, so its slot is freed only when it ends"""
+    hasher = make_hasher(BCRYPT_LOG_ROUNDS=12, PASSWORD_HASH_TIMEOUT=0.01)
+    try:
+        try:
+            hasher.generate_password_hash('s3cret')
+            raise AssertionError('expected a timeout')
+        except HasherBusy:
+            pass
+        assert not hasher._slots.acquire(blocking=False)
+        deadline = time.monotonic() + 60
+        while not hasher._slots.acquire(blocking=False):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        hasher._slots.release()
+    finally:
+        hasher.shutdown()
+    print("✅ Timed-out jobs hold their slot until they finish")
+
+
+def test_login_busy_returns_503(make_app):
+    """Routes answer 503 with Retry-After when hashing capacity is exhausted"""
+    app = make_app(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_QUEUE=1)
+    client = app.test_client()
+    original = password_hasher._slots
+    password_hasher._slots = threading.BoundedSemaphore(1)
+    password_hasher._slots.acquire()
+    try:
+        response = client.post('/api/auth/register', json={'email': 'busy@example.com', 'password': 'pw123456'})
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        password_hasher._slots = original
+        password_hasher.shutdown()
+
+
+def test_rehash_on_login(make_app):
+    """A hash made with an older work factor is upgraded at the next successful login"""
+    app = make_app(BCRYPT_LOG_ROUNDS=5, PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_QUEUE=1)
+    client = app.test_client()
+    email = 'rehash@example.com'
+    try:
+        with app.app_context():
+            User.query.filter_by(email=email).delete()
+            db.session.add(User(email=email, full_name='Old Hash',
+                                password_hash=Bcrypt().generate_password_hash('pw123456', 4).decode('utf-8')))
+            db.session.commit()
+        
+        assert client.post('/api/auth/login', json={'email': email, 'password': 'nope'}).status_code == 401
+        response = client.post('/api/auth/login', json={'email': email, 'password': 'pw123456'})
+        assert response.status_code == 200
+        
+        with app.app_context():
+            stored = User.query.filter_by(email=email).first().password_hash
+        assert stored.startswith('$2b$05$')
+        assert client.post('/api/auth/login', json={'email': email, 'password': 'pw123456'}).status_code == 200
+    finally:
+        password_hasher.shutdown()
+    print("✅ Password hash upgraded to the new work factor")
@@ -0,0 +1,43 @@
+"""
+Test quantized topic matrices: reconstruction error, scoring kernel and
+the TOPIC_MATRIX_DTYPE option of the matching service
+"""
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from engine.quantize import QuantizedMatrix, cosine_scores
+
+SAMPLE_CV = "Senior data scientist: Python, SQL, machine learning, deep learning, NLP, AWS"
+
+
+def test_quantized_scores():
+    """Scores on float16/uint8 codes stay close to the exact cosine"""
+    rng = np.random.default_rng(5)
+    jobs = rng.dirichlet(np.full(10, 0.3), size=2000)
+    query = rng.dirichlet(np.full(10, 0.3))
+    exact = cosine_similarity(query[None, :], jobs)[0]
+    assert np.allclose(cosine_scores(query, jobs), exact)
+
+    for dtype, tolerance, itemsize in (('float32', 1e-6, 4), ('float16', 2e-3, 2), ('uint8', 1e-2, 1)):
+        matrix = QuantizedMatrix.from_matrix(jobs, dtype, block_rows=300)
+        assert matrix.dtype == dtype and matrix.data.itemsize == itemsize
+        assert np.abs(matrix.scores(query) - exact).max() < tolerance
+        assert np.abs(matrix[7] - jobs[7] / np.linalg.norm(jobs[7])).max() < tolerance
+    assert QuantizedMatrix.from_matrix(jobs, 'uint8').nbytes < jobs.nbytes / 4
+    print("✅ Quantized scoring close to exact")
+
+
+def test_service_uses_configured_dtype(make_app):
+    """TOPIC_MATRIX_DTYPE=uint8 keeps matches close to the float64 service"""
+    from app.services.cv_matching_service import CVMatchingService
+
+    app = make_app(TOPIC_MATRIX_DTYPE='uint8')
+    with app.app_context():
+        service = CVMatchingService()
+    assert isinstance(service.job_topic_distributions, QuantizedMatrix)
+
+    result = service.match_cv(SAMPLE_CV, top_n=5, explain=True)
+    assert result['success'] and len(result['matches']) == 5
+    exact = CVMatchingService().match_cv(SAMPLE_CV, top_n=5)
+    assert abs(result['matches'][0]['similarity_score'] - exact['matches'][0]['similarity_score']) < 1e-2
+    print("✅ Service scores on the quantized matrix")
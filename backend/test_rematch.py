@@ -0,0 +1,135 @@
+"""
+Test stored CV topic vectors: schema upgrade, storage on upload, the
+rematch endpoint and the bulk re-match job
+"""
+import os
+import io
+import sqlite3
+
+import numpy as np
+
+from engine.topic_store import decode_topics, encode_topics
+
+SAMPLE_CV = """
+Backend engineer: Python, Django, PostgreSQL, Docker and Kubernetes on AWS.
+Designed REST APIs, CI pipelines and monitoring for machine learning services.
+"""
+# Past the 1000-character preview the CV is about something else entirely
+LONG_CV = ('Data analyst: SQL reporting, Excel and Tableau dashboards for finance teams. ' * 14
+           + 'Computer vision researcher training PyTorch deep learning models on GPUs. ' * 14)
+
+
+def test_blob_round_trip():
+    topics = np.random.default_rng(0).dirichlet(np.ones(10))
+    blob = encode_topics(topics)
+    assert len(blob) == 40
+    assert np.allclose(decode_topics(blob), topics, atol=1e-7)
+    print("✅ 40-byte topic blobs")
+
+
+def test_schema_upgrade_and_rematch(make_app, auth_headers, tmp_path):
+    """Old databases gain the columns; rematch uses stored vectors, legacy rows are backfilled"""
+    from app import db
+    from app.models.user import CVUpload, JobMatch
+    from app.services.cv_matching_service import get_cv_matching_service
+    from app.services.rematch import rematch_all
+    from engine.allpairs import load_upload_topics
+    from migrate_db import migrate
+
+    database_path = str(tmp_path / 'old.db')
+    with sqlite3.connect(database_path) as conn:
+        conn.execute('CREATE TABLE cv_uploads (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, '
+                     'filename VARCHAR(255) NOT NULL, file_path VARCHAR(500) NOT NULL, extracted_text TEXT, '
+                     'skills TEXT, uploaded_at DATETIME)')
+        # Like the index MySQL creates for a foreign key, under its own name
+        conn.execute('CREATE INDEX cv_uploads_ibfk_1 ON cv_uploads (user_id)')
+    app = make_app(SQLALCHEMY_DATABASE_URI='sqlite:///' + database_path)
+    with sqlite3.connect(database_path) as conn:
+        assert 'topic_vector' not in {row[1] for row in conn.execute('PRAGMA table_info(cv_uploads)')}
+    # Added by the one-off migration command, not at app startup
+    columns, indexes = migrate(app)
+    assert {'cv_uploads.topic_vector', 'cv_uploads.model_version', 'cv_uploads.full_text'} <= set(columns)
+    assert indexes == ['ix_cv_uploads_uploaded_at']
+    assert migrate(app) == ([], [])
+    with sqlite3.connect(database_path) as conn:
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(cv_uploads)')}
+        indexes = {row[1] for row in conn.execute('PRAGMA index_list(cv_uploads)')}
+    assert {'topic_vector', 'model_version', 'full_text'} <= columns
+    assert 'ix_cv_uploads_user_id' not in indexes and 'cv_uploads_ibfk_1' in indexes
+    print("✅ Missing columns and indexes added to an existing table by migrate_db, without duplicates")
+
+    client = app.test_client()
+    headers = auth_headers(client, 'rematch@example.com')
+    cv_ids = []
+    for _ in range(2):
+        data = {'file': (io.BytesIO(SAMPLE_CV.encode('utf-8')), 'cv.txt')}
+        uploaded = client.post('/api/cv/upload', headers=headers, data=data,
+                               content_type='multipart/form-data').get_json()
+        cv_ids.append(uploaded['cv_id'])
+    service = get_cv_matching_service()
+
+    with app.app_context():
+        stored = db.session.get(CVUpload, cv_ids[0])
+        assert len(stored.topic_vector) == 4 * service.lda_model.n_components
+        assert stored.model_version == service.model_version
+        expected = service.match_cv(stored.extracted_text)
+
+    # Stored vector: no inference
+    service.cv_cache.clear()
+    response = client.post(f'/api/cv/{cv_ids[0]}/rematch', headers=headers).get_json()
+    assert response['topic_source'] == 'stored'
+    assert np.allclose([m['similarity_score'] for m in response['top_5_matches']],
+                       [m['similarity_score'] for m in expected['matches']], atol=1e-6)
+
+    # Legacy upload (no vector): inferred once, then stored
+    with app.app_context():
+        legacy = db.session.get(CVUpload, cv_ids[1])
+        legacy.topic_vector = legacy.model_version = None
+        db.session.commit()
+    service.cv_cache.clear()
+    response = client.post(f'/api/cv/{cv_ids[1]}/rematch?min_salary=100000', headers=headers).get_json()
+    assert response['topic_source'] == 'inferred'
+    assert all(m['salary'] >= 100000 for m in response['top_5_matches'])
+    with app.app_context():
+        assert db.session.get(CVUpload, cv_ids[1]).topic_vector is not None
+        assert JobMatch.query.filter_by(cv_upload_id=cv_ids[1]).count() == 5
+    print("✅ Rematch endpoint")
+
+    service.cv_cache.clear()
+    with app.app_context():
+        counts = rematch_all(service, batch_size=1)
+        assert counts == {'stored': 2}
+        assert JobMatch.query.count() == 10
+    print("✅ Bulk re-match")
+
+    # Model changed: re-inferred from the full text, not the preview
+    with app.app_context():
+        changed = db.session.get(CVUpload, cv_ids[1])
+        changed.full_text, changed.extracted_text, changed.model_version = LONG_CV, LONG_CV[:1000], 'older-model'
+        db.session.commit()
+    service.cv_cache.clear()
+    response = client.post(f'/api/cv/{cv_ids[1]}/rematch', headers=headers).get_json()
+    assert response['topic_source'] == 'inferred'
+    expected = service.match_cv(LONG_CV)
+    assert np.allclose([m['similarity_score'] for m in response['top_5_matches']],
+                       [m['similarity_score'] for m in expected['matches']], atol=1e-6)
+    with app.app_context():
+        saved = decode_topics(db.session.get(CVUpload, cv_ids[1]).topic_vector)
+    assert np.allclose(saved, expected['cv_topics'], atol=1e-6)
+    assert not np.allclose(saved, service.infer_topics(LONG_CV[:1000])[0], atol=1e-2)
+
+    # Preview only (uploaded before the full text was kept): approximate, nothing saved
+    with app.app_context():
+        legacy = db.session.get(CVUpload, cv_ids[1])
+        legacy.full_text, legacy.model_version = None, 'older-model'
+        db.session.commit()
+        service.cv_cache.clear()
+        assert rematch_all(service) == {'stored': 1, 'approximate': 1}
+        assert db.session.get(CVUpload, cv_ids[1]).model_version == 'older-model'
+    print("✅ Re-inference from the full text, preview-only uploads reported as approximate")
+
+    keys, topics, approximate = load_upload_topics('sqlite:///' + database_path, os.path.join(os.path.dirname(__file__), 'final_model'))
+    assert keys.tolist() == cv_ids and approximate == 1
+    with app.app_context():
+        assert np.allclose(topics[0], decode_topics(db.session.get(CVUpload, cv_ids[0]).topic_vector))
+    print("✅ All-pairs reuses stored vectors and counts approximate ones")
@@ -0,0 +1,170 @@
+"""
+Test deletion and retention: database cascades, CV deletion with files,
+account purge, chunked expiry and orphaned file cleanup
+"""
+import os
+import io
+import sqlite3
+from datetime import datetime, timedelta
+
+from engine.cv_index import CVTopicIndex
+
+SAMPLE_CV = """
+Data engineer: Python, Spark, Airflow and SQL pipelines on GCP.
+Built streaming ingestion, dbt models and dashboards for analytics teams.
+"""
+
+
+def register(client, auth_headers, email):
+    """(user id, Authorization header) of a new account"""
+    headers = auth_headers(client, email)
+    return client.get('/api/auth/me', headers=headers).get_json()['user']['id'], headers
+
+
+def add_uploads(app, user_id, n, uploaded_at=None, file_name=None):
+    """n uploads with 5 matches each and a file on disk; returns their ids"""
+    from app import db
+    from app.models.user import CVUpload, JobMatch
+
+    folder = os.path.join(app.config['UPLOAD_FOLDER'], str(user_id))
+    os.makedirs(folder, exist_ok=True)
+    ids = []
+    for i in range(n):
+        path = os.path.join(folder, file_name or f"cv_{len(os.listdir(folder))}_{i}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(SAMPLE_CV)
+        upload = CVUpload(user_id=user_id, filename=os.path.basename(path), file_path=path,
+                          uploaded_at=uploaded_at or datetime.utcnow())
+        upload.matches = [JobMatch(job_title=f"Job {rank}", similarity_score=0.5, rank=rank) for rank in range(1, 6)]
+        db.session.add(upload)
+        db.session.flush()
+        ids.append(upload.id)
+    db.session.commit()
+    return ids
+
+
+def test_index_remove():
+    """Removed uploads leave the reverse index compact and searchable"""
+    index = CVTopicIndex(None, n_topics=3)
+    for key, vector in ((1, [1, 0, 0]), (2, [0, 1, 0]), (3, [0, 0, 1])):
+        index.append(key, vector)
+    assert index.remove([1, 42]) == 1
+    assert index.n_extra == 2
+    assert [key for _, key, _ in index.search([1, 0, 1], k=5)] in ([3, 2], [3])
+    assert index.search([0, 0, 1], k=1)[0][1] == 3
+    index.append(4, [1, 0, 0])
+    assert index.search([1, 0, 0], k=1)[0][1] == 4
+    print("✅ Reverse index removal")
+
+
+def test_cascade_and_delete_cv(make_app, auth_headers, tmp_path):
+    """Matches cascade in the database; DELETE /api/cv/<id> removes rows, file and cache entries"""
+    from app import db
+    from app.models.user import CVUpload, JobMatch
+    from app.services.cv_matching_service import get_cv_matching_service
+
+    database_path = str(tmp_path / 'test.db')
+    app = make_app()
+    with sqlite3.connect(database_path) as conn:
+        cascades = {row[2]: row[6] for row in conn.execute('PRAGMA foreign_key_list(job_matches)')}
+        cascades.update({row[2]: row[6] for row in conn.execute('PRAGMA foreign_key_list(cv_uploads)')})
+    assert cascades == {'cv_uploads': 'CASCADE', 'users': 'CASCADE'}
+    client = app.test_client()
+    user_id, headers = register(client, auth_headers, 'retention@example.com')
+
+    with app.app_context():
+        raw_id = add_uploads(app, user_id, 1)[0]
+        db.session.execute(db.delete(CVUpload).where(CVUpload.id == raw_id))
+        db.session.commit()
+        assert JobMatch.query.filter_by(cv_upload_id=raw_id).count() == 0
+    print("✅ ON DELETE CASCADE on matches and uploads")
+
+    response = client.post('/api/cv/upload', headers=headers, content_type='multipart/form-data',
+                           data={'file': (io.BytesIO(SAMPLE_CV.encode('utf-8')), 'cv.txt')})
+    assert response.status_code == 201
+    cv_id = response.get_json()['cv_id']
+    service = get_cv_matching_service()
+    assert service.cv_cache.get(cv_id) is not None
+    with app.app_context():
+        file_path = db.session.get(CVUpload, cv_id).file_path
+        # A second upload of the same file name shares the path
+        shared_id = add_uploads(app, user_id, 1, file_name='cv.txt')[0]
+
+    assert client.delete(f'/api/cv/{cv_id}', headers=headers).status_code == 200
+    assert os.path.exists(file_path)
+    assert client.delete(f'/api/cv/{shared_id}', headers=headers).status_code == 200
+    assert not os.path.exists(file_path)
+    assert client.delete(f'/api/cv/{cv_id}', headers=headers).status_code == 404
+    assert service.cv_cache.get(cv_id) is None
+    with app.app_context():
+        assert CVUpload.query.count() == 0 and JobMatch.query.count() == 0
+    print("✅ CV deletion removes matches, shared files last and cache entries")
+
+
+def test_account_purge(make_app, auth_headers):
+    """DELETE /api/auth/me needs the password and removes everything the account owns"""
+    from app import extraction_cache
+    from app.models.user import CVUpload, JobMatch, User
+    from app.utils.extraction_cache import file_digest
+
+    app = make_app()
+    client = app.test_client()
+    user_id, headers = register(client, auth_headers, 'purge@example.com')
+    other_id, _ = register(client, auth_headers, 'other@example.com')
+    response = client.post('/api/cv/upload', headers=headers, content_type='multipart/form-data',
+                           data={'file': (io.BytesIO(b'Purged CV ' + SAMPLE_CV.encode('utf-8')), 'purged.txt')})
+    with app.app_context():
+        purged_digest = file_digest(CVUpload.query.get(response.get_json()['cv_id']).file_path)
+        add_uploads(app, user_id, 6)
+        kept = add_uploads(app, other_id, 2)
+    extraction_cache.set('0' * 64, 'pdf', 'Unrelated CV', 1)
+    assert extraction_cache.get(purged_digest, 'txt') is not None
+
+    assert client.delete('/api/auth/me', headers=headers, json={'password': 'wrong'}).status_code == 401
+    response = client.delete('/api/auth/me', headers=headers, json={'password': 'pw123456'})
+    assert response.status_code == 200
+    assert response.get_json()['deleted_uploads'] == 7
+    assert client.get('/api/auth/me', headers=headers).status_code == 404
+    assert not os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], str(user_id)))
+    with app.app_context():
+        assert User.query.get(user_id) is None
+        assert [cv.id for cv in CVUpload.query.order_by(CVUpload.id)] == kept
+        assert JobMatch.query.count() == 10
+    # Cached text of the purged files is gone, unrelated entries stay
+    assert extraction_cache.get(purged_digest, 'txt') is None
+    assert extraction_cache.get('0' * 64, 'pdf') is not None
+    print("✅ Account purge")
+
+
+def test_retention_and_orphans(make_app, auth_headers):
+    """Expired uploads go in chunks; unreferenced old files are removed"""
+    from app import extraction_cache
+    from app.models.user import CVUpload, JobMatch
+    from app.services.retention import purge_expired, remove_orphaned_files
+    from app.utils.extraction_cache import file_digest
+
+    app = make_app()
+    client = app.test_client()
+    user_id, _ = register(client, auth_headers, 'expiry@example.com')
+    with app.app_context():
+        expired = add_uploads(app, user_id, 5, uploaded_at=datetime.utcnow() - timedelta(days=40))
+        recent = add_uploads(app, user_id, 2)
+        digest = file_digest(CVUpload.query.get(expired[0]).file_path)
+        extraction_cache.set(digest, 'txt', SAMPLE_CV, None)
+        counts = purge_expired(30, batch_size=2)
+        assert counts == {'uploads': 5, 'files': 5}
+        assert extraction_cache.get(digest, 'txt') is None
+        assert [cv.id for cv in CVUpload.query.order_by(CVUpload.id)] == recent
+        assert JobMatch.query.count() == 10
+    print("✅ Chunked retention purge")
+
+    folder = os.path.join(app.config['UPLOAD_FOLDER'], str(user_id))
+    orphan = os.path.join(folder, 'failed_upload.pdf')
+    with open(orphan, 'wb') as f:
+        f.write(b'%PDF-')
+    with app.app_context():
+        assert remove_orphaned_files(min_age=3600) == 0
+        assert remove_orphaned_files(min_age=-1) == 1
+        assert not os.path.exists(orphan)
+        assert len(os.listdir(folder)) == 2
+    print("✅ Orphaned files removed")
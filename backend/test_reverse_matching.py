@@ -0,0 +1,74 @@
+"""
+Test reverse matching: the CV topic index (reference rows + appended
+uploads) and GET /api/jobs/<job_id>/candidates
+"""
+import os
+import io
+
+import numpy as np
+
+from engine.cv_index import CVTopicIndex, save_cv_topics, CV_TOPICS_ARTIFACT
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'final_model')
+
+
+def test_cv_topic_index(tmp_path):
+    """Search merges memory-mapped reference rows and appended uploads"""
+    rng = np.random.default_rng(3)
+    base = rng.dirichlet(np.full(5, 0.3), size=200)
+    path = save_cv_topics(str(tmp_path / CV_TOPICS_ARTIFACT), base)
+    index = CVTopicIndex.load(path)
+    assert isinstance(index.base, np.memmap)
+
+    query = rng.dirichlet(np.full(5, 0.3))
+    normalized = base / np.linalg.norm(base, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+    assert [key for _, key, _ in index.search(query, k=5)] == list(expected)
+
+    for cv_id in range(40):  # grows past the initial capacity
+        index.append(cv_id, rng.dirichlet(np.full(5, 0.3)))
+    index.append(1000, query * 3)
+    results = index.search(query, k=3)
+    assert results[0][:2] == ('upload', 1000) and abs(results[0][2] - 1) < 1e-5
+    assert index.n_extra == 41
+    assert all(source == 'dataset' for source, _, _ in index.search(query, k=3, include_extra=False))
+    print("✅ CV topic index search")
+
+
+def test_candidates_endpoint(make_app, auth_headers):
+    """Dataset CVs and freshly uploaded CVs are ranked for a job"""
+    if not os.path.exists(os.path.join(MODEL_DIR, CV_TOPICS_ARTIFACT)):
+        print("⚠️ cv_topic_matrix.npy not found, skipping")
+        return
+
+    client = make_app().test_client()
+    headers = auth_headers(client, 'recruiter@example.com')
+
+    response = client.get('/api/jobs/AI00001/candidates?limit=5&source=dataset', headers=headers)
+    assert response.status_code == 200
+    candidates = response.get_json()['candidates']
+    assert len(candidates) == 5 and all(c['source'] == 'dataset' for c in candidates)
+    scores = [c['similarity_score'] for c in candidates]
+    assert scores == sorted(scores, reverse=True)
+
+    cv_text = "AI Research Scientist with PyTorch, Kubernetes, Linux and NLP experience. Bachelor degree."
+    data = {'file': (io.BytesIO(cv_text.encode('utf-8')), 'cv.txt')}
+    cv_id = client.post('/api/cv/upload', headers=headers, data=data,
+                        content_type='multipart/form-data').get_json()['cv_id']
+    uploads = client.get('/api/jobs/AI00001/candidates?source=uploads', headers=headers).get_json()['candidates']
+    assert cv_id in [c['cv_id'] for c in uploads]
+    assert all(c['filename'] for c in uploads)
+
+    # Another account never sees these uploads, not even as ids
+    other_headers = auth_headers(client, 'other-recruiter@example.com')
+    for source in ('uploads', 'all'):
+        seen = client.get(f'/api/jobs/AI00001/candidates?source={source}&limit=100',
+                          headers=other_headers).get_json()['candidates']
+        assert all(c['source'] == 'dataset' for c in seen)
+
+    assert client.delete(f'/api/cv/{cv_id}', headers=headers).status_code == 200
+    uploads = client.get('/api/jobs/AI00001/candidates?source=uploads', headers=headers).get_json()['candidates']
+    assert cv_id not in [c['cv_id'] for c in uploads]
+
+    assert client.get('/api/jobs/NOPE/candidates', headers=headers).status_code == 404
+    print("✅ GET /api/jobs/<job_id>/candidates")
@@ -0,0 +1,102 @@
+"""
+Test sharded matching: fan-out over worker processes gives exactly the
+single-process ranking, ties included
+"""
+import numpy as np
+
+from engine.shards import ShardedMatcher, canonical_top_k, single_process_top_k
+from engine.topk import normalize_rows
+
+
+def test_ties_break_by_row():
+    """Equal scores keep the lowest row indices, in order"""
+    scores = np.array([0.5, 0.9, 0.5, 0.9, 0.1, 0.5], dtype=np.float32)
+    assert [row for _, row in canonical_top_k(scores, 4)] == [1, 3, 0, 2]
+    assert [row for _, row in canonical_top_k(scores, 3, offset=10)] == [11, 13, 10]
+    print("✅ Deterministic tie-breaking")
+
+
+def test_sharded_equals_single_process():
+    """Every shard count returns the reference top-k, even with duplicated rows"""
+    rng = np.random.default_rng(7)
+    jobs = rng.dirichlet(np.full(10, 0.3), size=1001)
+    jobs[500:600] = jobs[:100]  # exact ties across shard boundaries
+    queries = rng.dirichlet(np.full(10, 0.3), size=20)
+    normalized = normalize_rows(jobs)
+
+    for n_shards in (1, 3, 4):
+        with ShardedMatcher(jobs, n_shards=n_shards, processes=2) as matcher:
+            assert len(matcher.shards) == n_shards
+            for q in queries:
+                assert matcher.search(q, 15) == single_process_top_k(normalized, q, 15)
+            assert len(matcher.search(queries[0], 5000)) == 1001
+    print("✅ Sharded results identical to the single-process path")
+
+
+def test_candidate_rows():
+    """Filtered searches rank only the candidate rows, split across shards"""
+    rng = np.random.default_rng(3)
+    jobs = rng.dirichlet(np.full(10, 0.3), size=500)
+    rows = np.sort(rng.choice(500, size=120, replace=False))
+    normalized = normalize_rows(jobs)
+    query = rng.dirichlet(np.full(10, 0.3))
+    expected = [(int(rows[row]), score) for row, score in single_process_top_k(normalized[rows], query, 10)]
+    with ShardedMatcher(jobs, n_shards=3, processes=2) as matcher:
+        assert matcher.search(query, 10, rows=rows) == expected
+        assert matcher.search(query, 10, rows=rows[rows < 100]) == \
+            [(int(row), score) for row, score in single_process_top_k(normalized[:100], query, 200)
+             if row in set(rows.tolist())][:10]
+        assert matcher.search(query, 10, rows=np.empty(0, dtype=np.int64)) == []
+    print("✅ Candidate rows restrict every shard")
+
+
+def test_matcher_flag():
+    """Matcher(shards=2) ranks like the in-process scan, filters and windows included"""
+    from engine.matcher import Matcher
+
+    text = 'Machine learning engineer: Python, PyTorch, NLP models deployed on AWS with Docker.'
+    filters = {'company_location': ['Germany', 'France']}
+    reference = Matcher()
+    sharded = Matcher(shards=2)
+    try:
+        assert reference.sharded is None
+        topics = reference.infer_topics(text)[0]
+        for window_filters in (None, filters):
+            rows, scores, total = reference.rank_jobs(topics, 5, 15, window_filters)
+            sharded_rows, sharded_scores, sharded_total = sharded.rank_jobs(topics, 5, 15, window_filters)
+            assert total == sharded_total and len(sharded_rows) == 10
+            assert np.allclose(scores, sharded_scores, atol=1e-5)
+            assert set(sharded_rows) <= set(sharded.job_filters.candidates(window_filters) if window_filters
+                                            else range(len(sharded.df_jobs)))
+        # float32 shards: near-ties may swap, scores agree
+        matches = sharded.match_cv(text, filters=filters)['matches']
+        assert all(m['location'] in ('Germany', 'France') for m in matches)
+        assert np.allclose([m['similarity_score'] for m in matches],
+                           [m['similarity_score'] for m in reference.match_cv(text, filters=filters)['matches']],
+                           atol=1e-5)
+    finally:
+        sharded.close()
+    assert sharded.sharded is None
+    print("✅ MATCH_SHARDS ranks through the shard workers")
+
+
+def test_worker_context():
+    """Workers preload only their modules, and only the upload ranking service is sharded"""
+    import multiprocessing
+    from multiprocessing import forkserver
+    from flask import Flask
+    from engine.shards import worker_context
+    from app.services.cv_matching_service import matcher_options
+
+    context = worker_context()
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        assert context.get_start_method() == 'forkserver'
+        worker_context('engine.topk')
+        preload = forkserver._forkserver._preload_modules
+        assert '__main__' not in preload and {'engine.shards', 'engine.topk'} <= set(preload)
+    app = Flask(__name__)
+    app.config['MATCH_SHARDS'] = 2
+    with app.app_context():
+        assert matcher_options(sharded=True)['shards'] == 2
+        assert matcher_options()['shards'] == 0
+    print("✅ One shard pool per process, without the server's __main__")
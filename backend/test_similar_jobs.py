@@ -0,0 +1,56 @@
+"""
+Test the precomputed "similar jobs" neighbour lists: blocked top-k against
+brute force, the training artifact and GET /api/jobs/<job_id>/similar
+"""
+import os
+
+import numpy as np
+
+from engine.topk import blocked_top_k, load_neighbors, save_neighbors, top_k_indices, NEIGHBORS_ARTIFACT
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'final_model')
+
+
+def test_blocked_matches_brute_force(tmp_path):
+    """Small blocks give the same neighbours as a full similarity matrix"""
+    rng = np.random.default_rng(1)
+    corpus = rng.dirichlet(np.full(10, 0.3), size=500)
+    ids, scores = blocked_top_k(corpus, corpus, k=7, exclude_self=True, max_block_bytes=4 * 500 * 33)
+
+    normalized = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    full = normalized @ normalized.T
+    np.fill_diagonal(full, -np.inf)
+    expected = np.sort(full, axis=1)[:, ::-1][:, :7]
+    assert ids.shape == (500, 7) and ids.dtype == np.int32 and scores.dtype == np.float32
+    assert np.allclose(scores, expected, atol=1e-5)
+    assert not (ids == np.arange(500)[:, None]).any()
+    assert np.allclose(np.take_along_axis(full, ids.astype(np.int64), axis=1), scores, atol=1e-5)
+
+    values = rng.random(100)
+    assert list(top_k_indices(values, 5)) == list(np.argsort(values)[::-1][:5])
+
+    path = str(tmp_path / NEIGHBORS_ARTIFACT)
+    loaded_ids, loaded_scores = load_neighbors(save_neighbors(path, ids, scores))
+    assert (loaded_ids == ids).all() and (loaded_scores == scores).all()
+    print("✅ Blocked top-k matches brute force")
+
+
+def test_similar_endpoint(make_app, auth_headers):
+    """The endpoint serves the artifact's neighbours for a job id"""
+    if not os.path.exists(os.path.join(MODEL_DIR, NEIGHBORS_ARTIFACT)):
+        print("⚠️ job_neighbors.npz not found, skipping")
+        return
+
+    client = make_app().test_client()
+    headers = auth_headers(client, 'similar@example.com')
+
+    response = client.get('/api/jobs/AI00001/similar?limit=5', headers=headers)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['total'] == 5
+    assert all(job['job_id'] != 'AI00001' for job in data['similar_jobs'])
+    scores = [job['similarity_score'] for job in data['similar_jobs']]
+    assert scores == sorted(scores, reverse=True)
+
+    assert client.get('/api/jobs/NOPE/similar', headers=headers).status_code == 404
+    print("✅ GET /api/jobs/<job_id>/similar")
@@ -0,0 +1,57 @@
+"""
+Test the per-topic browse index and GET /api/jobs/topics[/<k>]
+"""
+import os
+
+import numpy as np
+
+from engine.topic_index import TopicIndex, build_topic_index, save_topic_index, TOPIC_INDEX_ARTIFACT
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'final_model')
+
+
+def test_build_topic_index(tmp_path):
+    """Pages of the index equal a full sort of the topic column"""
+    rng = np.random.default_rng(2)
+    job_topics = rng.dirichlet(np.full(4, 0.5), size=300)
+    components = rng.random((4, 50))
+    vocabulary = np.array([f'term{i}' for i in range(50)])
+
+    path = str(tmp_path / TOPIC_INDEX_ARTIFACT)
+    index = TopicIndex.load(save_topic_index(path, build_topic_index(job_topics, components, vocabulary, n_words=5)))
+    assert (index.n_topics, index.n_jobs) == (4, 300)
+    assert index.dominant_counts.sum() == 300
+
+    rows, weights = index.page(2, 20, 10)
+    expected = np.argsort(-job_topics[:, 2], kind='stable')[20:30]
+    assert list(rows) == list(expected)
+    assert np.allclose(weights, job_topics[expected, 2])
+
+    words = index.words(1)
+    assert len(words) == 5
+    assert words[0][0] == vocabulary[components[1].argmax()]
+    print("✅ Topic index pages match a full sort")
+
+
+def test_topic_endpoints(make_app, auth_headers):
+    """Topic list and ranked pages are served from the artifact"""
+    if not os.path.exists(os.path.join(MODEL_DIR, TOPIC_INDEX_ARTIFACT)):
+        print("⚠️ topic_index.npz not found, skipping")
+        return
+
+    client = make_app().test_client()
+    headers = auth_headers(client, 'topics@example.com')
+
+    response = client.get('/api/jobs/topics', headers=headers)
+    assert response.status_code == 200
+    topics = response.get_json()['topics']
+    assert len(topics) == 10 and all(topic['top_words'] for topic in topics)
+
+    first = client.get('/api/jobs/topics/1?per_page=5', headers=headers).get_json()
+    second = client.get('/api/jobs/topics/1?per_page=5&page=2', headers=headers).get_json()
+    weights = [job['topic_weight'] for job in first['jobs'] + second['jobs']]
+    assert len(weights) == 10 and weights == sorted(weights, reverse=True)
+    assert first['total'] == 15000
+
+    assert client.get('/api/jobs/topics/99', headers=headers).status_code == 404
+    print("✅ GET /api/jobs/topics")
@@ -4,6 +4,7 @@ This replaces the old TF-IDF based approach with LDA topic modeling
 """
 
 import os
+import time
 import numpy as np
 import pandas as pd
 import joblib
@@ -11,6 +12,11 @@ from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
 from sklearn.metrics.pairwise import cosine_similarity
 
+from engine.lda_inference import export_inference_artifact, INFERENCE_ARTIFACT
+from engine.topk import blocked_top_k, save_neighbors, NEIGHBORS_ARTIFACT, DEFAULT_K
+from engine.topic_index import build_topic_index, save_topic_index, TOPIC_INDEX_ARTIFACT
+from engine.cv_index import save_cv_topics, CV_TOPICS_ARTIFACT
+
 def ensure_text(df, candidates=None, target='Text'):
     """Ensure DataFrame has a unified 'Text' column"""
     if target in df.columns:
@@ -19,13 +25,14 @@ def ensure_text(df, candidates=None, target='Text'):
 
     use_cols = [c for c in (candidates or []) if c in df.columns]
     if not use_cols:
-        obj_cols = [c for c in df.columns if df[c].dtype == 'object']
+        obj_cols = [c for c in df.columns if df[c].dtype == 'object' or pd.api.types.is_string_dtype(df[c])]
         use_cols = obj_cols
     if not use_cols:
         raise ValueError("No suitable text columns available to construct 'Text'.")
 
     df[target] = (
         df[use_cols]
+          .fillna('')
           .astype(str)
           .apply(lambda row: ' '.join([v for v in row if v and v.lower() != 'nan']).strip(), axis=1)
           .replace('', 'missing_text')
@@ -135,6 +142,27 @@ def main():
     df_jobs.to_csv(os.path.join(model_dir, 'jobs_dataframe.csv'), index=False)
     print("   ✓ jobs_dataframe.csv")
     
+    # 5. Compact inference-only artifact (fast single-CV topic inference)
+    export_inference_artifact(final_lda, count_vec, os.path.join(model_dir, INFERENCE_ARTIFACT))
+    print(f"   ✓ {INFERENCE_ARTIFACT}")
+    
+    # 6. Similar-jobs neighbour lists (top-k cosine in topic space, blocked matmul)
+    started = time.perf_counter()
+    neighbor_ids, neighbor_scores = blocked_top_k(final_job_topics, final_job_topics, k=DEFAULT_K, exclude_self=True)
+    neighbors_path = save_neighbors(os.path.join(model_dir, NEIGHBORS_ARTIFACT), neighbor_ids, neighbor_scores)
+    print(f"   ✓ {NEIGHBORS_ARTIFACT} ({neighbor_ids.shape[0]}x{neighbor_ids.shape[1]}, "
+          f"{os.path.getsize(neighbors_path) / 1e6:.1f} MB, {time.perf_counter() - started:.1f}s)")
+    
+    # 7. Topic browse index (jobs ranked per topic + top words per topic)
+    topic_index = build_topic_index(final_job_topics, final_lda.components_, count_vec.get_feature_names_out())
+    save_topic_index(os.path.join(model_dir, TOPIC_INDEX_ARTIFACT), topic_index)
+    print(f"   ✓ {TOPIC_INDEX_ARTIFACT}")
+    
+    # 8. CV topic matrix for reverse matching (rows follow dataset_cvs_cleaned.csv)
+    if len(df_cv) > 0:
+        save_cv_topics(os.path.join(model_dir, CV_TOPICS_ARTIFACT), final_lda.transform(count_vec.transform(df_cv['Text'])))
+        print(f"   ✓ {CV_TOPICS_ARTIFACT} ({len(df_cv)} CVs)")
+    
     print("\n" + "=" * 80)
     print("✅ MODEL TRAINING COMPLETE!")
     print("=" * 80)